@@ -0,0 +1,11 @@
+{#
+    Label of the avalanche season a date falls in, e.g. ``2025/26`` for any
+    date from 1 September 2025 through 31 August 2026.
+#}
+{% macro avalanche_season(date_expr) -%}
+    (
+        CAST(YEAR({{ date_expr }}) - CASE WHEN MONTH({{ date_expr }}) < 9 THEN 1 ELSE 0 END AS VARCHAR)
+        || '/'
+        || RIGHT(CAST(YEAR({{ date_expr }}) + CASE WHEN MONTH({{ date_expr }}) < 9 THEN 0 ELSE 1 END AS VARCHAR), 2)
+    )
+{%- endmacro %}
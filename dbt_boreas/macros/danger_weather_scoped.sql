@@ -0,0 +1,96 @@
+{#
+    CTEs shared by the danger/weather statistics models. Ends in
+    ``scoped``: one row per region, scope, day and weather variable with a
+    non-null value, where a scope is either an avalanche season
+    (``scope_type = 'season'``) or a trailing window ending at the region's
+    latest warning day (``scope_type = 'trailing'``, e.g. ``last_90d``).
+
+    Incremental runs keep only the (region, scope) pairs touched by
+    region_daily rows loaded since the last run: the seasons those rows fall
+    in, plus every trailing window of a changed region. Callers materialize
+    with ``delete+insert`` on (region_id, scope) so those pairs are replaced
+    wholesale.
+#}
+{% macro danger_weather_scoped() %}
+{% set trailing_windows = var('stats_trailing_windows') %}
+daily AS (
+    SELECT
+        region_id,
+        region_name,
+        "date",
+        danger_level,
+        loaded_at,
+        avg_temp,
+        max_snowfall,
+        max_rain,
+        avg_snow_depth,
+        max_windspeed,
+        avg_humidity
+    FROM {{ ref('region_daily') }}
+    WHERE danger_level IS NOT NULL
+),
+
+season_scopes AS (
+    SELECT
+        *,
+        'season' AS scope_type,
+        {{ avalanche_season('"date"') }} AS scope
+    FROM daily
+),
+
+trailing_scopes AS (
+    {% for days in trailing_windows %}
+    SELECT
+        d.*,
+        'trailing' AS scope_type,
+        'last_{{ days }}d' AS scope
+    FROM daily d
+    JOIN (SELECT region_id, MAX("date") AS last_date FROM daily GROUP BY region_id) l
+    ON d.region_id = l.region_id
+    AND d."date" > l.last_date - INTERVAL {{ days }} DAY
+    {% if not loop.last %}UNION ALL{% endif %}
+    {% endfor %}
+),
+
+all_scopes AS (
+    SELECT * FROM season_scopes
+    UNION ALL
+    SELECT * FROM trailing_scopes
+),
+
+{% if is_incremental() %}
+changed_scopes AS (
+    SELECT DISTINCT region_id, scope
+    FROM all_scopes
+    WHERE (scope_type = 'season' AND loaded_at > (SELECT MAX(loaded_at) FROM {{ this }}))
+    OR (
+        scope_type = 'trailing'
+        AND region_id IN (
+            SELECT region_id
+            FROM daily
+            WHERE loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+        )
+    )
+),
+{% endif %}
+
+bounded AS (
+    SELECT
+        s.*,
+        MIN(s."date") OVER (PARTITION BY s.region_id, s.scope) AS window_start,
+        MAX(s."date") OVER (PARTITION BY s.region_id, s.scope) AS window_end,
+        MAX(s.loaded_at) OVER (PARTITION BY s.region_id, s.scope) AS scope_loaded_at
+    FROM all_scopes s
+    {% if is_incremental() %}
+    JOIN changed_scopes c
+    ON s.region_id = c.region_id
+    AND s.scope = c.scope
+    {% endif %}
+),
+
+scoped AS (
+    UNPIVOT bounded
+    ON avg_temp, max_snowfall, max_rain, avg_snow_depth, max_windspeed, avg_humidity
+    INTO NAME variable VALUE value
+)
+{% endmacro %}
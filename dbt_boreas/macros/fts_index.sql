@@ -0,0 +1,52 @@
+{#
+    Post-hook that (re)builds a DuckDB full-text index over ``text_column`` of
+    the current model, keyed on ``id_column``, which must be unique. DuckDB
+    FTS indexes cannot be appended to, so the index is rebuilt as a whole,
+    but only when the model has rows newer than the watermark stored next to
+    the index tables in ``fts_<schema>_<table>``.
+
+    Terms are stemmed with the Snowball Norwegian stemmer (NVE warnings are
+    fetched with language_key 1) and Norwegian stopwords come from the
+    ``norwegian_stopwords`` seed. The default ``ignore`` pattern only keeps
+    a-z, which would split words on æ/ø/å, and accent stripping would fold å
+    into a, so both are overridden.
+
+    The FTS extension splices the table name into its SQL unquoted, so the
+    model must live in a schema whose name is a plain identifier.
+#}
+{% macro fts_index(id_column, text_column) %}
+    {%- set fts_schema = 'fts_' ~ this.schema ~ '_' ~ this.identifier -%}
+    {%- set stale = true -%}
+    {%- if execute -%}
+        {%- set watermark_exists -%}
+            SELECT COUNT(*)
+            FROM duckdb_tables()
+            WHERE schema_name = '{{ fts_schema }}'
+            AND table_name = 'indexed_watermark'
+        {%- endset -%}
+        {%- if run_query(watermark_exists).columns[0].values()[0] > 0 -%}
+            {%- set has_new_rows -%}
+                SELECT COALESCE(
+                    (SELECT MAX(loaded_at) FROM {{ this }})
+                    > (SELECT MAX(loaded_at) FROM {{ fts_schema }}.indexed_watermark),
+                    true
+                )
+            {%- endset -%}
+            {%- set stale = run_query(has_new_rows).columns[0].values()[0] -%}
+        {%- endif -%}
+    {%- endif -%}
+    {%- if stale -%}
+        PRAGMA create_fts_index(
+            '{{ this.schema }}.{{ this.identifier }}', '{{ id_column }}', '{{ text_column }}',
+            stemmer = 'norwegian',
+            stopwords = '{{ ref('norwegian_stopwords') }}',
+            ignore = '(\\.|[^a-z0-9æøå])+',
+            strip_accents = 0,
+            lower = 1,
+            overwrite = 1
+        );
+        CREATE TABLE {{ fts_schema }}.indexed_watermark AS
+        SELECT MAX(loaded_at) AS loaded_at, NOW() AS indexed_at
+        FROM {{ this }};
+    {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,52 @@
+{#
+    Incremental filters for models that read the daily-partitioned bronze
+    tables. Dagster writes the run's partition window to
+    ``partition_window.json`` in the invocation's target directory
+    (``DBT_TARGET_PATH``) as ``window_start`` (inclusive) and ``window_end``
+    (exclusive), both ISO dates. It is read only at execution time
+    (``execute``), so a new window does not invalidate dbt's partial parse
+    the way ``--vars`` would.
+
+    Partitions can be loaded out of order (parallel backfills, a retried
+    day), so a plain ``loaded_at`` watermark can skip a partition whose
+    rows landed with an older ``loaded_at`` than rows already transformed.
+    During partitioned runs, rows whose ``date_column`` falls in the window
+    are therefore selected as well. Selected rows are restamped with the run
+    start time (``partition_loaded_at``), typed like dlt's ``loaded_at``
+    (TIMESTAMP WITH TIME ZONE), so downstream watermarks pick them up too. Without a window both macros reduce to the usual watermark.
+#}
+{% macro partition_window() -%}
+    {%- if execute -%}
+        {%- set path = env_var('DBT_TARGET_PATH', 'target') ~ '/partition_window.json' -%}
+        {%- if run_query("SELECT COUNT(*) FROM glob('" ~ path ~ "')").columns[0].values()[0] > 0 -%}
+            {%- set window = run_query(
+                "SELECT window_start::VARCHAR, window_end::VARCHAR FROM read_json('" ~ path ~ "')"
+            ).rows[0] -%}
+            {{ return((window[0], window[1])) }}
+        {%- endif -%}
+    {%- endif -%}
+    {{ return(none) }}
+{%- endmacro %}
+
+{% macro partition_window_filter(date_column) -%}
+    {%- set window = partition_window() -%}
+    {%- if window -%}
+    (
+        loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+        OR (
+            {{ date_column }} >= DATE '{{ window[0] }}'
+            AND {{ date_column }} < DATE '{{ window[1] }}'
+        )
+    )
+    {%- else -%}
+    loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+    {%- endif -%}
+{%- endmacro %}
+
+{% macro partition_loaded_at(column='loaded_at') -%}
+    {%- if partition_window() -%}
+    CAST('{{ run_started_at.isoformat() }}' AS TIMESTAMP WITH TIME ZONE) AS {{ column }}
+    {%- else -%}
+    {{ column }}
+    {%- endif -%}
+{%- endmacro %}
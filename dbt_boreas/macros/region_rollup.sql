@@ -0,0 +1,45 @@
+{#
+    Roll ``region_daily`` up to one row per region and ``grain`` bucket
+    (``week`` or ``month``). ``date`` holds the bucket start so the dashboard
+    can swap tiers without touching its chart encodings.
+
+    Incremental runs only rebuild the buckets that contain a region_daily row
+    loaded since the last run; the merge on (region_id, date) replaces them.
+#}
+{% macro region_rollup(grain) %}
+WITH daily AS (
+    SELECT *
+    FROM {{ ref('region_daily') }}
+    {% if is_incremental() %}
+    WHERE DATE_TRUNC('{{ grain }}', "date") IN (
+        SELECT DISTINCT DATE_TRUNC('{{ grain }}', "date")
+        FROM {{ ref('region_daily') }}
+        WHERE loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+    )
+    {% endif %}
+)
+
+SELECT
+    CAST(DATE_TRUNC('{{ grain }}', "date") AS DATE) AS "date",
+    region_id,
+    region_name,
+    COUNT(*) AS n_days,
+    MAX(danger_level) AS danger_level,
+    AVG(danger_level) AS avg_danger_level,
+    COUNT(*) FILTER (WHERE danger_level >= 3) AS days_at_3plus,
+    MAX(max_temp) AS max_temp,
+    AVG(avg_temp) AS avg_temp,
+    MIN(min_temp) AS min_temp,
+    MAX(max_snowfall) AS max_snowfall,
+    AVG(avg_snowfall) AS avg_snowfall,
+    MAX(max_rain) AS max_rain,
+    AVG(avg_rain) AS avg_rain,
+    MAX(max_snow_depth) AS max_snow_depth,
+    AVG(avg_snow_depth) AS avg_snow_depth,
+    MAX(max_windspeed) AS max_windspeed,
+    AVG(avg_windspeed) AS avg_windspeed,
+    AVG(avg_humidity) AS avg_humidity,
+    MAX(loaded_at) AS loaded_at
+FROM daily
+GROUP BY DATE_TRUNC('{{ grain }}', "date"), region_id, region_name
+{% endmacro %}
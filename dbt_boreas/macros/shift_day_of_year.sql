@@ -0,0 +1,8 @@
+{#
+    Day of year ``day`` shifted by ``offset`` days (either sign, less than a
+    year), wrapping around a 366-day year the way the climatology's
+    smoothing window does.
+#}
+{% macro shift_day_of_year(day, offset) -%}
+    (({{ day }}) - 1 + ({{ offset }}) + 366) % 366 + 1
+{%- endmacro %}
@@ -0,0 +1,33 @@
+{{
+    config(
+        materialized='table'
+    )
+}}
+
+-- Weather cells are on a finer grid than avalanche regions. Each cell is
+-- assigned to every avalanche region whose bbox contains the cell centre.
+
+WITH grids AS (
+    SELECT *
+    FROM {{ ref('dim_grids') }}
+),
+
+regions AS (
+    SELECT
+        region_id,
+        "name" AS region_name,
+        LEAST(east_south_lat, west_north_lat) AS lat_min,
+        GREATEST(east_south_lat, west_north_lat) AS lat_max,
+        LEAST(east_south_lon, west_north_lon) AS lon_min,
+        GREATEST(east_south_lon, west_north_lon) AS lon_max
+    FROM {{ ref('dim_regions') }}
+)
+
+SELECT
+    g.id AS grid_id,
+    r.region_id,
+    r.region_name
+FROM grids g
+JOIN regions r
+ON g.center_lat BETWEEN r.lat_min AND r.lat_max
+AND g.center_lon BETWEEN r.lon_min AND r.lon_max
@@ -15,8 +15,8 @@ SELECT
     valid_to,
     publish_time,
     main_text,
-    loaded_at
+    {{ partition_loaded_at() }}
 FROM {{ source('1_bronze', 'avalanche_danger_levels') }}
 {% if is_incremental() %}
-WHERE loaded_at > (SELECT MAX(loaded_at) FROM {{this}})
+WHERE {{ partition_window_filter('valid_from') }}
 {% endif %}
\ No newline at end of file
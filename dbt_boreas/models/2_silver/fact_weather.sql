@@ -14,7 +14,7 @@ WITH historic AS (
     FROM {{ source('1_bronze', 'weather_historic') }}
     WHERE "time" < today()
     {% if is_incremental() %}
-        AND loaded_at > (SELECT MAX(loaded_at) FROM {{this}})
+        AND {{ partition_window_filter('"time"') }}
     {% endif %}
 ), 
 
@@ -45,7 +45,7 @@ SELECT
     rain,
     snow_depth,
     windspeed_10m,
-    loaded_at, 
+    {{ partition_loaded_at() }},
     grid_id,
     weather_type
 FROM unioned
@@ -42,6 +42,7 @@ SELECT
     valid_from,
     valid_to,
     main_text,
+    loaded_at,
     east_south_lon,
 	east_south_lat,
 	west_north_lon,
@@ -0,0 +1,134 @@
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['region_id', 'season'],
+        incremental_strategy = 'delete+insert',
+        on_schema_change = 'sync_all_columns'
+    )
+}}
+
+-- Change-point index over region_daily: one row per run of consecutive days
+-- at the same danger level, per region and avalanche season. A run starts
+-- when the level changes or after a day without a warning; ``delta`` is the
+-- change from the level the day before (NULL after a gap or at season start).
+-- Runs at level 3+ also carry the contiguous elevated period they belong to.
+--
+-- Incremental runs rebuild only the (region, season) pairs that received
+-- newly loaded days.
+
+WITH daily AS (
+    SELECT
+        region_id,
+        region_name,
+        "date",
+        danger_level,
+        loaded_at,
+        {{ avalanche_season('"date"') }} AS season,
+        MAX("date") OVER (PARTITION BY region_id) AS region_last_date
+    FROM {{ ref('region_daily') }}
+    WHERE danger_level IS NOT NULL
+),
+
+{% if is_incremental() %}
+changed AS (
+    SELECT DISTINCT region_id, season
+    FROM daily
+    WHERE loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+),
+{% endif %}
+
+marked AS (
+    SELECT
+        d.*,
+        LAG(d.danger_level) OVER w AS prev_level,
+        LAG(d."date") OVER w AS prev_date
+    FROM daily d
+    {% if is_incremental() %}
+    JOIN changed c
+    ON d.region_id = c.region_id
+    AND d.season = c.season
+    {% endif %}
+    WINDOW w AS (PARTITION BY d.region_id, d.season ORDER BY d."date")
+),
+
+flagged AS (
+    SELECT
+        *,
+        prev_date IS NOT NULL AND "date" - prev_date = 1 AS follows_prev,
+        CASE
+            WHEN prev_level IS NULL OR "date" - prev_date > 1 OR danger_level <> prev_level THEN 1
+            ELSE 0
+        END AS is_run_start,
+        CASE
+            WHEN danger_level >= 3
+                AND (prev_level IS NULL OR "date" - prev_date > 1 OR prev_level < 3) THEN 1
+            ELSE 0
+        END AS is_elevated_start
+    FROM marked
+),
+
+numbered AS (
+    SELECT
+        *,
+        SUM(is_run_start) OVER w AS run_no,
+        SUM(is_elevated_start) OVER w AS elevated_no
+    FROM flagged
+    WINDOW w AS (PARTITION BY region_id, season ORDER BY "date" ROWS UNBOUNDED PRECEDING)
+),
+
+elevated_periods AS (
+    SELECT
+        region_id,
+        season,
+        elevated_no,
+        MIN("date") AS elevated_since,
+        COUNT(*) AS elevated_days
+    FROM numbered
+    WHERE danger_level >= 3
+    GROUP BY region_id, season, elevated_no
+),
+
+runs AS (
+    SELECT
+        region_id,
+        region_name,
+        season,
+        run_no,
+        elevated_no,
+        MIN("date") AS run_start,
+        MAX("date") AS run_end,
+        COUNT(*) AS duration_days,
+        ANY_VALUE(danger_level) AS danger_level,
+        MAX(prev_level) FILTER (WHERE is_run_start = 1 AND follows_prev) AS previous_level,
+        MAX("date") = ANY_VALUE(region_last_date) AS is_current,
+        MAX(loaded_at) AS loaded_at
+    FROM numbered
+    GROUP BY region_id, region_name, season, run_no, elevated_no
+)
+
+SELECT
+    r.region_id,
+    r.region_name,
+    r.season,
+    r.run_start,
+    r.run_end,
+    r.duration_days,
+    r.danger_level,
+    r.previous_level,
+    r.danger_level - r.previous_level AS delta,
+    CASE
+        WHEN r.previous_level IS NULL THEN 'start'
+        WHEN r.danger_level > r.previous_level THEN 'up'
+        ELSE 'down'
+    END AS change,
+    e.elevated_since,
+    e.elevated_days,
+    r.is_current,
+    r.loaded_at
+FROM runs r
+LEFT JOIN elevated_periods e
+ON r.region_id = e.region_id
+AND r.season = e.season
+AND r.elevated_no = e.elevated_no
+AND r.danger_level >= 3
+ORDER BY r.run_start, r.region_id
@@ -0,0 +1,41 @@
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['region_id', 'scope'],
+        incremental_strategy = 'delete+insert',
+        on_schema_change = 'sync_all_columns'
+    )
+}}
+
+-- Spearman and Pearson correlation between danger level and each weather
+-- variable, per region and scope (season or trailing window). Spearman uses
+-- average ranks for ties, matching pandas' ``corr(method="spearman")``.
+
+WITH {{ danger_weather_scoped() }},
+
+ranked AS (
+    SELECT
+        *,
+        RANK() OVER (PARTITION BY region_id, scope, variable ORDER BY value)
+            + (COUNT(*) OVER (PARTITION BY region_id, scope, variable, value) - 1) / 2.0
+            AS value_rank,
+        RANK() OVER (PARTITION BY region_id, scope, variable ORDER BY danger_level)
+            + (COUNT(*) OVER (PARTITION BY region_id, scope, variable, danger_level) - 1) / 2.0
+            AS danger_rank
+    FROM scoped
+)
+
+SELECT
+    region_id,
+    region_name,
+    scope_type,
+    scope,
+    window_start,
+    window_end,
+    variable,
+    COUNT(*) AS n_days,
+    CORR(danger_rank, value_rank) AS spearman,
+    CORR(danger_level, value) AS pearson,
+    MAX(scope_loaded_at) AS loaded_at
+FROM ranked
+GROUP BY region_id, region_name, scope_type, scope, window_start, window_end, variable
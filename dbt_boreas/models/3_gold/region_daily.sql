@@ -0,0 +1,92 @@
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['region_id', 'date'],
+        incremental_strategy = 'merge',
+        on_schema_change = 'sync_all_columns'
+    )
+}}
+
+-- One row per region and warning day: the latest published danger level
+-- joined with the region-averaged daily weather. Feeds the Region monitor
+-- directly and is the base of the weekly/monthly rollups.
+
+{% if is_incremental() %}
+WITH changed_dates AS (
+    SELECT DISTINCT "date"
+    FROM {{ ref('avalanche_per_region') }}
+    WHERE loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+    UNION
+    SELECT DISTINCT "date"
+    FROM {{ ref('weather_per_region') }}
+    WHERE loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+),
+{% else %}
+WITH
+{% endif %}
+
+avalanches AS (
+    SELECT
+        "date",
+        region_id,
+        region_name,
+        ARG_MAX(TRY_CAST(danger_level AS INTEGER), valid_from) AS danger_level,
+        ARG_MAX(main_text, valid_from) AS main_text,
+        MAX(loaded_at) AS loaded_at
+    FROM {{ ref('avalanche_per_region') }}
+    WHERE region_id IS NOT NULL
+    {% if is_incremental() %}
+        AND "date" IN (SELECT "date" FROM changed_dates)
+    {% endif %}
+    GROUP BY "date", region_id, region_name
+),
+
+region_weather AS (
+    SELECT
+        gr.region_id,
+        w."date",
+        AVG(w.max_temp) AS max_temp,
+        AVG(w.average_temperature) AS avg_temp,
+        AVG(w.min_temp) AS min_temp,
+        AVG(w.max_snowfall) AS max_snowfall,
+        AVG(w.average_snowfall) AS avg_snowfall,
+        AVG(w.max_rain) AS max_rain,
+        AVG(w.average_rain) AS avg_rain,
+        AVG(w.max_snow_depth) AS max_snow_depth,
+        AVG(w.average_snow_depth) AS avg_snow_depth,
+        AVG(w.max_windspeed) AS max_windspeed,
+        AVG(w.average_windspeed) AS avg_windspeed,
+        AVG(w.average_relative_humidity) AS avg_humidity,
+        MAX(w.loaded_at) AS loaded_at
+    FROM {{ ref('weather_per_region') }} w
+    JOIN {{ ref('dim_grid_regions') }} gr
+    ON w.grid_id = gr.grid_id
+    {% if is_incremental() %}
+    WHERE w."date" IN (SELECT "date" FROM changed_dates)
+    {% endif %}
+    GROUP BY gr.region_id, w."date"
+)
+
+SELECT
+    a."date",
+    a.region_id,
+    a.region_name,
+    a.danger_level,
+    a.main_text,
+    rw.max_temp,
+    rw.avg_temp,
+    rw.min_temp,
+    rw.max_snowfall,
+    rw.avg_snowfall,
+    rw.max_rain,
+    rw.avg_rain,
+    rw.max_snow_depth,
+    rw.avg_snow_depth,
+    rw.max_windspeed,
+    rw.avg_windspeed,
+    rw.avg_humidity,
+    GREATEST(a.loaded_at, COALESCE(rw.loaded_at, a.loaded_at)) AS loaded_at
+FROM avalanches a
+LEFT JOIN region_weather rw
+ON rw.region_id = a.region_id
+AND rw."date" = a."date"
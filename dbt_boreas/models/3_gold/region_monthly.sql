@@ -0,0 +1,10 @@
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['region_id', 'date'],
+        incremental_strategy = 'merge',
+        on_schema_change = 'sync_all_columns'
+    )
+}}
+
+{{ region_rollup('month') }}
@@ -0,0 +1,43 @@
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['region_id', 'valid_from', 'valid_to'],
+        incremental_strategy = 'merge',
+        on_schema_change = 'sync_all_columns',
+        schema = 'search',
+        post_hook = "{{ fts_index('document_id', 'main_text') }}"
+    )
+}}
+
+-- One row per warning with non-empty main_text, the document table behind
+-- the full-text search page. ``document_id`` is derived from the unique key,
+-- since BM25 scoring needs a unique id per document and registration ids
+-- are not guaranteed to be unique per key. The BM25 index over main_text is
+-- rebuilt by the post-hook only when this model received new rows. It is
+-- written to the ``search`` schema because the FTS extension cannot address
+-- tables in schemas like "3_gold" whose names start with a digit.
+--
+-- depends_on: {{ ref('norwegian_stopwords') }}
+
+WITH warnings AS (
+    SELECT *
+    FROM {{ ref('avalanche_per_region') }}
+    WHERE NULLIF(TRIM(main_text), '') IS NOT NULL
+    {% if is_incremental() %}
+    AND loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+    {% endif %}
+)
+
+SELECT
+    {{ dbt_utils.generate_surrogate_key(['region_id', 'valid_from', 'valid_to']) }} AS document_id,
+    registration_id,
+    region_id,
+    region_name,
+    {{ avalanche_season('"date"') }} AS season,
+    "date",
+    valid_from,
+    valid_to,
+    TRY_CAST(danger_level AS INTEGER) AS danger_level,
+    main_text,
+    loaded_at
+FROM warnings
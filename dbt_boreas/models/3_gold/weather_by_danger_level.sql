@@ -0,0 +1,34 @@
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['region_id', 'scope'],
+        incremental_strategy = 'delete+insert',
+        on_schema_change = 'sync_all_columns'
+    )
+}}
+
+-- Five-number summary and mean of each weather variable per danger level,
+-- region and scope (season or trailing window). Backs the box plots on the
+-- Region monitor.
+
+WITH {{ danger_weather_scoped() }}
+
+SELECT
+    region_id,
+    region_name,
+    scope_type,
+    scope,
+    window_start,
+    window_end,
+    variable,
+    danger_level,
+    COUNT(*) AS n_days,
+    MIN(value) AS min_value,
+    QUANTILE_CONT(value, 0.25) AS p25,
+    MEDIAN(value) AS median,
+    QUANTILE_CONT(value, 0.75) AS p75,
+    MAX(value) AS max_value,
+    AVG(value) AS mean_value,
+    MAX(scope_loaded_at) AS loaded_at
+FROM scoped
+GROUP BY region_id, region_name, scope_type, scope, window_start, window_end, variable, danger_level
@@ -0,0 +1,105 @@
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['grid_id', 'day_of_year'],
+        incremental_strategy = 'merge',
+        on_schema_change = 'sync_all_columns'
+    )
+}}
+
+-- Per-grid, per-day-of-year climatology of the daily weather stats shown on
+-- the dashboard. Each day of year pools every historic day within
+-- ``climatology_half_window_days`` of it (wrapping around the new year), so
+-- a short record still yields smooth normals.
+--
+-- Each historic day is expanded into the days of year whose window it falls
+-- in, so pooling is an equi-join on (grid_id, day_of_year) rather than a
+-- distance comparison between every pair of days.
+--
+-- Incremental runs only rebuild the (grid, day of year) pairs whose
+-- smoothing window contains a newly loaded historic day, and only aggregate
+-- the daily rows that feed those pairs.
+
+{% set half_window = var('climatology_half_window_days') %}
+
+WITH offsets AS (
+    SELECT CAST(range AS INTEGER) AS day_offset
+    FROM range(-{{ half_window }}, {{ half_window }} + 1)
+),
+
+{% if is_incremental() %}
+new_days AS (
+    SELECT DISTINCT grid_id, DAYOFYEAR(DATE("time")) AS day_of_year
+    FROM {{ ref('fact_weather') }}
+    WHERE weather_type = 'historic'
+      AND loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+),
+
+targets AS (
+    SELECT DISTINCT
+        n.grid_id,
+        {{ shift_day_of_year('n.day_of_year', 'o.day_offset') }} AS day_of_year
+    FROM new_days n
+    CROSS JOIN offsets o
+),
+
+-- Days of year that fall in the window of some target.
+sources AS (
+    SELECT DISTINCT
+        t.grid_id,
+        {{ shift_day_of_year('t.day_of_year', 'o.day_offset') }} AS day_of_year
+    FROM targets t
+    CROSS JOIN offsets o
+),
+{% endif %}
+
+daily AS (
+    SELECT
+        f.grid_id,
+        DATE(f."time") AS "date",
+        DAYOFYEAR(DATE(f."time")) AS day_of_year,
+        AVG(f.temperature_2m) AS average_temperature,
+        MAX(f.snowfall) AS max_snowfall,
+        MAX(f.windspeed_10m) AS max_windspeed,
+        MAX(f.loaded_at) AS loaded_at
+    FROM {{ ref('fact_weather') }} f
+    {% if is_incremental() %}
+    SEMI JOIN sources s
+    ON s.grid_id = f.grid_id
+    AND s.day_of_year = DAYOFYEAR(DATE(f."time"))
+    {% endif %}
+    WHERE f.weather_type = 'historic'
+    GROUP BY f.grid_id, DATE(f."time")
+),
+
+windowed AS (
+    SELECT
+        d.*,
+        {{ shift_day_of_year('d.day_of_year', 'o.day_offset') }} AS target_day_of_year
+    FROM daily d
+    CROSS JOIN offsets o
+)
+
+SELECT
+    d.grid_id,
+    d.target_day_of_year AS day_of_year,
+    COUNT(*) AS n_days,
+    COUNT(DISTINCT YEAR(d."date")) AS n_years,
+    AVG(d.average_temperature) AS temp_mean,
+    QUANTILE_CONT(d.average_temperature, 0.1) AS temp_p10,
+    MEDIAN(d.average_temperature) AS temp_p50,
+    QUANTILE_CONT(d.average_temperature, 0.9) AS temp_p90,
+    AVG(d.max_snowfall) AS snowfall_mean,
+    MEDIAN(d.max_snowfall) AS snowfall_p50,
+    QUANTILE_CONT(d.max_snowfall, 0.9) AS snowfall_p90,
+    AVG(d.max_windspeed) AS windspeed_mean,
+    MEDIAN(d.max_windspeed) AS windspeed_p50,
+    QUANTILE_CONT(d.max_windspeed, 0.9) AS windspeed_p90,
+    MAX(d.loaded_at) AS loaded_at
+FROM windowed d
+{% if is_incremental() %}
+JOIN targets t
+ON t.grid_id = d.grid_id
+AND t.day_of_year = d.target_day_of_year
+{% endif %}
+GROUP BY d.grid_id, d.target_day_of_year
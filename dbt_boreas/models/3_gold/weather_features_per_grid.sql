@@ -0,0 +1,104 @@
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['grid_id', 'date'],
+        incremental_strategy = 'merge',
+        on_schema_change = 'sync_all_columns'
+    )
+}}
+
+-- Rolling snowpack and wind-loading indicators per grid cell and day.
+--
+-- Hourly weather is first folded into daily totals, then summed over 24h /
+-- 72h / 7-day trailing windows. Incremental runs only recompute each grid
+-- from its first changed day onwards, reading 6 extra days of history so the
+-- 7-day windows are complete.
+
+{% set lookback_days = 6 %}
+
+WITH
+{% if is_incremental() %}
+changed AS (
+    SELECT
+        grid_id,
+        MIN(DATE("time")) AS first_changed
+    FROM {{ ref('fact_weather') }}
+    WHERE loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+    GROUP BY grid_id
+),
+{% endif %}
+
+hourly AS (
+    SELECT w.*
+    FROM {{ ref('fact_weather') }} w
+    {% if is_incremental() %}
+    JOIN changed c
+    ON w.grid_id = c.grid_id
+    AND DATE(w."time") >= c.first_changed - INTERVAL {{ lookback_days }} DAY
+    {% endif %}
+),
+
+daily AS (
+    SELECT
+        grid_id,
+        DATE("time") AS "date",
+        SUM(snowfall) AS snowfall_24h,
+        SUM(rain) AS rain_24h,
+        MAX(temperature_2m) AS temp_max,
+        MIN(temperature_2m) AS temp_min,
+        MAX(windspeed_10m) AS max_windspeed,
+        ARG_MAX(snow_depth, "time") AS snow_depth,
+        BOOL_OR(rain > 0 AND snow_depth > 0) AS rain_on_snow,
+        -- Wind can only move snow that is there: count windy hours with
+        -- snow falling or lying, and the snowfall that landed in them.
+        COUNT(*) FILTER (
+            WHERE windspeed_10m >= {{ var('wind_loading_threshold') }}
+            AND (snowfall > 0 OR snow_depth > 0)
+        ) AS wind_loading_hours_24h,
+        COALESCE(
+            SUM(snowfall) FILTER (WHERE windspeed_10m >= {{ var('wind_loading_threshold') }}),
+            0
+        ) AS wind_loaded_snowfall_24h,
+        MAX(loaded_at) AS loaded_at
+    FROM hourly
+    GROUP BY grid_id, DATE("time")
+),
+
+windowed AS (
+    SELECT
+        grid_id,
+        "date",
+        snowfall_24h,
+        SUM(snowfall_24h) OVER w72 AS snowfall_72h,
+        SUM(snowfall_24h) OVER w7d AS snowfall_7d,
+        rain_24h,
+        SUM(rain_24h) OVER w72 AS rain_72h,
+        rain_on_snow,
+        BOOL_OR(rain_on_snow) OVER w72 AS rain_on_snow_72h,
+        temp_max,
+        temp_min,
+        temp_max - temp_min AS temp_swing_24h,
+        MAX(temp_max) OVER w72 - MIN(temp_min) OVER w72 AS temp_swing_72h,
+        snow_depth,
+        snow_depth - FIRST_VALUE(snow_depth) OVER w72 AS snow_depth_change_72h,
+        max_windspeed,
+        wind_loading_hours_24h,
+        SUM(wind_loading_hours_24h) OVER w72 AS wind_loading_hours_72h,
+        wind_loaded_snowfall_24h,
+        SUM(wind_loaded_snowfall_24h) OVER w72 AS wind_loaded_snowfall_72h,
+        -- A row is as fresh as the newest day inside its widest window, so
+        -- downstream models see it change when any of those days is reloaded.
+        MAX(loaded_at) OVER w7d AS loaded_at
+    FROM daily
+    WINDOW
+        w72 AS (PARTITION BY grid_id ORDER BY "date" RANGE BETWEEN INTERVAL 2 DAY PRECEDING AND CURRENT ROW),
+        w7d AS (PARTITION BY grid_id ORDER BY "date" RANGE BETWEEN INTERVAL {{ lookback_days }} DAY PRECEDING AND CURRENT ROW)
+)
+
+SELECT w.*
+FROM windowed w
+{% if is_incremental() %}
+JOIN changed c
+ON w.grid_id = c.grid_id
+AND w."date" >= c.first_changed
+{% endif %}
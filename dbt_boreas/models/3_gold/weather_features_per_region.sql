@@ -0,0 +1,50 @@
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['region_id', 'date'],
+        incremental_strategy = 'merge',
+        on_schema_change = 'sync_all_columns'
+    )
+}}
+
+-- Region-level view of weather_features_per_grid: sums and swings averaged
+-- over the cells inside each avalanche region, flags as the share of cells
+-- where they fired, wind loading as the worst cell.
+
+WITH features AS (
+    SELECT f.*
+    FROM {{ ref('weather_features_per_grid') }} f
+    {% if is_incremental() %}
+    WHERE f."date" IN (
+        SELECT DISTINCT "date"
+        FROM {{ ref('weather_features_per_grid') }}
+        WHERE loaded_at > (SELECT MAX(loaded_at) FROM {{ this }})
+    )
+    {% endif %}
+)
+
+SELECT
+    gr.region_id,
+    gr.region_name,
+    f."date",
+    COUNT(*) AS n_grids,
+    AVG(f.snowfall_24h) AS snowfall_24h,
+    AVG(f.snowfall_72h) AS snowfall_72h,
+    AVG(f.snowfall_7d) AS snowfall_7d,
+    AVG(f.rain_24h) AS rain_24h,
+    AVG(f.rain_72h) AS rain_72h,
+    AVG(CAST(f.rain_on_snow AS INTEGER)) AS rain_on_snow_share,
+    AVG(CAST(f.rain_on_snow_72h AS INTEGER)) AS rain_on_snow_72h_share,
+    AVG(f.temp_swing_24h) AS temp_swing_24h,
+    AVG(f.temp_swing_72h) AS temp_swing_72h,
+    AVG(f.snow_depth) AS snow_depth,
+    AVG(f.snow_depth_change_72h) AS snow_depth_change_72h,
+    MAX(f.max_windspeed) AS max_windspeed,
+    MAX(f.wind_loading_hours_24h) AS wind_loading_hours_24h,
+    MAX(f.wind_loading_hours_72h) AS wind_loading_hours_72h,
+    MAX(f.wind_loaded_snowfall_72h) AS wind_loaded_snowfall_72h,
+    MAX(f.loaded_at) AS loaded_at
+FROM features f
+JOIN {{ ref('dim_grid_regions') }} gr
+ON f.grid_id = gr.grid_id
+GROUP BY gr.region_id, gr.region_name, f."date"
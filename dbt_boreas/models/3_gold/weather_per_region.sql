@@ -38,17 +38,32 @@ daily_aggregation_weather AS (
         MAX(windspeed_10m) AS max_windspeed,
         AVG(windspeed_10m) AS average_windspeed,
         MIN(windspeed_10m) AS min_windspeed,
-        MODE(weather_type) AS weather_type
+        MODE(weather_type) AS weather_type,
+        MAX(loaded_at) AS loaded_at
     FROM weather
     GROUP BY  grid_id, DATE(time)
 ),
 
+climatology AS (
+    SELECT
+        *
+    FROM {{ ref('weather_climatology') }}
+),
+
 daw_with_grid_info AS (
     SELECT 
-        *
+        daw.*,
+        g.*,
+        daw.average_temperature - c.temp_mean AS average_temperature_anomaly,
+        daw.max_snowfall - c.snowfall_mean AS max_snowfall_anomaly,
+        daw.max_windspeed - c.windspeed_mean AS max_windspeed_anomaly,
+        c.n_years AS climatology_years
     FROM daily_aggregation_weather daw
     LEFT JOIN grids g
     ON daw.grid_id = g.id
+    LEFT JOIN climatology c
+    ON daw.grid_id = c.grid_id
+    AND DAYOFYEAR(daw.date) = c.day_of_year
 )
 
 
@@ -74,6 +89,11 @@ SELECT
 	average_windspeed,
 	min_windspeed,
 	weather_type,
+	average_temperature_anomaly,
+	max_snowfall_anomaly,
+	max_windspeed_anomaly,
+	climatology_years,
+	loaded_at,
     east_south_lon,
 	east_south_lat,
 	west_north_lon,
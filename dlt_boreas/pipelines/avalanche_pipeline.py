@@ -1,27 +1,77 @@
 import dlt
 import os
+import shutil
+from dlt_boreas.pipelines.staging import load_window, stage, window_pipelines_dir
 from dlt_boreas.sources.avalanche.avalanche_warnings import avalanche_warning_source
 
 
-def create_avalanche_pipeline():
+# Windowed runs are stateless and use their own name, so the state of the
+# unwindowed pipeline restored by sync_destination() is never theirs.
+WINDOW_PIPELINE_NAME = "avalanche_window_pipeline"
+
+
+def create_avalanche_pipeline(
+    pipeline_name: str = "avalanche_pipeline", pipelines_dir: str | None = None
+):
     # Get absolute path to project root (two levels up from this file)
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     db_path = os.path.join(project_root, 'boreas')
     
     pipeline = dlt.pipeline(
-        pipeline_name="avalanche_pipeline",
+        pipeline_name=pipeline_name,
         destination=dlt.destinations.duckdb(
             destination_name=db_path,
             enable_dataset_name_normalization=False
         ),
         dataset_name="1_bronze",
+        pipelines_dir=pipelines_dir,
         progress='enlighten'
     )
     return pipeline
 
 
-def run_avalanche_pipeline():
-    """Run the avalanche pipeline. Returns dlt LoadInfo."""
+def _window_pipeline(window_start: str, window_end: str | None):
+    return create_avalanche_pipeline(
+        WINDOW_PIPELINE_NAME,
+        window_pipelines_dir(WINDOW_PIPELINE_NAME, window_start, window_end),
+    )
+
+
+def run_avalanche_pipeline(window_start: str | None = None, window_end: str | None = None):
+    """Run the avalanche pipeline. Returns dlt LoadInfo.
+
+    With ``window_start``/``window_end`` (ISO dates, inclusive) only that
+    window is fetched, in a working directory of its own so concurrent
+    partition runs don't share one. Windowed runs are stateless, so there is
+    no state to restore from DuckDB.
+    """
+    if window_start:
+        pipeline = _window_pipeline(window_start, window_end)
+        info = pipeline.run(
+            avalanche_warning_source(window_start=window_start, window_end=window_end)
+        )
+        shutil.rmtree(pipeline.pipelines_dir, ignore_errors=True)
+        return info
     pipeline = create_avalanche_pipeline()
     pipeline.sync_destination()  # Restore state from DuckDB
-    return pipeline.run(avalanche_warning_source())
\ No newline at end of file
+    return pipeline.run(avalanche_warning_source())
+
+
+def extract_avalanche_pipeline(window_start: str, window_end: str) -> tuple[str, dict[str, int]]:
+    """Stage one window of warnings without touching DuckDB. Returns the
+    pipeline name for :func:`load_avalanche_pipeline` and rows per table."""
+    pipeline = _window_pipeline(window_start, window_end)
+    rows = stage(
+        pipeline, avalanche_warning_source(window_start=window_start, window_end=window_end)
+    )
+    return pipeline.pipeline_name, rows
+
+
+def load_avalanche_pipeline(
+    pipeline_name: str, window_start: str | None = None, window_end: str | None = None
+):
+    """Load the package staged by :func:`extract_avalanche_pipeline`, passing
+    the same window. Returns dlt LoadInfo."""
+    if window_start:
+        return load_window(_window_pipeline(window_start, window_end))
+    return create_avalanche_pipeline(pipeline_name).load()
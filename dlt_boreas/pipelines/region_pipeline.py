@@ -1,15 +1,16 @@
 import dlt
 import os
+from dlt_boreas.pipelines.staging import stage
 from dlt_boreas.sources.regions.region_source import regions_source
 
 
-def create_region_pipeline():
+def create_region_pipeline(pipeline_name: str = "region_pipeline"):
     # Get absolute path to project root (two levels up from this file)
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     db_path = os.path.join(project_root, 'boreas')
     
     pipeline = dlt.pipeline(
-        pipeline_name="region_pipeline",
+        pipeline_name=pipeline_name,
         destination=dlt.destinations.duckdb(
             destination_name=db_path,
             enable_dataset_name_normalization=False
@@ -24,4 +25,16 @@ def run_regions_pipeline():
     """Run the regions pipeline. Returns dlt LoadInfo."""
     pipeline = create_region_pipeline()
     pipeline.sync_destination()  # Restore state from DuckDB
-    return pipeline.run(regions_source())
\ No newline at end of file
+    return pipeline.run(regions_source())
+
+
+def extract_regions_pipeline() -> tuple[str, dict[str, int]]:
+    """Stage the regions without touching DuckDB (the table is replaced, so
+    there is no state to restore). Returns the pipeline name and rows per table."""
+    pipeline = create_region_pipeline()
+    return pipeline.pipeline_name, stage(pipeline, regions_source())
+
+
+def load_regions_pipeline(pipeline_name: str):
+    """Load the package staged by :func:`extract_regions_pipeline`. Returns dlt LoadInfo."""
+    return create_region_pipeline(pipeline_name).load()
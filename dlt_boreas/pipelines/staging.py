@@ -0,0 +1,47 @@
+"""Run a dlt pipeline as two separate steps.
+
+``stage`` extracts and normalizes into a load package in the pipeline's
+working directory without opening DuckDB; ``pipeline.load()`` later writes
+the pending package. Splitting them lets the slow HTTP extraction of several
+sources run concurrently while only the short load step needs the single
+DuckDB writer.
+
+Partitioned sources stage each date window under one pipeline name per
+source but in a working directory of its own (``window_pipelines_dir``), so
+concurrent partition runs don't share package storage. The directory is
+removed once the window is loaded (``load_window``).
+"""
+
+import os
+import shutil
+
+import dlt
+from dlt.common.pipeline import get_dlt_pipelines_dir
+
+
+def stage(pipeline: dlt.Pipeline, data) -> dict[str, int]:
+    """Extract and normalize ``data`` into a pending load package. Returns
+    the number of rows staged per table."""
+    # A package left by an earlier attempt whose load never ran would
+    # otherwise be loaded together with this one.
+    pipeline.drop_pending_packages()
+    pipeline.extract(data)
+    info = pipeline.normalize()
+    return {table: n for table, n in info.row_counts.items() if not table.startswith("_dlt")}
+
+
+def window_pipelines_dir(pipeline_name: str, window_start: str, window_end: str | None) -> str:
+    """The working directory for one date window of ``pipeline_name``."""
+    return os.path.join(
+        get_dlt_pipelines_dir(),
+        "windows",
+        f"{pipeline_name}_{window_start}_{window_end or window_start}",
+    )
+
+
+def load_window(pipeline: dlt.Pipeline):
+    """Load the pending package of a windowed pipeline, then remove its
+    working directory. Returns dlt LoadInfo."""
+    info = pipeline.load()
+    shutil.rmtree(pipeline.pipelines_dir, ignore_errors=True)
+    return info
@@ -1,16 +1,17 @@
 import dlt
 import os
+from dlt_boreas.pipelines.staging import stage
 from dlt_boreas.sources.weather.weather_forecast import weather_forecast_source
 
 
-def create_weather_forecast_pipeline():
+def create_weather_forecast_pipeline(pipeline_name: str = "weather_forecast_pipeline"):
     """Create and configure the weather data pipeline."""
     # Get absolute path to project root (two levels up from this file)
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     db_path = os.path.join(project_root, 'boreas')
     
     pipeline = dlt.pipeline(
-        pipeline_name="weather_forecast_pipeline",
+        pipeline_name=pipeline_name,
         destination=dlt.destinations.duckdb(
             destination_name=db_path,
             enable_dataset_name_normalization=False
@@ -25,4 +26,16 @@ def run_weather_forecast_pipeline():
     """Run the complete weather data pipeline. Returns dlt LoadInfo."""
     pipeline = create_weather_forecast_pipeline()
     pipeline.sync_destination()  # Restore state from DuckDB
-    return pipeline.run([weather_forecast_source()])
\ No newline at end of file
+    return pipeline.run([weather_forecast_source()])
+
+
+def extract_weather_forecast_pipeline() -> tuple[str, dict[str, int]]:
+    """Stage the forecast without touching DuckDB (the table is replaced, so
+    there is no state to restore). Returns the pipeline name and rows per table."""
+    pipeline = create_weather_forecast_pipeline()
+    return pipeline.pipeline_name, stage(pipeline, [weather_forecast_source()])
+
+
+def load_weather_forecast_pipeline(pipeline_name: str):
+    """Load the package staged by :func:`extract_weather_forecast_pipeline`. Returns dlt LoadInfo."""
+    return create_weather_forecast_pipeline(pipeline_name).load()
@@ -1,29 +1,89 @@
 import dlt
 import os
+import shutil
 from dlt_boreas.sources.weather.weather_historic import weather_historic_source
 from dlt_boreas.sources.grids.weather_grids_source import weather_grids_source
+from dlt_boreas.pipelines.staging import load_window, stage, window_pipelines_dir
 
+# Windowed runs are stateless and use their own name, so the state of the
+# unwindowed pipeline restored by sync_destination() is never theirs.
+WINDOW_PIPELINE_NAME = "weather_historic_window_pipeline"
 
-def create_weather_historic_pipeline():
+
+def create_weather_historic_pipeline(
+    pipeline_name: str = "weather_historic_pipeline", pipelines_dir: str | None = None
+):
     """Create and configure the weather data pipeline."""
     # Get absolute path to project root (two levels up from this file)
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     db_path = os.path.join(project_root, 'boreas')
     
     pipeline = dlt.pipeline(
-        pipeline_name="weather_historic_pipeline",
+        pipeline_name=pipeline_name,
         destination=dlt.destinations.duckdb(
             destination_name=db_path,
             enable_dataset_name_normalization=False
         ),
         dataset_name="1_bronze",
+        pipelines_dir=pipelines_dir,
         progress='enlighten'
     )
     return pipeline
 
 
-def run_weather_historic_pipeline():
-    """Run the complete weather data pipeline. Returns dlt LoadInfo."""
+def _window_pipeline(window_start: str, window_end: str | None):
+    return create_weather_historic_pipeline(
+        WINDOW_PIPELINE_NAME,
+        window_pipelines_dir(WINDOW_PIPELINE_NAME, window_start, window_end),
+    )
+
+
+def run_weather_historic_pipeline(window_start: str | None = None, window_end: str | None = None):
+    """Run the complete weather data pipeline. Returns dlt LoadInfo.
+
+    With ``window_start``/``window_end`` (ISO dates, inclusive) only the
+    historic observations in that window are fetched, statelessly, in a
+    working directory of its own; the grid reference table is left to
+    :func:`run_weather_grids_pipeline`.
+    """
+    if window_start:
+        pipeline = _window_pipeline(window_start, window_end)
+        info = pipeline.run(
+            weather_historic_source(window_start=window_start, window_end=window_end)
+        )
+        shutil.rmtree(pipeline.pipelines_dir, ignore_errors=True)
+        return info
     pipeline = create_weather_historic_pipeline()
     pipeline.sync_destination()  # Restore state from DuckDB
-    return pipeline.run([weather_grids_source(), weather_historic_source()])
\ No newline at end of file
+    return pipeline.run([weather_grids_source(), weather_historic_source()])
+
+
+def run_weather_grids_pipeline():
+    """Load only the weather grid reference table. Returns dlt LoadInfo."""
+    pipeline = create_weather_historic_pipeline("weather_grids_pipeline")
+    return pipeline.run(weather_grids_source())
+
+
+def extract_weather_historic_pipeline(window_start: str, window_end: str) -> tuple[str, dict[str, int]]:
+    """Stage one window of historic observations without touching DuckDB.
+    Returns the pipeline name for :func:`load_weather_pipeline` and rows per table."""
+    pipeline = _window_pipeline(window_start, window_end)
+    rows = stage(pipeline, weather_historic_source(window_start=window_start, window_end=window_end))
+    return pipeline.pipeline_name, rows
+
+
+def extract_weather_grids_pipeline() -> tuple[str, dict[str, int]]:
+    """Stage the grid reference table without touching DuckDB. Returns the
+    pipeline name for :func:`load_weather_pipeline` and rows per table."""
+    pipeline = create_weather_historic_pipeline("weather_grids_pipeline")
+    return pipeline.pipeline_name, stage(pipeline, weather_grids_source())
+
+
+def load_weather_pipeline(
+    pipeline_name: str, window_start: str | None = None, window_end: str | None = None
+):
+    """Load the package staged by one of the extract functions above, passing
+    the same window for historic observations. Returns dlt LoadInfo."""
+    if window_start:
+        return load_window(_window_pipeline(window_start, window_end))
+    return create_weather_historic_pipeline(pipeline_name).load()
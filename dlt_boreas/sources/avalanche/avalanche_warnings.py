@@ -16,7 +16,7 @@ def date_range_chunks(
 ) -> Iterator[tuple[date, date]]:
     """Split a date range into smaller chunks."""
     current = start
-    while current < end:
+    while current <= end:
         chunk_end = min(current + timedelta(days=chunk_days - 1), end)
         yield current, chunk_end
         current = chunk_end + timedelta(days=1)
@@ -31,6 +31,8 @@ def avalanche_warning_source(
     chunk_days: int = 30,
     overlap_days: int = 7,
     end_date: str = dlt.config.value,
+    window_start: str | None = None,
+    window_end: str | None = None,
 ):
     """DLT source for avalanche warning data.
 
@@ -43,6 +45,12 @@ def avalanche_warning_source(
         overlap_days: Number of recent days to always re-fetch for forecast updates
         end_date: Optional ISO ``YYYY-MM-DD`` cap on how far forward to fetch.
             When set, the effective end is ``min(end_date, today + 4 days)``.
+        window_start: Optional ISO ``YYYY-MM-DD`` first day of an explicit
+            fetch window. When set (together with ``window_end``), exactly the
+            warnings valid from ``window_start`` through ``window_end``
+            (inclusive) are fetched, and the incremental state is neither read
+            nor advanced. Used by the daily-partitioned Dagster asset.
+        window_end: Optional ISO ``YYYY-MM-DD`` last day of the fetch window.
 
     Returns:
         List of dlt resources for avalanche warnings from all regions
@@ -51,6 +59,13 @@ def avalanche_warning_source(
     if end_date:
         end_cap = datetime.strptime(end_date, "%Y-%m-%d").date()
 
+    window: tuple[date, date] | None = None
+    if window_start:
+        window = (
+            datetime.strptime(window_start, "%Y-%m-%d").date(),
+            datetime.strptime(window_end or window_start, "%Y-%m-%d").date(),
+        )
+
     def cap_state_at_today(values):
         if not values:
             return start_date
@@ -67,6 +82,20 @@ def avalanche_warning_source(
     for region in AVALANCHE_REGIONS:
 
         def make_avalanche_warning_resource(r: AvalancheRegion = region):
+            if window is not None:
+                # A bounded incremental (end_value set) runs stateless, so
+                # partitions can be fetched in any order and in parallel.
+                cursor = dlt.sources.incremental(
+                    "ValidFrom",
+                    initial_value=f"{window[0].isoformat()}T00:00:00",
+                    end_value=f"{(window[1] + timedelta(days=1)).isoformat()}T00:00:00",
+                )
+            else:
+                cursor = dlt.sources.incremental(
+                    "ValidFrom",
+                    initial_value=start_date,
+                    last_value_func=cap_state_at_today,
+                )
 
             @dlt.resource(
                 table_name="avalanche_danger_levels",
@@ -80,28 +109,25 @@ def avalanche_warning_source(
                 },
             )
             def avalanche_warning_resource(
-                incremental_start_date: dlt.sources.incremental[
-                    str
-                ] = dlt.sources.incremental(
-                    "ValidFrom",
-                    initial_value=start_date,
-                    last_value_func=cap_state_at_today,
-                ),
+                incremental_start_date: dlt.sources.incremental[str] = cursor,
             ) -> Iterator[Dict[str, Any]]:
                 """Fetch avalanche warning data for a specific region.
 
                 Yields:
                     Dict containing avalanche warning data
                 """
-                incremental_date = datetime.strptime(
-                    incremental_start_date.last_value, "%Y-%m-%dT%H:%M:%S"
-                ).date()
-                # Always re-fetch at least the last N days to catch forecast updates
-                overlap_date = date.today() - timedelta(days=overlap_days)
-                start = min(incremental_date, overlap_date)
-                end = date.today() + timedelta(days=4)  # Include forecast days
-                if end_cap is not None:
-                    end = min(end, end_cap)
+                if window is not None:
+                    start, end = window
+                else:
+                    incremental_date = datetime.strptime(
+                        incremental_start_date.last_value, "%Y-%m-%dT%H:%M:%S"
+                    ).date()
+                    # Always re-fetch at least the last N days to catch forecast updates
+                    overlap_date = date.today() - timedelta(days=overlap_days)
+                    start = min(incremental_date, overlap_date)
+                    end = date.today() + timedelta(days=4)  # Include forecast days
+                    if end_cap is not None:
+                        end = min(end, end_cap)
                 if start > end:
                     logger.info(
                         f"Skipping {r.region_id}: start {start} past end cap {end}"
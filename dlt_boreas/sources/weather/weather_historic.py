@@ -14,7 +14,7 @@ logger = setup_logger(__name__)
 def date_range_chunks(start: date, end: date, chunk_days: int) -> Iterator[tuple[date, date]]:
     """Split a date range into smaller chunks."""
     current = start
-    while current < end:
+    while current <= end:
         chunk_end = min(current + timedelta(days=chunk_days - 1), end)
         yield current, chunk_end
         current = chunk_end + timedelta(days=1)
@@ -29,6 +29,8 @@ def weather_historic_source(
     request_timeout: int = dlt.config.value,
     chunk_days: int = 30,
     end_date: str = dlt.config.value,
+    window_start: str | None = None,
+    window_end: str | None = None,
 ):
     """DLT source for historic weather data.
 
@@ -36,16 +38,36 @@ def weather_historic_source(
     or ``None``, fetching runs up to ``date.today()``. The effective end is
     always ``min(end_date, date.today())`` so we never ask the API for the
     future.
+
+    ``window_start``/``window_end`` (ISO ``YYYY-MM-DD``, inclusive) fetch an
+    explicit date window instead, without reading or advancing the incremental
+    state. The daily-partitioned Dagster asset passes one partition's days.
     """
     end_cap: date | None = None
     if end_date:
         end_cap = datetime.strptime(end_date, "%Y-%m-%d").date()
+    window: tuple[date, date] | None = None
+    if window_start:
+        window = (
+            datetime.strptime(window_start, "%Y-%m-%d").date(),
+            datetime.strptime(window_end or window_start, "%Y-%m-%d").date(),
+        )
     if hourly_params is None:
         hourly_params = ["temperature_2m", "relative_humidity_2m", "snowfall", "rain", "snow_depth", "windspeed_10m"]
         
     resources = []
     for grid in WEATHER_GRID_SQUARES:
         def make_historic_resource(g=grid):
+            if window is not None:
+                # Bounded (end_value set) incrementals are stateless.
+                cursor = dlt.sources.incremental(
+                    "time",
+                    initial_value=f"{window[0].isoformat()}T00:00",
+                    end_value=f"{(window[1] + timedelta(days=1)).isoformat()}T00:00",
+                )
+            else:
+                cursor = dlt.sources.incremental("time", initial_value=start_date)
+
             @dlt.resource(
                 table_name="weather_historic",
                 write_disposition="merge",
@@ -54,12 +76,13 @@ def weather_historic_source(
                 schema_contract={"tables": "evolve", "columns": "freeze", "data_type": "freeze"}
             )
             def get_historic_data(
-                time: dlt.sources.incremental[str] = dlt.sources.incremental(
-                    "time", initial_value=start_date
-                )
+                time: dlt.sources.incremental[str] = cursor,
             ) -> Iterator[Dict[str, Any]]:
-                start = datetime.strptime(time.last_value, "%Y-%m-%dT%H:%M").date()
-                end = date.today()
+                if window is not None:
+                    start, end = window[0], min(window[1], date.today())
+                else:
+                    start = datetime.strptime(time.last_value, "%Y-%m-%dT%H:%M").date()
+                    end = date.today()
                 if end_cap is not None:
                     end = min(end, end_cap)
                 if start > end:
@@ -0,0 +1,69 @@
+"""Keep dbt's parse artifacts warm between code-location loads and runs.
+
+- The manifest in ``target/`` is reused as long as the project files hash
+  to the value stored next to it. Otherwise the project is prepared
+  (``dbt deps`` + ``dbt parse``) once at load time.
+- dagster-dbt gives every invocation its own target directory and seeds it
+  with ``target/partial_parse.msgpack``. Copying the file back after a
+  successful run keeps the next invocation's partial parse current.
+
+CI caches ``target/`` (see ``.github/workflows/pipelines.yml``), so both
+survive between workflow runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from importlib.metadata import version
+from pathlib import Path
+
+from dagster_dbt import DbtProject
+
+PARTIAL_PARSE_FILE = "partial_parse.msgpack"
+MANIFEST_HASH_FILE = "manifest.sha256"
+
+# Everything dbt reads while parsing; target/, logs/ and dbt_packages/ are
+# derived (packages are pinned by package-lock.yml).
+_PROJECT_FILES = ("dbt_project.yml", "profiles.yml", "packages.yml", "package-lock.yml")
+_PROJECT_DIRS = ("models", "macros", "seeds", "snapshots", "tests", "analyses")
+
+
+def project_hash(project_dir: Path) -> str:
+    """SHA-256 over the dbt project's source files and the dbt-core version."""
+    digest = hashlib.sha256(version("dbt-core").encode())
+    paths = [project_dir / name for name in _PROJECT_FILES]
+    for name in _PROJECT_DIRS:
+        root = project_dir / name
+        if root.is_dir():
+            paths.extend(sorted(p for p in root.rglob("*") if p.is_file()))
+    for path in paths:
+        if path.exists():
+            digest.update(str(path.relative_to(project_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def ensure_manifest(project: DbtProject) -> None:
+    """Re-parse the project only when its files changed since the manifest
+    in ``target/`` was written."""
+    target_dir = project.project_dir / project.target_path
+    hash_path = target_dir / MANIFEST_HASH_FILE
+    current = project_hash(project.project_dir)
+    if project.manifest_path.exists() and hash_path.exists():
+        if hash_path.read_text().strip() == current:
+            return
+    project.preparer.prepare(project)
+    hash_path.write_text(current)
+
+
+def persist_partial_parse(invocation_target: Path, project: DbtProject) -> None:
+    """Copy an invocation's partial-parse file back to ``target/``."""
+    source = invocation_target / PARTIAL_PARSE_FILE
+    if not source.exists():
+        return
+    destination = project.project_dir / project.target_path / PARTIAL_PARSE_FILE
+    tmp = destination.with_suffix(f".{os.getpid()}.tmp")
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, destination)
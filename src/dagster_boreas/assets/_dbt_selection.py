@@ -0,0 +1,168 @@
+"""Work out which dbt nodes a ``dbt build`` actually has to run.
+
+A node is stale when
+
+- one of the bronze sources it (transitively) reads was materialized after
+  the source's direct dbt consumers last were, or
+- it changed since it last built successfully, compared against the
+  checksum and config saved for it then (the equivalent of
+  ``state:modified+``), or
+- it has never been materialized.
+
+Everything downstream of a stale node is stale too. The result is turned
+into an ``--exclude`` list: dagster-dbt unions a runtime ``--select`` with
+the op's own selection, but excludes still narrow it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from dagster import AssetExecutionContext
+from dagster_dbt import DagsterDbtTranslator, DbtProject
+
+# Run tag that skips the selection and builds every node of the op.
+FULL_BUILD_TAG = "boreas/dbt_full_build"
+
+_BUILDABLE = ("model", "seed", "snapshot")
+
+
+def _buildable(unique_id: str) -> bool:
+    return unique_id.split(".", 1)[0] in _BUILDABLE
+
+
+def _descendants(manifest: Mapping[str, Any], roots: Iterable[str]) -> set[str]:
+    child_map = manifest["child_map"]
+    seen: set[str] = set()
+    stack = list(roots)
+    while stack:
+        uid = stack.pop()
+        if uid in seen:
+            continue
+        seen.add(uid)
+        stack.extend(child_map.get(uid, ()))
+    return {uid for uid in seen if _buildable(uid)}
+
+
+def _modified_nodes(
+    manifest: Mapping[str, Any], previous: Mapping[str, Any] | None
+) -> set[str] | None:
+    """Nodes whose file checksum or config differ from ``previous``; ``None``
+    when there is no previous manifest to compare against."""
+    if previous is None:
+        return None
+    old_nodes = previous.get("nodes", {})
+    modified = set()
+    for uid, node in manifest["nodes"].items():
+        if not _buildable(uid):
+            continue
+        old = old_nodes.get(uid)
+        if (
+            old is None
+            or old.get("checksum") != node.get("checksum")
+            or old.get("config") != node.get("config")
+        ):
+            modified.add(uid)
+    return modified
+
+
+def stale_nodes(
+    context: AssetExecutionContext,
+    manifest: Mapping[str, Any],
+    translator: DagsterDbtTranslator,
+    project: DbtProject,
+    state_dir: Path,
+) -> set[str] | None:
+    """Unique ids of the selected dbt nodes that need rebuilding, or ``None``
+    when everything selected should be built."""
+    if context.run.tags.get(FULL_BUILD_TAG) == "true":
+        return None
+
+    previous_path = state_dir / "manifest.json"
+    previous = json.loads(previous_path.read_text()) if previous_path.exists() else None
+    modified = _modified_nodes(manifest, previous)
+    if modified is None:
+        context.log.info(f"No saved dbt state in {state_dir}; building every selected node")
+        return None
+
+    instance = context.instance
+    key_by_uid = {
+        uid: translator.get_asset_spec(manifest, uid, project).key
+        for uid in [*manifest["nodes"], *manifest["sources"]]
+        if uid.startswith("source.") or _buildable(uid)
+    }
+
+    def last_materialized(uid: str) -> float | None:
+        event = instance.get_latest_materialization_event(key_by_uid[uid])
+        return event.timestamp if event is not None else None
+
+    roots = set(modified)
+    for uid in manifest["sources"]:
+        source_ts = last_materialized(uid)
+        if source_ts is None:
+            continue
+        consumers = [c for c in manifest["child_map"].get(uid, ()) if _buildable(c)]
+        consumed = [last_materialized(c) for c in consumers]
+        if any(ts is None or ts < source_ts for ts in consumed):
+            context.log.info(f"{key_by_uid[uid].to_user_string()} changed since its consumers last ran")
+            roots.update(consumers)
+    roots.update(
+        uid for uid in manifest["nodes"] if _buildable(uid) and last_materialized(uid) is None
+    )
+    return _descendants(manifest, roots)
+
+
+def exclude_args(
+    context: AssetExecutionContext,
+    manifest: Mapping[str, Any],
+    translator: DagsterDbtTranslator,
+    project: DbtProject,
+    stale: set[str],
+) -> list[str] | None:
+    """``--exclude`` arguments for the selected nodes that are not stale, or
+    ``None`` when none of the selected nodes is stale."""
+    selected = {
+        uid
+        for uid in manifest["nodes"]
+        if _buildable(uid)
+        and translator.get_asset_spec(manifest, uid, project).key in context.selected_asset_keys
+    }
+    if not selected & stale:
+        return None
+    fresh = sorted(selected - stale)
+    if not fresh:
+        return []
+    return ["--exclude", " ".join("fqn:" + ".".join(manifest["nodes"][uid]["fqn"]) for uid in fresh)]
+
+
+def save_state(target_path: Path, state_dir: Path) -> None:
+    """Advance the comparison state for the nodes this build ran successfully.
+
+    Nodes it did not build (excluded, outside the op's subset, or failed)
+    keep their previous entry, or stay absent, so they still count as
+    modified until a build actually runs them.
+    """
+    manifest = json.loads((target_path / "manifest.json").read_text())
+    results = json.loads((target_path / "run_results.json").read_text())["results"]
+    built = [
+        r["unique_id"]
+        for r in results
+        if r.get("status") == "success" and _buildable(r["unique_id"])
+    ]
+
+    path = state_dir / "manifest.json"
+    previous = json.loads(path.read_text()) if path.exists() else {}
+    nodes = {
+        uid: node for uid, node in previous.get("nodes", {}).items() if uid in manifest["nodes"]
+    }
+    for uid in built:
+        node = manifest["nodes"][uid]
+        nodes[uid] = {"checksum": node.get("checksum"), "config": node.get("config")}
+
+    state_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"nodes": nodes}))
+    os.replace(tmp, path)
@@ -0,0 +1,218 @@
+"""Cheap materialization metadata for tables in ``boreas.duckdb``.
+
+Replaces full-table ``COUNT(*)``/``MIN``/``MAX`` scans and rendered plots
+with statistics whose cost does not grow with the table:
+
+- table sizes come from DuckDB's catalog (``duckdb_tables()``);
+- rows per date are kept in ``boreas_stats.rows_per_date``. After each
+  materialization only the touched dates are recounted: for bronze, the
+  dates of the rows carrying the run's dlt load ids; for dbt models, the
+  dates of rows newer than the stored ``loaded_at`` watermark, compared in
+  the column's own type so DuckDB's zone maps skip older row groups.
+
+Metadata is returned as Dagster values (``dagster/row_count`` and a table of
+recent dates), so the UI can render and compare it across runs. Failures are
+swallowed to a text value — metadata must never fail a run.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import dagster as dg
+from dagster_duckdb import DuckDBResource
+
+STATS_SCHEMA = "boreas_stats"
+# Dates shown in the rows-per-date table on each materialization.
+RECENT_DATES = 31
+
+_ROWS_PER_DATE_SCHEMA = dg.TableSchema(
+    columns=[
+        dg.TableColumn("date", "date"),
+        dg.TableColumn("rows", "int"),
+    ]
+)
+
+
+def _ensure_stats_tables(con) -> None:
+    con.execute(f'CREATE SCHEMA IF NOT EXISTS "{STATS_SCHEMA}"')
+    con.execute(
+        f'CREATE TABLE IF NOT EXISTS "{STATS_SCHEMA}".rows_per_date '
+        "(table_name VARCHAR, date DATE, row_count BIGINT)"
+    )
+    con.execute(
+        f'CREATE TABLE IF NOT EXISTS "{STATS_SCHEMA}".watermarks '
+        "(table_name VARCHAR, watermark VARCHAR, updated_at TIMESTAMP)"
+    )
+
+
+def _estimated_size(con, schema: str, table: str) -> int | None:
+    """Row count from the catalog. It is exact for freshly written tables and
+    an upper bound after deletes (until DuckDB vacuums them)."""
+    row = con.execute(
+        "SELECT estimated_size FROM duckdb_tables() WHERE schema_name = ? AND table_name = ?",
+        (schema, table),
+    ).fetchone()
+    return int(row[0]) if row is not None else None
+
+
+def _column_type(con, schema: str, table: str, column: str) -> str:
+    return con.execute(
+        "SELECT data_type FROM duckdb_columns() "
+        "WHERE schema_name = ? AND table_name = ? AND column_name = ?",
+        (schema, table, column),
+    ).fetchone()[0]
+
+
+def _refresh_rows_per_date(
+    con,
+    name: str,
+    qualified: str,
+    date_column: str,
+    watermark_column: str,
+    full: bool,
+    load_ids: Sequence[str] | None,
+) -> None:
+    """Recount the touched dates (all dates when ``full``) and move the
+    watermark forward. With ``load_ids`` the touched rows are the ones
+    carrying those ids; otherwise they are the rows past the stored
+    watermark."""
+    stats = f'"{STATS_SCHEMA}"'
+    day = f'CAST("{date_column}" AS DATE)'
+    previous = con.execute(
+        f"SELECT watermark FROM {stats}.watermarks WHERE table_name = ?", (name,)
+    ).fetchone()
+    if previous is None or previous[0] is None:
+        full = True
+
+    if load_ids is not None:
+        if not load_ids:
+            return  # the run loaded nothing
+        watermark = max(load_ids)
+        # A constant IN list is pushed down to the scan and checked against
+        # each row group's min/max, so only this load's row groups are read.
+        lo, hi = con.execute(
+            f"SELECT MIN({day}), MAX({day}) FROM {qualified} "
+            f'WHERE "{watermark_column}" IN ({", ".join("?" * len(load_ids))})',
+            list(load_ids),
+        ).fetchone()
+    elif full:
+        touched = con.execute(f'SELECT MAX("{watermark_column}")::VARCHAR FROM {qualified}').fetchone()
+        watermark, lo, hi = touched[0], None, None
+    else:
+        schema, table = name.split(".", 1)
+        column_type = _column_type(con, schema, table, watermark_column)
+        watermark, lo, hi = con.execute(
+            f'SELECT MAX("{watermark_column}")::VARCHAR, MIN({day}), MAX({day}) '
+            f'FROM {qualified} WHERE "{watermark_column}" > CAST(? AS {column_type})',
+            (previous[0],),
+        ).fetchone()
+        if watermark is None:
+            return  # nothing written since the last refresh
+
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if full:
+            con.execute(f"DELETE FROM {stats}.rows_per_date WHERE table_name = ?", (name,))
+            con.execute(
+                f"INSERT INTO {stats}.rows_per_date "
+                f'SELECT ?, {day} AS d, COUNT(*) FROM {qualified} WHERE "{date_column}" IS NOT NULL '
+                "GROUP BY d",
+                (name,),
+            )
+        elif lo is not None:
+            # Bound the recount by the raw column so DuckDB's zone maps skip
+            # untouched row groups.
+            con.execute(
+                f"DELETE FROM {stats}.rows_per_date WHERE table_name = ? AND date BETWEEN ? AND ?",
+                (name, lo, hi),
+            )
+            con.execute(
+                f"INSERT INTO {stats}.rows_per_date "
+                f"SELECT ?, {day} AS d, COUNT(*) FROM {qualified} "
+                f'WHERE "{date_column}" >= CAST(? AS DATE) '
+                f'AND "{date_column}" < CAST(? AS DATE) + INTERVAL 1 DAY '
+                "GROUP BY d",
+                (name, lo, hi),
+            )
+        con.execute(f"DELETE FROM {stats}.watermarks WHERE table_name = ?", (name,))
+        con.execute(
+            f"INSERT INTO {stats}.watermarks VALUES (?, ?, now()::TIMESTAMP)", (name, watermark)
+        )
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+
+def table_stats(
+    duckdb: DuckDBResource,
+    *,
+    schema: str,
+    table: str,
+    date_column: str | None = None,
+    watermark_column: str = "loaded_at",
+    replaced: bool = False,
+    load_ids: Sequence[str] | None = None,
+) -> dict[str, dg.MetadataValue]:
+    """Metadata for ``"<schema>"."<table>"``: its row count and, with a
+    ``date_column``, the date range and rows per recent date.
+
+    ``replaced`` tables are rewritten by every run, so their dates are always
+    recounted from scratch. ``load_ids`` are the dlt loads the run wrote
+    (values of ``watermark_column``); they bound the recount without scanning
+    the table for a new watermark.
+    """
+    meta: dict[str, dg.MetadataValue] = {}
+    name = f"{schema}.{table}"
+    qualified = f'"{schema}"."{table}"'
+    try:
+        with duckdb.get_connection() as con:
+            estimated = _estimated_size(con, schema, table)
+            if date_column is None:
+                if estimated is not None:
+                    meta["dagster/row_count"] = dg.MetadataValue.int(estimated)
+                return meta
+
+            _ensure_stats_tables(con)
+            stored = con.execute(
+                f'SELECT SUM(row_count) FROM "{STATS_SCHEMA}".rows_per_date WHERE table_name = ?',
+                (name,),
+            ).fetchone()[0]
+            # A table smaller than its stored counts was rebuilt with fewer
+            # rows (e.g. a dbt full refresh); start over.
+            rebuilt = stored is not None and estimated is not None and estimated < stored
+            _refresh_rows_per_date(
+                con,
+                name,
+                qualified,
+                date_column,
+                watermark_column,
+                replaced or rebuilt,
+                load_ids,
+            )
+
+            total, first, last = con.execute(
+                f"SELECT SUM(row_count), MIN(date), MAX(date) "
+                f'FROM "{STATS_SCHEMA}".rows_per_date WHERE table_name = ?',
+                (name,),
+            ).fetchone()
+            recent = con.execute(
+                f'SELECT date, row_count FROM "{STATS_SCHEMA}".rows_per_date '
+                "WHERE table_name = ? ORDER BY date DESC LIMIT ?",
+                (name, RECENT_DATES),
+            ).fetchall()
+
+        meta["dagster/row_count"] = dg.MetadataValue.int(int(total or 0))
+        meta[f"{date_column}_min"] = dg.MetadataValue.text(str(first) if first else "—")
+        meta[f"{date_column}_max"] = dg.MetadataValue.text(str(last) if last else "—")
+        meta["rows_per_date"] = dg.MetadataValue.table(
+            records=[
+                dg.TableRecord({"date": d.isoformat(), "rows": int(n)}) for d, n in recent
+            ],
+            schema=_ROWS_PER_DATE_SCHEMA,
+        )
+    except Exception as exc:  # pragma: no cover - metadata must never fail the run
+        meta["stats_error"] = dg.MetadataValue.text(f"{type(exc).__name__}: {exc}")
+    return meta
+
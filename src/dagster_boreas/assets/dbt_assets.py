@@ -4,75 +4,252 @@ Loads every dbt model in ``dbt_boreas/`` as a Dagster asset. Bronze-layer
 sources declared in the dbt project match the AssetKeys produced by
 ``dagster_boreas.assets.dlt_assets`` so the full graph
 (dlt -> silver -> gold) is auto-wired.
+
+The dbt assets share the bronze layer's daily partitions. A run for a
+partition (or, via the single-run backfill policy, a whole backfilled range)
+writes its window to ``partition_window.json`` in the dbt invocation's own
+target directory. The silver fact models read it from there to pick up that
+window's rows even when they were loaded out of order (see
+``macros/partition_window.sql``). A file rather than ``--vars`` keeps dbt's
+partial parse valid from one partition to the next, and unlike environment
+variables it is scoped to the one invocation.
+
+Each build only runs the nodes downstream of bronze tables that changed
+since their consumers last materialized, plus nodes modified since the
+last successful build (see ``_dbt_selection.py``). The elementary package
+models are a separate, unpartitioned asset that runs on its own schedule.
 """
 
+import json
+import time
+import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Mapping, NamedTuple
+from typing import Any, Iterator, Mapping
 
 import dagster as dg
 from dagster import AssetExecutionContext
 from dagster_dbt import DagsterDbtTranslator, DbtCliResource, DbtProject, dbt_assets
 from dagster_duckdb import DuckDBResource
 
-from src.dagster_boreas.assets._row_count_plot import rows_per_date_plot
+from src.dagster_boreas.assets._dbt_artifacts import ensure_manifest, persist_partial_parse
+from src.dagster_boreas.assets._dbt_selection import exclude_args, save_state, stale_nodes
+from src.dagster_boreas.assets._stats import table_stats
+from src.dagster_boreas.assets.partitions import daily_partitions
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 DBT_PROJECT_DIR = REPO_ROOT / "dbt_boreas"
+# Checksum and config of every node as it last built, compared against to find
+# modified nodes (see ``_dbt_selection.save_state``).
+DBT_STATE_DIR = DBT_PROJECT_DIR / "state"
+ELEMENTARY_SELECT = "package:elementary"
+# Read by macros/partition_window.sql from the invocation's target directory.
+PARTITION_WINDOW_FILE = "partition_window.json"
 
 dbt_project = DbtProject(
     project_dir=DBT_PROJECT_DIR,
     profiles_dir=DBT_PROJECT_DIR,
     target="dev",
 )
-if not dbt_project.manifest_path.exists():
-    dbt_project.prepare_if_dev()
+ensure_manifest(dbt_project)
 
 dbt_resource = DbtCliResource(project_dir=dbt_project)
+dbt_manifest = json.loads(dbt_project.manifest_path.read_text())
 
 
 class BoreasDbtTranslator(DagsterDbtTranslator):
     """Route every node from the ``elementary`` dbt package into a dedicated
     ``observability`` group so the ~30 metadata models don't clutter the
-    bronze/silver/gold lineage."""
+    bronze/silver/gold lineage.
+
+    The project's own models materialize eagerly: as soon as one of their
+    upstream assets updated (and none is still running), so a forecast
+    refresh only rebuilds the models downstream of the forecast. Elementary
+    keeps its own schedule."""
 
     def get_group_name(self, dbt_resource_props: Mapping[str, Any]) -> str | None:
         if dbt_resource_props.get("package_name") == "elementary":
             return "observability"
         return super().get_group_name(dbt_resource_props)
 
-
-class _DatePlotSpec(NamedTuple):
-    schema: str
-    table: str
-    date_column: str
+    def get_automation_condition(
+        self, dbt_resource_props: Mapping[str, Any]
+    ) -> dg.AutomationCondition | None:
+        if dbt_resource_props.get("package_name") == "elementary":
+            return None
+        return dg.AutomationCondition.eager()
 
 
-_ROWS_PER_DATE_MODELS: dict[str, _DatePlotSpec] = {
-    "fact_weather": _DatePlotSpec("2_silver", "fact_weather", "time"),
-    "fact_avalanche_danger": _DatePlotSpec("2_silver", "fact_avalanche_danger", "valid_from"),
-    "avalanche_per_region": _DatePlotSpec("3_gold", "avalanche_per_region", "date"),
-    "weather_per_region": _DatePlotSpec("3_gold", "weather_per_region", "date"),
+# Models whose rows per date are tracked, by asset key, with their date column.
+_DATED_MODELS: dict[dg.AssetKey, str] = {
+    dg.AssetKey(["2_silver", "fact_weather"]): "time",
+    dg.AssetKey(["2_silver", "fact_avalanche_danger"]): "valid_from",
+    dg.AssetKey(["3_gold", "avalanche_per_region"]): "date",
+    dg.AssetKey(["3_gold", "weather_per_region"]): "date",
 }
 
 
-@dbt_assets(manifest=dbt_project.manifest_path, dagster_dbt_translator=BoreasDbtTranslator())
+def _target_path(context: AssetExecutionContext) -> Path:
+    """A fresh target directory for one dbt invocation, named the way
+    dagster-dbt names its own. Partitioned runs write their window into it
+    for the ``partition_window`` macro."""
+    path = (
+        dbt_project.project_dir
+        / dbt_project.target_path
+        / f"{context.op_execution_context.op.name}-{context.run.run_id[:7]}-{uuid.uuid4().hex[:7]}"
+    )
+    path.mkdir(parents=True)
+    if context.has_partition_key or context.has_partition_key_range:
+        window = context.partition_time_window
+        (path / PARTITION_WINDOW_FILE).write_text(
+            json.dumps(
+                {
+                    "window_start": window.start.date().isoformat(),
+                    "window_end": window.end.date().isoformat(),
+                }
+            )
+        )
+    return path
+
+
+def _event_ts(raw_event: Mapping[str, Any]) -> float:
+    return datetime.fromisoformat(raw_event["info"]["ts"].replace("Z", "+00:00")).timestamp()
+
+
+class _InvocationTimer:
+    """Splits a dbt invocation into startup, parse and execute time from its
+    log events: dbt logs ``MainReportVersion`` once it has started and
+    ``FoundStats`` once parsing is done, right before it runs nodes.
+
+    Each materialization records the invocation's startup and parse time and
+    the execute time up to that node's result; the full split is logged when
+    dbt exits."""
+
+    def __init__(self) -> None:
+        self.launched = time.time()
+        self.started: float | None = None
+        self.parsed: float | None = None
+        self.last: float | None = None
+        self.partial_parse = True
+
+    def observe(self, raw_event: Mapping[str, Any]) -> None:
+        name = raw_event["info"]["name"]
+        ts = _event_ts(raw_event)
+        self.last = ts
+        if name == "MainReportVersion" and self.started is None:
+            self.started = ts
+        elif name == "UnableToPartialParse":
+            self.partial_parse = False
+        elif name == "FoundStats" and self.parsed is None:
+            self.parsed = ts
+
+    def _phases(self) -> tuple[float, float, float]:
+        started = self.started or self.launched
+        parsed = self.parsed or started
+        last = self.last or parsed
+        return started - self.launched, parsed - started, last - parsed
+
+    def metadata(self) -> dict[str, dg.MetadataValue]:
+        startup, parse, execute = self._phases()
+        return {
+            "dbt_startup_seconds": dg.MetadataValue.float(round(startup, 2)),
+            "dbt_parse_seconds": dg.MetadataValue.float(round(parse, 2)),
+            "dbt_execute_seconds": dg.MetadataValue.float(round(execute, 2)),
+            "dbt_partial_parse": dg.MetadataValue.bool(self.partial_parse),
+        }
+
+    def summary(self) -> str:
+        startup, parse, execute = self._phases()
+        mode = "partial" if self.partial_parse else "full"
+        return f"dbt startup {startup:.1f}s, parse {parse:.1f}s ({mode}), execute {execute:.1f}s"
+
+
+def _with_date_stats(
+    context: AssetExecutionContext, duckdb: DuckDBResource, events: list
+) -> Iterator[Any]:
+    """Yield ``events``, adding rows-per-date stats to tracked models' outputs."""
+    for event in events:
+        output_name = getattr(event, "output_name", None)
+        key = context.asset_key_for_output(output_name) if output_name else None
+        if key in _DATED_MODELS:
+            context.add_output_metadata(
+                metadata=table_stats(
+                    duckdb, schema=key.path[0], table=key.path[-1], date_column=_DATED_MODELS[key]
+                ),
+                output_name=output_name,
+            )
+        yield event
+
+
+_translator = BoreasDbtTranslator()
+
+
+@dbt_assets(
+    manifest=dbt_manifest,
+    dagster_dbt_translator=_translator,
+    exclude=ELEMENTARY_SELECT,
+    partitions_def=daily_partitions,
+    backfill_policy=dg.BackfillPolicy.single_run(),
+    pool="duckdb_writer",
+)
 def dbt_boreas_assets(
     context: AssetExecutionContext, dbt: DbtCliResource, duckdb: DuckDBResource
 ):
-    for event in dbt.cli(["build"], context=context).stream():
-        yield event
-        output_name = getattr(event, "output_name", None)
-        spec = _ROWS_PER_DATE_MODELS.get(output_name) if output_name else None
-        if spec is None:
-            continue
-        context.add_output_metadata(
-            metadata={
-                "rows_per_date": rows_per_date_plot(
-                    duckdb,
-                    schema=spec.schema,
-                    table=spec.table,
-                    date_column=spec.date_column,
-                )
-            },
-            output_name=output_name,
-        )
+    args = ["build"]
+    stale = stale_nodes(context, dbt_manifest, _translator, dbt_project, DBT_STATE_DIR)
+    if stale is not None:
+        excludes = exclude_args(context, dbt_manifest, _translator, dbt_project, stale)
+        if excludes is None:
+            context.log.info("No upstream changes or modified models; skipping dbt build")
+            return
+        args += excludes
+
+    timer = _InvocationTimer()
+    invocation = dbt.cli(args, context=context, target_path=_target_path(context))
+    # From the first tracked model on, events are held back until dbt exits:
+    # the stats are written to the DuckDB file the dbt process has locked,
+    # and Dagster needs the outputs in dependency order.
+    held: list = []
+    try:
+        for raw in invocation.stream_raw_events():
+            timer.observe(raw.raw_event)
+            for event in raw.to_default_asset_events(
+                manifest=invocation.manifest,
+                dagster_dbt_translator=invocation.dagster_dbt_translator,
+                context=context,
+                target_path=invocation.target_path,
+                project=invocation.project,
+            ):
+                output_name = getattr(event, "output_name", None)
+                if output_name is not None:
+                    context.add_output_metadata(metadata=timer.metadata(), output_name=output_name)
+                    if context.asset_key_for_output(output_name) in _DATED_MODELS:
+                        held.append(event)
+                        continue
+                if held:
+                    held.append(event)
+                else:
+                    yield event
+    except Exception:
+        # Models that did build still report, with their stats.
+        yield from _with_date_stats(context, duckdb, held)
+        raise
+    yield from _with_date_stats(context, duckdb, held)
+    context.log.info(timer.summary())
+    if invocation.is_successful():
+        save_state(invocation.target_path, DBT_STATE_DIR)
+        persist_partial_parse(invocation.target_path, dbt_project)
+
+
+@dbt_assets(
+    manifest=dbt_manifest,
+    dagster_dbt_translator=_translator,
+    select=ELEMENTARY_SELECT,
+    name="elementary_dbt_assets",
+    pool="duckdb_writer",
+)
+def elementary_dbt_assets(context: AssetExecutionContext, dbt: DbtCliResource):
+    """Elementary's metadata models. They only summarise run results and test
+    metrics, so they refresh on their own schedule instead of with every
+    partition build."""
+    yield from dbt.cli(["build"], context=context).stream()
@@ -5,64 +5,101 @@ We expose them as Dagster assets keyed as ``["1_bronze", "<table>"]`` so they
 line up automatically with the dbt sources declared in
 ``dbt_boreas/models/1_bronze/sources.yml``.
 
-Every materialization attaches metadata describing the observed date range
-(min/max of the table's time column), row count, and the dlt load id, so the
-Dagster UI shows exactly which window was fetched on each run.
+Every materialization attaches metadata describing the rows the run wrote,
+the table's row count and date range, rows per recent date, and the dlt load
+id, so the Dagster UI shows exactly which window was fetched on each run. The
+statistics are maintained incrementally (see ``_stats.py``), so they cost the
+same however large the bronze tables grow.
+
+``weather_historic`` and ``avalanche_danger_levels`` are daily-partitioned
+(see ``partitions.py``): each partition fetches its own day, so backfills fan
+out into one run per day. The reference tables and the forecast (fully
+replaced every run) stay unpartitioned.
+
+Each asset declares when it goes stale through an automation condition (a
+cron tick in Europe/Oslo time, evaluated by the ``boreas_automation``
+sensor) and a freshness policy that flags it in the UI when a refresh was
+missed. The dbt models downstream follow eagerly (see ``dbt_assets.py``).
+
+Each asset is a graph of two ops. ``extract_<table>`` fetches over HTTP and
+normalizes into a dlt load package on local disk without opening DuckDB, so
+extraction for all sources runs concurrently. ``load_<table>`` writes the
+package and holds the ``duckdb_writer`` pool, which keeps DuckDB at a single
+writer for just the (short) load.
+
+The dlt pipeline modules (and dlt itself, which pulls in pyarrow and
+pandas) are imported inside the ops, so loading the code location does not
+pay for them.
 """
 
-from datetime import datetime, timezone
-from typing import Iterator
+import importlib
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
 import dagster as dg
-from dagster import AssetExecutionContext
 from dagster_duckdb import DuckDBResource
 
-from dlt_boreas.pipelines.avalanche_pipeline import run_avalanche_pipeline
-from dlt_boreas.pipelines.region_pipeline import run_regions_pipeline
-from dlt_boreas.pipelines.weather_forecast_pipeline import run_weather_forecast_pipeline
-from dlt_boreas.pipelines.weather_historic_pipeline import run_weather_historic_pipeline
-from src.dagster_boreas.assets._row_count_plot import rows_per_date_plot
+from src.dagster_boreas.assets._stats import table_stats
+from src.dagster_boreas.assets.partitions import (
+    PARTITIONS_TIMEZONE,
+    daily_partitions,
+    partition_dates,
+)
 
 BRONZE = "1_bronze"
 AVALANCHE_GROUP = "avalanche_ingestion"
 WEATHER_GROUP = "weather_ingestion"
 DLT_KINDS = {"dlt", "duckdb"}
 
+# The newest partition (the daily run) also re-fetches recent days: the
+# weather archive fills in yesterday after midnight and NVE revises warnings,
+# and avalanche warnings are published up to AVALANCHE_FORECAST_DAYS ahead.
+WEATHER_HEAD_LOOKBACK_DAYS = 1
+AVALANCHE_HEAD_LOOKBACK_DAYS = 7
+AVALANCHE_FORECAST_DAYS = 4
+
+# Refresh cadence (Europe/Oslo). The forecast is re-issued every hour; the
+# weather archive has yesterday complete a couple of hours after midnight;
+# NVE publishes the coming days' warnings by 16:00. The reference tables
+# rarely change.
+FORECAST_CRON = "0 * * * *"
+WEATHER_HISTORIC_CRON = "0 3 * * *"
+AVALANCHE_CRON = "30 16 * * *"
+REFERENCE_CRON = "0 4 * * 1"
+
+
+def _on_cron(cron: str) -> dg.AutomationCondition:
+    return dg.AutomationCondition.on_cron(cron, cron_timezone=PARTITIONS_TIMEZONE)
+
 
 def _now_ts() -> float:
     return datetime.now(timezone.utc).timestamp()
 
 
-def _table_stats(
+def _bronze_stats(
     duckdb: DuckDBResource,
     table: str,
-    time_columns: tuple[str, ...] = (),
+    date_column: str | None = None,
+    replaced: bool = False,
+    load_ids: list[str] | None = None,
 ) -> dict[str, dg.MetadataValue]:
-    """Read row count and (optionally) min/max of one or more time columns.
-
-    Returns a metadata dict ready to hand to MaterializeResult. Failures are
-    swallowed to a metadata note so a metadata read never fails a materialization.
-    """
-    meta: dict[str, dg.MetadataValue] = {}
-    qualified = f'"{BRONZE}"."{table}"'
-    try:
-        with duckdb.get_connection() as con:
-            (rows,) = con.execute(f"SELECT COUNT(*) FROM {qualified}").fetchone()
-            meta["row_count"] = dg.MetadataValue.int(int(rows))
-            for col in time_columns:
-                row = con.execute(
-                    f'SELECT MIN("{col}"), MAX("{col}") FROM {qualified}'
-                ).fetchone()
-                meta[f"{col}_min"] = dg.MetadataValue.text(str(row[0]) if row[0] is not None else "—")
-                meta[f"{col}_max"] = dg.MetadataValue.text(str(row[1]) if row[1] is not None else "—")
-    except Exception as exc:  # pragma: no cover - metadata must never fail the run
-        meta["stats_error"] = dg.MetadataValue.text(f"{type(exc).__name__}: {exc}")
-    return meta
+    return table_stats(
+        duckdb,
+        schema=BRONZE,
+        table=table,
+        date_column=date_column,
+        watermark_column="_dlt_load_id",
+        replaced=replaced,
+        load_ids=load_ids,
+    )
 
 
-def _load_info_metadata(load_info) -> dict[str, dg.MetadataValue]:
+def _load_info_metadata(load_info, rows_loaded: int) -> dict[str, dg.MetadataValue]:
     """Extract useful fields from a dlt LoadInfo object."""
-    meta: dict[str, dg.MetadataValue] = {"fetched_at": dg.MetadataValue.timestamp(_now_ts())}
+    meta: dict[str, dg.MetadataValue] = {
+        "fetched_at": dg.MetadataValue.timestamp(_now_ts()),
+        "rows_loaded": dg.MetadataValue.int(rows_loaded),
+    }
     if load_info is None:
         return meta
     try:
@@ -77,118 +114,187 @@ def _load_info_metadata(load_info) -> dict[str, dg.MetadataValue]:
     return meta
 
 
-@dg.asset(
-    key=[BRONZE, "avalanche_regions"],
-    group_name=AVALANCHE_GROUP,
-    kinds=DLT_KINDS,
-    description="Reference table of Norwegian avalanche regions loaded via dlt.",
-    pool="duckdb_writer",
-)
-def avalanche_regions(
-    context: AssetExecutionContext, duckdb: DuckDBResource
-) -> dg.MaterializeResult:
-    context.log.info("Running regions dlt pipeline")
-    load_info = run_regions_pipeline()
-    return dg.MaterializeResult(
-        metadata={
-            **_load_info_metadata(load_info),
-            **_table_stats(duckdb, "avalanche_regions"),
-        }
+def _dlt_asset(
+    table: str,
+    *,
+    module: str,
+    extract: str,
+    load: str,
+    group_name: str,
+    description: str,
+    automation_condition: dg.AutomationCondition,
+    freshness_policy: dg.FreshnessPolicy | None = None,
+    upstream: str | None = None,
+    window: tuple[int, int] | None = None,
+    date_column: str | None = None,
+    replaced: bool = False,
+) -> dg.AssetsDefinition:
+    """Build the graph-backed asset for ``1_bronze.<table>``.
+
+    ``extract`` and ``load`` name functions in the dlt pipeline ``module``.
+    With a ``window`` of ``(head_lookback_days, head_lookahead_days)`` the
+    asset is daily-partitioned and ``extract`` receives the partition's
+    inclusive date window. ``upstream`` is a bronze table that has to be
+    loaded first.
+    """
+
+    def pipeline_fn(name: str):
+        return getattr(importlib.import_module(module), name)
+
+    @dg.op(
+        name=f"extract_{table}",
+        ins={"after": dg.In(dg.Nothing)} if upstream else None,
+        description=f"Fetch and normalize {table} into a dlt load package (no DuckDB access).",
+    )
+    def extract_op(context: dg.OpExecutionContext) -> dict[str, Any]:
+        staged: dict[str, Any] = {}
+        if window is None:
+            context.log.info(f"Extracting {table}")
+            pipeline_name, rows = pipeline_fn(extract)()
+        else:
+            first, last = partition_dates(
+                context, head_lookback_days=window[0], head_lookahead_days=window[1]
+            )
+            context.log.info(f"Extracting {table} for {first} .. {last}")
+            pipeline_name, rows = pipeline_fn(extract)(first.isoformat(), last.isoformat())
+            staged["window"] = (first.isoformat(), last.isoformat())
+        context.add_output_metadata({"rows_staged": dg.MetadataValue.int(rows.get(table, 0))})
+        return {**staged, "pipeline_name": pipeline_name, "rows": rows}
+
+    @dg.op(
+        name=f"load_{table}",
+        out=dg.Out(dg.Nothing),
+        pool="duckdb_writer",
+        description=f"Load the staged {table} package into DuckDB.",
     )
+    def load_op(context: dg.OpExecutionContext, duckdb: DuckDBResource, staged: dict[str, Any]):
+        context.log.info(f"Loading {staged['pipeline_name']}")
+        load_info = pipeline_fn(load)(staged["pipeline_name"], *staged.get("window", ()))
+        metadata = _load_info_metadata(load_info, staged["rows"].get(table, 0))
+        if "window" in staged:
+            metadata.update(
+                {
+                    "window_start": dg.MetadataValue.text(staged["window"][0]),
+                    "window_end": dg.MetadataValue.text(staged["window"][1]),
+                }
+            )
+        metadata.update(
+            _bronze_stats(
+                duckdb,
+                table,
+                date_column,
+                replaced=replaced,
+                load_ids=list(getattr(load_info, "loads_ids", None) or []),
+            )
+        )
+        context.add_output_metadata(metadata)
 
+    partitions_def = daily_partitions if window is not None else None
+    if upstream is not None:
+        # The reference table only orders the first load; its weekly refresh
+        # must not hold back the cron-driven one.
+        automation_condition = automation_condition.ignore(
+            dg.AssetSelection.assets(dg.AssetKey([BRONZE, upstream]))
+        )
 
-@dg.multi_asset(
-    specs=[
-        dg.AssetSpec(
-            key=[BRONZE, "weather_historic"],
-            group_name=WEATHER_GROUP,
-            kinds=DLT_KINDS,
-            description="Historical weather observations loaded via dlt.",
-        ),
-        dg.AssetSpec(
-            key=[BRONZE, "weather_grids"],
-            group_name=WEATHER_GROUP,
+    outs = {
+        table: dg.AssetOut(
+            key=[BRONZE, table],
+            group_name=group_name,
             kinds=DLT_KINDS,
-            description="Weather grid reference table loaded via dlt.",
-        ),
-    ],
-    pool="duckdb_writer",
+            description=description,
+            automation_condition=automation_condition,
+            freshness_policy=freshness_policy,
+        )
+    }
+
+    if upstream is None:
+
+        @dg.graph_multi_asset(name=f"{table}_bronze", outs=outs, partitions_def=partitions_def)
+        def bronze_asset():
+            return load_op(extract_op())
+
+    else:
+
+        @dg.graph_multi_asset(
+            name=f"{table}_bronze",
+            outs=outs,
+            ins={"upstream": dg.AssetIn(key=[BRONZE, upstream], dagster_type=dg.Nothing)},
+            partitions_def=partitions_def,
+        )
+        def bronze_asset(upstream):
+            return load_op(extract_op(after=upstream))
+
+    return bronze_asset
+
+
+avalanche_regions = _dlt_asset(
+    "avalanche_regions",
+    module="dlt_boreas.pipelines.region_pipeline",
+    extract="extract_regions_pipeline",
+    load="load_regions_pipeline",
+    group_name=AVALANCHE_GROUP,
+    description="Reference table of Norwegian avalanche regions loaded via dlt.",
+    automation_condition=_on_cron(REFERENCE_CRON),
 )
-def weather_historic_bronze(
-    context: AssetExecutionContext, duckdb: DuckDBResource
-) -> Iterator[dg.MaterializeResult]:
-    context.log.info("Running weather_historic dlt pipeline (populates weather_historic + weather_grids)")
-    load_info = run_weather_historic_pipeline()
-    shared = _load_info_metadata(load_info)
-
-    yield dg.MaterializeResult(
-        asset_key=dg.AssetKey([BRONZE, "weather_historic"]),
-        metadata={
-            **shared,
-            **_table_stats(duckdb, "weather_historic", ("time",)),
-            "rows_per_date": rows_per_date_plot(
-                duckdb, schema=BRONZE, table="weather_historic", date_column="time"
-            ),
-        },
-    )
-    yield dg.MaterializeResult(
-        asset_key=dg.AssetKey([BRONZE, "weather_grids"]),
-        metadata={**shared, **_table_stats(duckdb, "weather_grids")},
-    )
 
+weather_grids = _dlt_asset(
+    "weather_grids",
+    module="dlt_boreas.pipelines.weather_historic_pipeline",
+    extract="extract_weather_grids_pipeline",
+    load="load_weather_pipeline",
+    group_name=WEATHER_GROUP,
+    description="Weather grid reference table loaded via dlt.",
+    automation_condition=_on_cron(REFERENCE_CRON),
+)
 
-@dg.asset(
-    key=[BRONZE, "weather_forecast"],
+weather_historic_bronze = _dlt_asset(
+    "weather_historic",
+    module="dlt_boreas.pipelines.weather_historic_pipeline",
+    extract="extract_weather_historic_pipeline",
+    load="load_weather_pipeline",
     group_name=WEATHER_GROUP,
-    kinds=DLT_KINDS,
-    description="Weather forecast data loaded via dlt. Table is fully replaced on each run.",
-    pool="duckdb_writer",
+    description="Historical weather observations loaded via dlt, one partition per day.",
+    automation_condition=_on_cron(WEATHER_HISTORIC_CRON),
+    freshness_policy=dg.FreshnessPolicy.time_window(fail_window=timedelta(hours=26)),
+    upstream="weather_grids",
+    window=(WEATHER_HEAD_LOOKBACK_DAYS, 0),
+    date_column="time",
 )
-def weather_forecast(
-    context: AssetExecutionContext, duckdb: DuckDBResource
-) -> dg.MaterializeResult:
-    context.log.info("Running weather_forecast dlt pipeline")
-    load_info = run_weather_forecast_pipeline()
-    return dg.MaterializeResult(
-        metadata={
-            **_load_info_metadata(load_info),
-            **_table_stats(duckdb, "weather_forecast", ("time",)),
-            "rows_per_date": rows_per_date_plot(
-                duckdb, schema=BRONZE, table="weather_forecast", date_column="time"
-            ),
-        }
-    )
 
+weather_forecast = _dlt_asset(
+    "weather_forecast",
+    module="dlt_boreas.pipelines.weather_forecast_pipeline",
+    extract="extract_weather_forecast_pipeline",
+    load="load_weather_forecast_pipeline",
+    group_name=WEATHER_GROUP,
+    description="Weather forecast data loaded via dlt. Table is fully replaced on each run.",
+    automation_condition=_on_cron(FORECAST_CRON),
+    freshness_policy=dg.FreshnessPolicy.time_window(
+        fail_window=timedelta(hours=3), warn_window=timedelta(minutes=90)
+    ),
+    date_column="time",
+    replaced=True,
+)
 
-@dg.asset(
-    key=[BRONZE, "avalanche_danger_levels"],
+avalanche_danger_levels = _dlt_asset(
+    "avalanche_danger_levels",
+    module="dlt_boreas.pipelines.avalanche_pipeline",
+    extract="extract_avalanche_pipeline",
+    load="load_avalanche_pipeline",
     group_name=AVALANCHE_GROUP,
-    kinds=DLT_KINDS,
-    description="Avalanche danger warnings loaded via dlt.",
-    deps=[dg.AssetKey([BRONZE, "avalanche_regions"])],
-    pool="duckdb_writer",
+    description="Avalanche danger warnings loaded via dlt, one partition per day of validity.",
+    automation_condition=_on_cron(AVALANCHE_CRON),
+    freshness_policy=dg.FreshnessPolicy.time_window(fail_window=timedelta(hours=26)),
+    upstream="avalanche_regions",
+    window=(AVALANCHE_HEAD_LOOKBACK_DAYS, AVALANCHE_FORECAST_DAYS),
+    date_column="valid_from",
 )
-def avalanche_danger_levels(
-    context: AssetExecutionContext, duckdb: DuckDBResource
-) -> dg.MaterializeResult:
-    context.log.info("Running avalanche dlt pipeline")
-    load_info = run_avalanche_pipeline()
-    return dg.MaterializeResult(
-        metadata={
-            **_load_info_metadata(load_info),
-            **_table_stats(duckdb, "avalanche_danger_levels", ("ValidFrom", "ValidTo")),
-            "rows_per_date": rows_per_date_plot(
-                duckdb,
-                schema=BRONZE,
-                table="avalanche_danger_levels",
-                date_column="ValidFrom",
-            ),
-        }
-    )
 
 
 dlt_bronze_assets = [
     avalanche_regions,
+    weather_grids,
     weather_historic_bronze,
     weather_forecast,
     avalanche_danger_levels,
@@ -6,19 +6,62 @@ populated as a side-effect of every ``dbt build`` via the elementary package's
 on-run-end hook. Output is a single self-contained ``evidence/elementary/index.html``
 that is (1) embedded by the Streamlit "Data quality" page and (2) deployed to
 GitHub Pages by ``.github/workflows/pages.yml``.
+
+``edr report`` takes minutes, so it only runs when a node's or test's
+latest status or failure count changed since the last report. A fingerprint
+of those outcomes is kept next to the report (and committed with it), so the
+check does not depend on the Dagster instance. The asset is part of
+the ``boreas_observability`` job, which CI starts in the background after
+the main pipeline run.
 """
 
+import hashlib
 import os
 import subprocess
+import time
 from pathlib import Path
+from typing import Iterator
 
 import dagster as dg
 from dagster import AssetExecutionContext
+from dagster_duckdb import DuckDBResource
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 DBT_PROJECT_DIR = REPO_ROOT / "dbt_boreas"
 DUCKDB_PATH = REPO_ROOT / "boreas.duckdb"
 REPORT_DIR = REPO_ROOT / "evidence" / "elementary"
+FINGERPRINT_PATH = REPORT_DIR / "results_fingerprint.txt"
+
+# Run tag that regenerates the report even when no results changed.
+FORCE_REPORT_TAG = "boreas/elementary_force_report"
+
+# What the report shows: the latest outcome of each of the project's own
+# nodes (elementary refreshing its own models is not news) and of each test.
+# Timestamps and row counts are left out, so a run that only repeats the
+# previous outcomes does not regenerate the report.
+_RESULTS_FINGERPRINT_SQL = """
+WITH runs AS (
+    SELECT unique_id, status, failures
+    FROM elementary.dbt_run_results
+    WHERE unique_id NOT LIKE 'model.elementary.%'
+    QUALIFY row_number() OVER (PARTITION BY unique_id ORDER BY generated_at DESC) = 1
+),
+tests AS (
+    SELECT test_unique_id, column_name, test_sub_type, status, failures
+    FROM elementary.elementary_test_results
+    QUALIFY row_number() OVER (
+        PARTITION BY test_unique_id, column_name, test_sub_type ORDER BY detected_at DESC
+    ) = 1
+)
+SELECT
+    (SELECT COALESCE(string_agg(row(unique_id, status, failures)::VARCHAR, chr(10)
+                                ORDER BY unique_id), '')
+     FROM runs),
+    (SELECT COALESCE(string_agg(row(test_unique_id, column_name, test_sub_type,
+                                    status, failures)::VARCHAR, chr(10)
+                                ORDER BY test_unique_id, column_name, test_sub_type), '')
+     FROM tests)
+"""
 
 GOLD_DEPS = [
     dg.AssetKey(["3_gold", "avalanche_per_region"]),
@@ -26,6 +69,17 @@ GOLD_DEPS = [
 ]
 
 
+def _results_fingerprint(duckdb: DuckDBResource) -> str | None:
+    """Hash of the elementary run/test results, or ``None`` when they can't
+    be read (e.g. before the first elementary run)."""
+    try:
+        with duckdb.get_connection() as con:
+            row = con.execute(_RESULTS_FINGERPRINT_SQL).fetchone()
+    except Exception:  # noqa: BLE001 - a missing schema just means "regenerate"
+        return None
+    return hashlib.sha256("\n".join(row).encode()).hexdigest()
+
+
 @dg.asset(
     key=dg.AssetKey(["4_reporting", "elementary_report"]),
     deps=GOLD_DEPS,
@@ -34,13 +88,28 @@ GOLD_DEPS = [
     description=(
         "Elementary data-observability report (single HTML). Reads test "
         "results, freshness, and anomaly metrics from the `elementary` "
-        "schema in boreas.duckdb. Deployed to GitHub Pages by pages.yml."
+        "schema in boreas.duckdb. Deployed to GitHub Pages by pages.yml. "
+        "Skipped when no run or test results changed since the last report."
     ),
+    output_required=False,
 )
-def elementary_report(context: AssetExecutionContext) -> dg.MaterializeResult:
+def elementary_report(
+    context: AssetExecutionContext, duckdb: DuckDBResource
+) -> Iterator[dg.MaterializeResult]:
     REPORT_DIR.mkdir(parents=True, exist_ok=True)
     report_path = REPORT_DIR / "index.html"
 
+    fingerprint = _results_fingerprint(duckdb)
+    previous = FINGERPRINT_PATH.read_text().strip() if FINGERPRINT_PATH.exists() else None
+    if (
+        fingerprint is not None
+        and fingerprint == previous
+        and report_path.exists()
+        and context.run.tags.get(FORCE_REPORT_TAG) != "true"
+    ):
+        context.log.info("No new elementary run or test results since the last report; skipping")
+        return
+
     env = os.environ.copy()
     # edr runs its bundled dbt project with CWD inside .venv/, so the
     # elementary profile's relative `path:` would resolve to a rogue empty
@@ -56,6 +125,7 @@ def elementary_report(context: AssetExecutionContext) -> dg.MaterializeResult:
         "--disable-samples", "true",
     ]
     context.log.info(f"$ {' '.join(cmd)}")
+    started = time.monotonic()
     proc = subprocess.run(
         cmd, cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=False
     )
@@ -68,11 +138,17 @@ def elementary_report(context: AssetExecutionContext) -> dg.MaterializeResult:
             f"edr report failed with exit code {proc.returncode}"
         )
 
+    duration = time.monotonic() - started
+    if fingerprint is not None:
+        FINGERPRINT_PATH.write_text(fingerprint + "\n")
+
     size_kb = report_path.stat().st_size // 1024
-    return dg.MaterializeResult(
+    yield dg.MaterializeResult(
         metadata={
             "report_path": dg.MetadataValue.path(str(report_path)),
             "size_kb": dg.MetadataValue.int(size_kb),
+            "duration_seconds": dg.MetadataValue.float(round(duration, 1)),
+            "results_fingerprint": dg.MetadataValue.text(fingerprint or "—"),
             "served_at": dg.MetadataValue.md(
                 "GitHub Pages: `https://vegsja.github.io/Boreas/`"
             ),
@@ -0,0 +1,206 @@
+"""Maintenance of ``boreas.duckdb`` itself.
+
+dlt merges, dbt table rebuilds and incremental merges rewrite large parts of
+the file every day. DuckDB reuses freed blocks but never gives them back to
+the file system, so without maintenance the file (which is uploaded to the
+``latest-data`` release and downloaded by the dashboard) only grows.
+
+The ``maintenance/duckdb_file`` asset runs after the dbt models and
+
+- drops dlt's ``*_staging`` schemas. dlt only needs them during a merge load
+  and recreates them on the next one;
+- runs ``CHECKPOINT``, which folds the WAL into the file;
+- compacts the file when at least ``COMPACT_FREE_RATIO`` of its blocks are
+  free (or the ``boreas/duckdb_compact`` run tag is set), by copying every
+  schema into a fresh file with ``COPY FROM DATABASE`` and swapping it in;
+- appends per-table sizes to ``boreas_stats.table_sizes`` and reports the
+  file and per-schema sizes as metadata, so growth shows up in the UI.
+
+The asset holds the ``duckdb_writer`` pool, which ``dagster.yaml`` limits to
+one op at a time. The dlt loads, the dbt builds and the serving snapshot hold
+it as well, so no other Dagster op writes while the file is swapped.
+Processes outside Dagster are not covered by the pool.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import dagster as dg
+import duckdb as duckdb_lib
+from dagster import AssetExecutionContext
+from dagster_duckdb import DuckDBResource
+
+from src.dagster_boreas.assets._stats import STATS_SCHEMA
+from src.dagster_boreas.assets.dbt_assets import dbt_boreas_assets
+
+# Compact once a fifth of the file is dead space.
+COMPACT_FREE_RATIO = 0.2
+# Run tag that compacts regardless of the free-space ratio.
+COMPACT_TAG = "boreas/duckdb_compact"
+STAGING_SUFFIX = "_staging"
+
+_TABLE_SIZES_SCHEMA = dg.TableSchema(
+    columns=[
+        dg.TableColumn("schema", "string"),
+        dg.TableColumn("table", "string"),
+        dg.TableColumn("rows", "int"),
+        dg.TableColumn("size_mb", "float"),
+    ]
+)
+
+
+def _mb(n_bytes: int) -> float:
+    return round(n_bytes / 1024**2, 2)
+
+
+def _block_usage(con) -> tuple[int, int, int]:
+    """``(block_size, total_blocks, free_blocks)`` of the attached file."""
+    block_size, total, free = con.execute(
+        "SELECT block_size, total_blocks, free_blocks FROM pragma_database_size() "
+        "WHERE database_name = current_database()"
+    ).fetchone()
+    return int(block_size), int(total), int(free)
+
+
+def _drop_staging_schemas(con) -> list[str]:
+    schemas = [
+        row[0]
+        for row in con.execute(
+            "SELECT schema_name FROM duckdb_schemas() "
+            "WHERE database_name = current_database() AND ends_with(schema_name, ?)",
+            (STAGING_SUFFIX,),
+        ).fetchall()
+    ]
+    for schema in schemas:
+        con.execute(f'DROP SCHEMA "{schema}" CASCADE')
+    return schemas
+
+
+def _compact(path: Path) -> None:
+    """Rewrite ``path`` into a fresh file holding only live data, check that
+    every table made it across, and swap it in place."""
+    tmp = path.with_name(f"{path.stem}.compact{path.suffix}")
+    tmp.unlink(missing_ok=True)
+    con = duckdb_lib.connect()
+    try:
+        con.execute(f"ATTACH '{path}' AS src (READ_ONLY)")
+        con.execute(f"ATTACH '{tmp}' AS dst")
+        con.execute("COPY FROM DATABASE src TO dst")
+        counts = {}
+        for db in ("src", "dst"):
+            tables = con.execute(
+                "SELECT schema_name, table_name FROM duckdb_tables() WHERE database_name = ?",
+                (db,),
+            ).fetchall()
+            counts[db] = {
+                (schema, table): con.execute(
+                    f'SELECT COUNT(*) FROM {db}."{schema}"."{table}"'
+                ).fetchone()[0]
+                for schema, table in tables
+            }
+        con.execute("DETACH src")
+        con.execute("DETACH dst")
+    finally:
+        con.close()
+    if counts["src"] != counts["dst"]:
+        tmp.unlink(missing_ok=True)
+        raise RuntimeError("Compacted copy of boreas.duckdb does not match the original")
+    os.replace(tmp, path)
+
+
+def _table_sizes(con, block_size: int) -> list[tuple[str, str, int, int]]:
+    """``(schema, table, rows, bytes)`` per table. Bytes count the blocks a
+    table's segments live in, so small tables sharing a block each count it."""
+    sizes = []
+    tables = con.execute(
+        "SELECT schema_name, table_name, estimated_size FROM duckdb_tables() "
+        "WHERE database_name = current_database() ORDER BY schema_name, table_name"
+    ).fetchall()
+    for schema, table, rows in tables:
+        blocks = con.execute(
+            "SELECT COUNT(DISTINCT block_id) FROM pragma_storage_info(?) WHERE persistent",
+            (f'"{schema}"."{table}"',),
+        ).fetchone()[0]
+        sizes.append((schema, table, int(rows), int(blocks) * block_size))
+    return sizes
+
+
+def _record_sizes(con, sizes: list[tuple[str, str, int, int]]) -> None:
+    con.execute(f'CREATE SCHEMA IF NOT EXISTS "{STATS_SCHEMA}"')
+    con.execute(
+        f'CREATE TABLE IF NOT EXISTS "{STATS_SCHEMA}".table_sizes '
+        "(measured_at TIMESTAMP, schema_name VARCHAR, table_name VARCHAR, "
+        "row_count BIGINT, size_bytes BIGINT)"
+    )
+    con.executemany(
+        f'INSERT INTO "{STATS_SCHEMA}".table_sizes VALUES (now()::TIMESTAMP, ?, ?, ?, ?)',
+        sizes,
+    )
+
+
+@dg.asset(
+    key=dg.AssetKey(["maintenance", "duckdb_file"]),
+    deps=list(dbt_boreas_assets.keys),
+    kinds={"duckdb"},
+    group_name="maintenance",
+    pool="duckdb_writer",
+    description=(
+        "Drops dlt staging schemas, checkpoints boreas.duckdb and compacts it "
+        "into a fresh file when enough of it is free space. Records file, "
+        "schema and table sizes over time."
+    ),
+)
+def duckdb_file(context: AssetExecutionContext, duckdb: DuckDBResource) -> dg.MaterializeResult:
+    path = Path(duckdb.database)
+    size_before = path.stat().st_size
+
+    with duckdb.get_connection() as con:
+        dropped = _drop_staging_schemas(con)
+        con.execute("CHECKPOINT")
+        block_size, total_blocks, free_blocks = _block_usage(con)
+    free_ratio = free_blocks / total_blocks if total_blocks else 0.0
+    if dropped:
+        context.log.info(f"Dropped staging schemas: {', '.join(dropped)}")
+
+    compact = free_ratio >= COMPACT_FREE_RATIO or context.run.tags.get(COMPACT_TAG) == "true"
+    compact_seconds = None
+    if compact:
+        context.log.info(f"{free_ratio:.0%} of {path.name} is free; compacting")
+        started = time.monotonic()
+        _compact(path)
+        compact_seconds = time.monotonic() - started
+
+    with duckdb.get_connection() as con:
+        block_size, total_blocks, free_blocks = _block_usage(con)
+        sizes = _table_sizes(con, block_size)
+        _record_sizes(con, sizes)
+        con.execute("CHECKPOINT")
+    size_after = path.stat().st_size
+
+    per_schema: dict[str, int] = {}
+    for schema, _, _, n_bytes in sizes:
+        per_schema[schema] = per_schema.get(schema, 0) + n_bytes
+
+    metadata: dict[str, dg.MetadataValue] = {
+        "file_size_mb": dg.MetadataValue.float(_mb(size_after)),
+        "reclaimed_mb": dg.MetadataValue.float(_mb(size_before - size_after)),
+        "free_blocks": dg.MetadataValue.int(free_blocks),
+        "total_blocks": dg.MetadataValue.int(total_blocks),
+        "compacted": dg.MetadataValue.bool(compact),
+        "dropped_schemas": dg.MetadataValue.text(", ".join(dropped) or "—"),
+        **{
+            f"schema_size_mb/{schema}": dg.MetadataValue.float(_mb(n_bytes))
+            for schema, n_bytes in sorted(per_schema.items())
+        },
+        "table_sizes": dg.MetadataValue.table(
+            records=[
+                dg.TableRecord({"schema": s, "table": t, "rows": rows, "size_mb": _mb(b)})
+                for s, t, rows, b in sorted(sizes, key=lambda r: -r[3])
+            ],
+            schema=_TABLE_SIZES_SCHEMA,
+        ),
+    }
+    if compact_seconds is not None:
+        metadata["compact_seconds"] = dg.MetadataValue.float(round(compact_seconds, 1))
+    return dg.MaterializeResult(metadata=metadata)
@@ -0,0 +1,47 @@
+"""Daily partitions shared by the bronze ingestion assets and the dbt assets.
+
+One partition per Europe/Oslo calendar day, starting at the dlt sources'
+configured ``start_date``. ``end_offset=1`` makes today's (still filling)
+day a partition, so the daily schedule can target it.
+
+Each partition drives the date window its dlt source fetches, which lets
+Dagster backfill a season as many small parallel runs and retry single
+failed days.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import dagster as dg
+
+PARTITIONS_START = "2025-11-01"
+PARTITIONS_TIMEZONE = "Europe/Oslo"
+
+daily_partitions = dg.DailyPartitionsDefinition(
+    start_date=PARTITIONS_START,
+    timezone=PARTITIONS_TIMEZONE,
+    end_offset=1,
+)
+
+
+def partition_dates(
+    context: dg.AssetExecutionContext | dg.OpExecutionContext,
+    head_lookback_days: int = 0,
+    head_lookahead_days: int = 0,
+) -> tuple[date, date]:
+    """Return the inclusive ``(first_day, last_day)`` covered by the run's
+    partition key or partition range.
+
+    When the run includes the newest partition (the daily run), the window is
+    widened by ``head_lookback_days`` to pick up late revisions of recent
+    days, and by ``head_lookahead_days`` for sources that publish forecasts.
+    """
+    window = context.partition_time_window
+    first = window.start.date()
+    last = (window.end - timedelta(days=1)).date()
+    newest = daily_partitions.get_last_partition_key()
+    if newest is not None and last.isoformat() >= newest:
+        first -= timedelta(days=head_lookback_days)
+        last += timedelta(days=head_lookahead_days)
+    return first, last
@@ -0,0 +1,154 @@
+"""The dashboard's serving database, ``serving/boreas_serving.<version>.duckdb``.
+
+The Streamlit app only reads a handful of gold tables and the warning-search
+index, but the warehouse also holds bronze, silver, elementary and dlt
+state. This asset writes just what the dashboard reads into a separate small
+file, which CI publishes to the ``latest-data`` release as the
+``boreas_serving`` dataset (see ``deltas.py``).
+
+- The catalog is copied with ``COPY FROM DATABASE ... (SCHEMA)``, which
+  brings along the FTS extension's macros, and everything not served is
+  dropped before any data is written.
+- Each served table is written sorted by the columns the app filters on, so
+  DuckDB's zone maps skip most row groups and runs of equal values compress
+  well. The order is kept in the table's comment, which tells ``deltas.py``
+  to sort the table again after applying an increment.
+- Every run writes a new snapshot, and ``serving/CURRENT`` is pointed at it
+  only after the row counts match the warehouse (see ``snapshots.py``). A
+  running dashboard never sees a half-written file and switches over on its
+  next query; older snapshots are collected.
+
+Tables keep their warehouse schema and names, so the app's queries run
+unchanged against either file.
+"""
+
+import os
+import time
+
+import dagster as dg
+import duckdb as duckdb_lib
+from dagster import AssetExecutionContext
+from dagster_duckdb import DuckDBResource
+
+from src.dagster_boreas import snapshots
+from src.dagster_boreas.deltas import ORDER_PREFIX
+from src.dagster_boreas.assets.maintenance_assets import duckdb_file
+from src.dagster_boreas.resources import REPO_ROOT
+
+SERVING_DIR = REPO_ROOT / "serving"
+SERVING_STEM = "boreas_serving"
+
+# Served tables and the order they are written in.
+SERVING_TABLES: dict[tuple[str, str], str] = {
+    ("3_gold", "avalanche_per_region"): "date, region_id",
+    ("3_gold", "weather_per_region"): "date, grid_id",
+    ("3_gold", "weather_features_per_region"): "region_name, date",
+    ("3_gold", "danger_weather_correlation"): "region_name, scope, variable",
+    ("3_gold", "weather_by_danger_level"): "region_name, scope, variable, danger_level",
+    ("3_gold", "danger_runs"): "region_name, run_start",
+    ("3_gold", "region_daily"): "region_name, date",
+    ("3_gold", "region_weekly"): "region_name, date",
+    ("3_gold", "region_monthly"): "region_name, date",
+    ("search", "warning_texts"): "season, region_name, date",
+}
+# Schemas copied whole: the BM25 index over search.warning_texts (see the
+# fts_index dbt macro).
+SERVING_SCHEMAS = ("fts_search_warning_texts",)
+
+
+def _tables(con, db: str) -> list[tuple[str, str]]:
+    return con.execute(
+        "SELECT schema_name, table_name FROM duckdb_tables() WHERE database_name = ?", (db,)
+    ).fetchall()
+
+
+def _served(schema: str, table: str) -> bool:
+    return (schema, table) in SERVING_TABLES or schema in SERVING_SCHEMAS
+
+
+def _row_counts(con, db: str) -> dict[tuple[str, str], int]:
+    return {
+        (schema, table): con.execute(f'SELECT COUNT(*) FROM {db}."{schema}"."{table}"').fetchone()[0]
+        for schema, table in _tables(con, db)
+        if _served(schema, table)
+    }
+
+
+@dg.asset(
+    key=dg.AssetKey(["serving", "boreas_serving"]),
+    # After maintenance, which may swap boreas.duckdb for a compacted copy.
+    deps=[dg.AssetKey([schema, table]) for schema, table in SERVING_TABLES] + [duckdb_file.key],
+    kinds={"duckdb"},
+    group_name="serving",
+    pool="duckdb_writer",
+    automation_condition=dg.AutomationCondition.eager(),
+    description=(
+        "Small DuckDB file with only what the Streamlit dashboard reads: the "
+        "served gold tables, sorted, and the warning-search FTS index. "
+        "Published to the latest-data release as daily increments."
+    ),
+)
+def boreas_serving(context: AssetExecutionContext, duckdb: DuckDBResource) -> dg.MaterializeResult:
+    path = snapshots.new_path(SERVING_DIR, SERVING_STEM)
+    tmp = snapshots.partial_path(path)
+    started = time.monotonic()
+
+    con = duckdb_lib.connect()
+    try:
+        con.execute(f"ATTACH '{duckdb.database}' AS src (READ_ONLY)")
+        con.execute(f"ATTACH '{tmp}' AS dst")
+        con.execute("COPY FROM DATABASE src TO dst (SCHEMA)")
+        for schema, table in _tables(con, "dst"):
+            if not _served(schema, table):
+                con.execute(f'DROP TABLE dst."{schema}"."{table}"')
+        keep = {schema for schema, _ in SERVING_TABLES} | set(SERVING_SCHEMAS)
+        for (schema,) in con.execute(
+            "SELECT schema_name FROM duckdb_schemas() WHERE database_name = 'dst' AND NOT internal"
+        ).fetchall():
+            if schema not in keep:
+                con.execute(f'DROP SCHEMA dst."{schema}" CASCADE')
+
+        for schema, table in _tables(con, "dst"):
+            order = SERVING_TABLES.get((schema, table))
+            con.execute(
+                f'INSERT INTO dst."{schema}"."{table}" SELECT * FROM src."{schema}"."{table}"'
+                + (f" ORDER BY {order}" if order else "")
+            )
+            if order:
+                con.execute(
+                    f'COMMENT ON TABLE dst."{schema}"."{table}" IS \'{ORDER_PREFIX}{order}\''
+                )
+        missing = sorted(set(SERVING_TABLES) - set(_tables(con, "dst")))
+        expected, written = _row_counts(con, "src"), _row_counts(con, "dst")
+        con.execute("DETACH src")
+        con.execute("DETACH dst")
+    finally:
+        con.close()
+
+    if missing or expected != written:
+        tmp.unlink(missing_ok=True)
+        raise RuntimeError(
+            f"Serving database incomplete (missing tables: {missing or 'none'}, "
+            "or row counts differ from the warehouse)"
+        )
+    os.replace(tmp, path)
+    snapshots.publish(path)
+    removed = snapshots.collect_garbage(SERVING_DIR, SERVING_STEM)
+
+    size = path.stat().st_size
+    warehouse_size = os.path.getsize(duckdb.database)
+    context.log.info(
+        f"Published {path.name}: {size / 1024**2:.1f} MiB "
+        f"({size / warehouse_size:.0%} of the warehouse); "
+        f"removed {len(removed)} old snapshot(s)"
+    )
+    return dg.MaterializeResult(
+        metadata={
+            "path": dg.MetadataValue.path(str(path)),
+            "size_mb": dg.MetadataValue.float(round(size / 1024**2, 2)),
+            "warehouse_share": dg.MetadataValue.float(round(size / warehouse_size, 3)),
+            "tables": dg.MetadataValue.int(len(written)),
+            "dagster/row_count": dg.MetadataValue.int(sum(written.values())),
+            "duration_seconds": dg.MetadataValue.float(round(time.monotonic() - started, 1)),
+        }
+    )
@@ -4,7 +4,12 @@ Wires together:
 - dlt bronze-layer ingestion assets (dlt_boreas pipelines)
 - dbt silver/gold transformation assets (dbt_boreas project)
 - a shared DuckDB resource
-- a daily schedule that materializes the full graph
+- an automation sensor that refreshes each bronze asset on its own cadence
+  and the dbt models downstream of whatever changed
+- a job to materialize the full graph for a partition (manual runs, backfills)
+- a separate daily schedule for the elementary models and report
+- the dashboard's serving database, rebuilt whenever the gold tables change
+- a daily maintenance job that checkpoints and compacts boreas.duckdb
 """
 
 from __future__ import annotations
@@ -20,31 +25,101 @@ os.environ["DLT_CONFIG_DIR"] = str(Path(_DLT_PROJECT) / ".dlt")
 
 import dagster as dg
 
-from src.dagster_boreas.assets.dbt_assets import dbt_boreas_assets, dbt_resource
+from src.dagster_boreas.assets.dbt_assets import (
+    dbt_boreas_assets,
+    dbt_resource,
+    elementary_dbt_assets,
+)
 from src.dagster_boreas.assets.dlt_assets import dlt_bronze_assets
 from src.dagster_boreas.assets.elementary_assets import elementary_report
+from src.dagster_boreas.assets.maintenance_assets import duckdb_file
+from src.dagster_boreas.assets.serving_assets import boreas_serving
 from src.dagster_boreas.resources import duckdb_resource
 
-all_assets = [*dlt_bronze_assets, dbt_boreas_assets, elementary_report]
+all_assets = [
+    *dlt_bronze_assets,
+    dbt_boreas_assets,
+    elementary_dbt_assets,
+    elementary_report,
+    duckdb_file,
+    boreas_serving,
+]
+
+# Elementary's metadata models and the HTML report built from them.
+observability_selection = dg.AssetSelection.assets(
+    elementary_dbt_assets, elementary_report
+)
+
+# Maintenance and the serving snapshot work on the whole file; in the
+# partitioned job they would run once per backfilled day.
+publish_selection = dg.AssetSelection.assets(duckdb_file, boreas_serving)
 
 boreas_job = dg.define_asset_job(
     name="boreas_full_refresh",
-    selection=dg.AssetSelection.all(),
-    description="Materialize every dlt bronze table and every dbt model in dependency order.",
+    selection=dg.AssetSelection.all() - observability_selection - publish_selection,
+    description=(
+        "Materialize every dlt bronze table and every dbt model in dependency order "
+        "for one day (manual runs; scheduled refreshes go through boreas_automation). "
+        "Partitioned assets process the selected day; the rest refresh as a whole. "
+        "dbt only builds models downstream of changed bronze tables or modified code. "
+        "Backfill date ranges as asset backfills, which run dbt once over the range."
+    ),
+)
+
+publish_job = dg.define_asset_job(
+    name="boreas_publish",
+    selection=publish_selection,
+    description=(
+        "Checkpoint (and when worthwhile compact) boreas.duckdb, then write a new "
+        "dashboard snapshot. Run after boreas_full_refresh or a backfill."
+    ),
+)
+
+observability_job = dg.define_asset_job(
+    name="boreas_observability",
+    selection=observability_selection,
+    description="Refresh the elementary metadata models and regenerate the report.",
+)
+
+maintenance_job = dg.define_asset_job(
+    name="boreas_maintenance",
+    selection=dg.AssetSelection.assets(duckdb_file),
+    description="Drop dlt staging schemas, checkpoint and (when worthwhile) compact boreas.duckdb.",
+)
+
+# Evaluates the assets' automation conditions: the bronze assets' cron
+# cadences (see dlt_assets.py) and the eager dbt models downstream. Only
+# stale assets run, instead of the whole graph once a day.
+automation_sensor = dg.AutomationConditionSensorDefinition(
+    name="boreas_automation",
+    target=dg.AssetSelection.all() - observability_selection - dg.AssetSelection.assets(duckdb_file),
+    minimum_interval_seconds=60,
+    default_status=dg.DefaultSensorStatus.STOPPED,
+)
+
+observability_schedule = dg.ScheduleDefinition(
+    name="boreas_observability_daily",
+    job=observability_job,
+    cron_schedule="0 7 * * *",  # after the nightly weather refresh has settled
+    execution_timezone="Europe/Oslo",
+    default_status=dg.DefaultScheduleStatus.STOPPED,
 )
 
-daily_schedule = dg.ScheduleDefinition(
-    name="boreas_daily",
-    job=boreas_job,
-    cron_schedule="0 5 * * *",  # 05:00 Europe/Oslo local (server-time cron)
+# Between the nightly weather refresh (03:00) and the first dashboard users;
+# boreas_publish includes the asset too, so CI publishes a compact file.
+maintenance_schedule = dg.ScheduleDefinition(
+    name="boreas_maintenance_daily",
+    job=maintenance_job,
+    cron_schedule="30 5 * * *",
     execution_timezone="Europe/Oslo",
     default_status=dg.DefaultScheduleStatus.STOPPED,
 )
 
 defs = dg.Definitions(
     assets=all_assets,
-    jobs=[boreas_job],
-    schedules=[daily_schedule],
+    jobs=[boreas_job, publish_job, observability_job, maintenance_job],
+    schedules=[observability_schedule, maintenance_schedule],
+    sensors=[automation_sensor],
     resources={
         "dbt": dbt_resource,
         "duckdb": duckdb_resource,
@@ -0,0 +1,535 @@
+"""Publish DuckDB files as a base snapshot plus daily Parquet increments.
+
+Re-uploading and re-downloading whole database files every day costs the
+size of the full history. Instead, each published dataset (``boreas``, the
+warehouse CI continues from, and ``boreas_serving``, the file the dashboard
+reads) consists of
+
+- a base snapshot ``<dataset>.<base_id>.duckdb``;
+- append-only increments ``<dataset>.<base_id>.<seq>.tar``. Each one holds,
+  per changed table, the rows added (``<schema>.<table>.ins.parquet``) and
+  removed (``<schema>.<table>.del.parquet``) since the previous increment;
+- ``<dataset>.manifest.json``, which lists the base and the increments with
+  their SHA-256 checksums and the row count of every changed table after
+  each increment.
+
+Increments are row-level multiset diffs (``EXCEPT ALL``) between the last
+published state and the new file, so they capture dlt merges, dbt rebuilds
+and deletes alike, without knowing how a table is written. Applying one
+deletes just the matching rows and appends the inserted ones. A table whose
+comment is an ``ORDER BY`` clause (as the serving tables' are) is sorted
+again afterwards, so its zone maps keep working. A new base is
+published instead when the catalog changed (tables, columns, types, views,
+macros), or when the increments since the base add up to more than
+``REBASE_RATIO`` of its size.
+
+Consumers keep a ``<file>.deltas.json`` sidecar with the part of the
+manifest they have applied, download only the increments they lack, verify
+checksums and row counts, and fall back to the base when anything does not
+match. Downloads go to ``.part`` files named after their checksum, resume
+with HTTP range requests after an interruption, and are renamed into place
+only once the checksum matches. A database without a sidecar was built
+locally and is left alone.
+
+Run from the repository root::
+
+    uv run python -m src.dagster_boreas.deltas pull boreas boreas.duckdb --url <release url>
+    uv run python -m src.dagster_boreas.deltas publish boreas <new file> \\
+        --previous <last pulled file> --out <upload dir>
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import duckdb
+
+FORMAT_VERSION = 1
+# Publish a new base once the increments since the last one add up to this
+# share of its size.
+REBASE_RATIO = 0.5
+MAX_INCREMENTS = 90
+# Table comments starting with this name the order a table is kept in.
+ORDER_PREFIX = "ORDER BY "
+DOWNLOAD_ATTEMPTS = 4
+_CHUNK = 1 << 20
+
+# Called with (what is being downloaded, bytes done, bytes total).
+Progress = Callable[[str, int, int], None]
+
+
+class DeltaError(RuntimeError):
+    """A download or increment did not match the manifest."""
+
+
+def manifest_name(dataset: str) -> str:
+    return f"{dataset}.manifest.json"
+
+
+def sidecar_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.name + ".deltas.json")
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_json(path: Path) -> dict | None:
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def _quoted(name: str) -> str:
+    schema, table = name.split(".", 1)
+    return f'"{schema}"."{table}"'
+
+
+def _tables(con, db: str) -> list[str]:
+    return [
+        f"{schema}.{table}"
+        for schema, table in con.execute(
+            "SELECT schema_name, table_name FROM duckdb_tables() WHERE database_name = ? "
+            "ORDER BY 1, 2",
+            (db,),
+        ).fetchall()
+    ]
+
+
+def _catalog_fingerprint(con, db: str) -> str:
+    """Hash of everything a row diff cannot carry: tables, columns and their
+    types, views and macros."""
+    parts = [
+        con.execute(
+            "SELECT schema_name, table_name, column_index, column_name, data_type "
+            "FROM duckdb_columns() WHERE database_name = ? ORDER BY 1, 2, 3",
+            (db,),
+        ).fetchall(),
+        con.execute(
+            "SELECT schema_name, view_name, sql FROM duckdb_views() "
+            "WHERE database_name = ? AND NOT internal ORDER BY 1, 2",
+            (db,),
+        ).fetchall(),
+        con.execute(
+            "SELECT schema_name, function_name, parameters::VARCHAR, macro_definition "
+            "FROM duckdb_functions() WHERE database_name = ? AND NOT internal ORDER BY 1, 2",
+            (db,),
+        ).fetchall(),
+    ]
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def _row_count(con, db: str, name: str) -> int:
+    return con.execute(f"SELECT COUNT(*) FROM {db}.{_quoted(name)}").fetchone()[0]
+
+
+def _order(con, db: str, name: str) -> str | None:
+    """The ``ORDER BY`` columns in the table's comment, if it has one."""
+    schema, table = name.split(".", 1)
+    comment = con.execute(
+        "SELECT comment FROM duckdb_tables() "
+        "WHERE database_name = ? AND schema_name = ? AND table_name = ?",
+        (db, schema, table),
+    ).fetchone()[0]
+    if comment and comment.startswith(ORDER_PREFIX):
+        return comment.removeprefix(ORDER_PREFIX)
+    return None
+
+
+def _columns(con, name: str) -> list[str]:
+    schema, table = name.split(".", 1)
+    return [
+        f'"{column}"'
+        for (column,) in con.execute(
+            "SELECT column_name FROM duckdb_columns() WHERE database_name = current_database() "
+            "AND schema_name = ? AND table_name = ? ORDER BY column_index",
+            (schema, table),
+        ).fetchall()
+    ]
+
+
+# --------------------------------------------------------------------------
+# Publishing
+# --------------------------------------------------------------------------
+
+
+def _diff(new_path: Path, previous_path: Path, workdir: Path) -> tuple[str, str, dict]:
+    """Write the per-table Parquet diffs of ``new_path`` against
+    ``previous_path`` into ``workdir``. Returns both catalog fingerprints and
+    ``{table: {"inserted", "deleted", "rows"}}`` for the changed tables, plus
+    ``"order"`` for tables kept sorted."""
+    con = duckdb.connect()
+    try:
+        con.execute(f"ATTACH '{new_path}' AS new (READ_ONLY)")
+        con.execute(f"ATTACH '{previous_path}' AS old (READ_ONLY)")
+        new_catalog = _catalog_fingerprint(con, "new")
+        old_catalog = _catalog_fingerprint(con, "old")
+        if new_catalog != old_catalog:
+            return new_catalog, old_catalog, {}
+        changes = {}
+        for name in _tables(con, "new"):
+            table = _quoted(name)
+            counts = {}
+            for kind, a, b in (("ins", "new", "old"), ("del", "old", "new")):
+                part = workdir / f"{name}.{kind}.parquet"
+                counts[kind] = con.execute(
+                    f"COPY (SELECT * FROM {a}.{table} EXCEPT ALL SELECT * FROM {b}.{table}) "
+                    f"TO '{part}' (FORMAT parquet, COMPRESSION zstd)"
+                ).fetchone()[0]
+                if counts[kind] == 0:
+                    part.unlink()
+            if counts["ins"] or counts["del"]:
+                changes[name] = {
+                    "inserted": counts["ins"],
+                    "deleted": counts["del"],
+                    "rows": _row_count(con, "new", name),
+                }
+                order = _order(con, "new", name)
+                if order is not None:
+                    changes[name]["order"] = order
+        return new_catalog, old_catalog, changes
+    finally:
+        con.close()
+
+
+def publish(dataset: str, db_path: Path, previous_path: Path | None, out_dir: Path) -> list[str]:
+    """Write the files to upload for ``db_path`` into ``out_dir``: a new
+    increment or base, and the updated manifest. Returns the names of
+    published files the new manifest no longer references."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = None
+    if previous_path is not None and previous_path.exists():
+        previous = _read_json(sidecar_path(previous_path))
+    now = datetime.now(timezone.utc)
+
+    if previous is not None:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            new_catalog, old_catalog, changes = _diff(db_path, previous_path, workdir)
+            if new_catalog == old_catalog and not changes:
+                print(f"{dataset}: no changes since increment {len(previous['increments'])}")
+                return []
+            published = sum(inc["bytes"] for inc in previous["increments"])
+            parts = sorted(workdir.iterdir())
+            pending = sum(p.stat().st_size for p in parts)
+            if (
+                new_catalog == old_catalog
+                and len(previous["increments"]) < MAX_INCREMENTS
+                and published + pending <= REBASE_RATIO * previous["base"]["bytes"]
+            ):
+                base_id = previous["base"]["id"]
+                seq = len(previous["increments"]) + 1
+                archive = out_dir / f"{dataset}.{base_id}.{seq:04d}.tar"
+                with tarfile.open(archive, "w") as tar:
+                    for part in parts:
+                        tar.add(part, arcname=part.name)
+                increment = {
+                    "seq": seq,
+                    "created_at": now.isoformat(timespec="seconds"),
+                    "file": archive.name,
+                    "bytes": archive.stat().st_size,
+                    "sha256": _sha256(archive),
+                    "parts": {part.name: _sha256(part) for part in parts},
+                    "tables": changes,
+                }
+                manifest = {**previous, "increments": [*previous["increments"], increment]}
+                _write_json(out_dir / manifest_name(dataset), manifest)
+                print(
+                    f"{dataset}: increment {seq}, {len(changes)} tables, "
+                    f"{increment['bytes'] / 1024:.0f} KiB"
+                )
+                return []
+            reason = "catalog changed" if new_catalog != old_catalog else "increments outgrew the base"
+            print(f"{dataset}: publishing a new base ({reason})")
+
+    base_id = now.strftime("%Y%m%dT%H%M%SZ")
+    base_file = out_dir / f"{dataset}.{base_id}.duckdb"
+    shutil.copyfile(db_path, base_file)
+    manifest = {
+        "format": FORMAT_VERSION,
+        "dataset": dataset,
+        "base": {
+            "id": base_id,
+            "created_at": now.isoformat(timespec="seconds"),
+            "file": base_file.name,
+            "bytes": base_file.stat().st_size,
+            "sha256": _sha256(base_file),
+        },
+        "increments": [],
+    }
+    _write_json(out_dir / manifest_name(dataset), manifest)
+    print(f"{dataset}: base {base_id}, {manifest['base']['bytes'] / 1024**2:.1f} MiB")
+    if previous is None:
+        return []
+    return [previous["base"]["file"], *(inc["file"] for inc in previous["increments"])]
+
+
+# --------------------------------------------------------------------------
+# Consuming
+# --------------------------------------------------------------------------
+
+
+def _download(
+    url: str,
+    dest: Path,
+    sha256: str,
+    size: int,
+    progress: Progress | None = None,
+    label: str = "",
+) -> None:
+    """Download ``url`` to ``dest`` through a ``.part`` file that is resumed
+    with an HTTP range request after an interruption, checked against
+    ``sha256`` and then renamed into place."""
+    # The checksum is part of the name, so a part of another version of the
+    # file is never resumed.
+    tmp = dest.with_name(f"{dest.name}.{sha256[:12]}.part")
+    for stale in dest.parent.glob(f"{dest.name}.*.part"):
+        if stale != tmp:
+            stale.unlink()
+    resumed = tmp.exists()
+    for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+        offset = tmp.stat().st_size if tmp.exists() else 0
+        request = urllib.request.Request(url)
+        if 0 < offset < size:
+            request.add_header("Range", f"bytes={offset}-")
+        try:
+            if offset < size:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    # A server that ignores the range sends the whole file.
+                    mode = "ab" if response.status == 206 else "wb"
+                    done = offset if mode == "ab" else 0
+                    with tmp.open(mode) as f:
+                        while chunk := response.read(_CHUNK):
+                            f.write(chunk)
+                            done += len(chunk)
+                            if progress is not None:
+                                progress(label, done, size)
+            break
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as exc:
+            if attempt == DOWNLOAD_ATTEMPTS:
+                raise
+            print(f"Download of {url} interrupted ({exc}); resuming")
+            time.sleep(2**attempt)
+    if _sha256(tmp) != sha256:
+        tmp.unlink()
+        if resumed:
+            # The part on disk was bad; fetch the whole file once more.
+            return _download(url, dest, sha256, size, progress, label)
+        raise DeltaError(f"Checksum mismatch for {url}")
+    os.replace(tmp, dest)
+
+
+def _fetch_manifest(url: str, dataset: str) -> dict | None:
+    try:
+        with urllib.request.urlopen(f"{url}/{manifest_name(dataset)}") as response:
+            return json.load(response)
+    except urllib.error.HTTPError as exc:
+        if exc.code == 404:
+            return None
+        raise
+
+
+def _delete_rows(con, name: str, deleted: Path) -> None:
+    """Delete the rows in ``deleted`` from the table, each as often as it
+    occurs there: the n-th copy of a row in the file matches the n-th copy
+    in the table. Only the matching rows are touched."""
+    table = _quoted(name)
+    columns = _columns(con, name)
+    matches = " AND ".join(f"t.{c} IS NOT DISTINCT FROM d.{c}" for c in columns)
+    t_columns = ", ".join(f"t.{c}" for c in columns)
+    con.execute(
+        f"""
+        DELETE FROM {table} WHERE rowid IN (
+            SELECT t.row_id
+            FROM (
+                SELECT t.rowid AS row_id, {t_columns},
+                       row_number() OVER (PARTITION BY {t_columns}) AS copy
+                FROM {table} AS t
+                SEMI JOIN read_parquet('{deleted}') AS d ON {matches}
+            ) AS t
+            JOIN (
+                SELECT *, row_number() OVER (PARTITION BY {", ".join(columns)}) AS copy
+                FROM read_parquet('{deleted}')
+            ) AS d ON {matches} AND t.copy = d.copy
+        )
+        """
+    )
+
+
+def _sort(con, name: str, order: str) -> None:
+    table = _quoted(name)
+    con.execute(f"CREATE TEMP TABLE sorted AS SELECT * FROM {table} ORDER BY {order}")
+    con.execute(f"DELETE FROM {table}")
+    con.execute(f"INSERT INTO {table} SELECT * FROM sorted")
+    con.execute("DROP TABLE sorted")
+
+
+def _apply(db_path: Path, archive: Path, increment: dict) -> None:
+    """Apply one increment to ``db_path`` in a single transaction."""
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        with tarfile.open(archive) as tar:
+            tar.extractall(workdir, filter="data")
+        for name, sha256 in increment["parts"].items():
+            if _sha256(workdir / name) != sha256:
+                raise DeltaError(f"Checksum mismatch for {name} in {archive.name}")
+
+        con = duckdb.connect(str(db_path))
+        try:
+            con.execute("BEGIN TRANSACTION")
+            try:
+                for name, change in increment["tables"].items():
+                    table = _quoted(name)
+                    if change["deleted"]:
+                        _delete_rows(con, name, workdir / f"{name}.del.parquet")
+                    if change["inserted"]:
+                        ins = workdir / f"{name}.ins.parquet"
+                        con.execute(f"INSERT INTO {table} SELECT * FROM read_parquet('{ins}')")
+                    if change.get("order"):
+                        _sort(con, name, change["order"])
+                    rows = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    if rows != change["rows"]:
+                        raise DeltaError(
+                            f"{name} has {rows} rows after increment {increment['seq']}, "
+                            f"expected {change['rows']}"
+                        )
+            except Exception:
+                con.execute("ROLLBACK")
+                raise
+            # Outside the handler: a failed COMMIT has already ended the
+            # transaction, and its error is the one to report.
+            con.execute("COMMIT")
+            con.execute("CHECKPOINT")
+        finally:
+            con.close()
+
+
+def up_to_date(dataset: str, db_path: Path, url: str) -> bool:
+    """Whether ``pull`` would leave ``db_path`` as it is: nothing is
+    published, the file was built locally, or it already holds the published
+    base and every increment."""
+    if db_path.exists() and not sidecar_path(db_path).exists():
+        return True
+    manifest = _fetch_manifest(url, dataset)
+    if manifest is None:
+        return True
+    local = _read_json(sidecar_path(db_path)) if db_path.exists() else None
+    return (
+        local is not None
+        and local["base"]["sha256"] == manifest["base"]["sha256"]
+        and [inc["sha256"] for inc in local["increments"]]
+        == [inc["sha256"] for inc in manifest["increments"]]
+    )
+
+
+def pull(dataset: str, db_path: Path, url: str, progress: Progress | None = None) -> str:
+    """Bring ``db_path`` up to date with the published ``dataset``. Returns
+    a short description of what was done. ``progress`` is called as the
+    downloads advance."""
+    manifest = _fetch_manifest(url, dataset)
+    if manifest is None:
+        return f"{dataset}: nothing published yet"
+    local = _read_json(sidecar_path(db_path)) if db_path.exists() else None
+    if db_path.exists() and local is None:
+        return f"{dataset}: {db_path.name} was built locally; not replacing it"
+
+    applied = local["increments"] if local is not None else []
+    same_base = local is not None and local["base"]["sha256"] == manifest["base"]["sha256"]
+    consistent = [inc["sha256"] for inc in applied] == [
+        inc["sha256"] for inc in manifest["increments"][: len(applied)]
+    ]
+    if same_base and consistent:
+        try:
+            return _pull_increments(dataset, db_path, url, manifest, len(applied), progress)
+        except DeltaError as exc:
+            print(f"{dataset}: {exc}; downloading the base")
+    base = manifest["base"]
+    # Remove the old copy first: a file left without its sidecar would be
+    # taken for a local build, and a sidecar without its file is ignored.
+    for path in (db_path, sidecar_path(db_path), db_path.with_name(db_path.name + ".wal")):
+        path.unlink(missing_ok=True)
+    # Named after the dataset, not the file, so an interrupted download
+    # resumes even when the next attempt pulls into a different snapshot.
+    tmp_path = db_path.with_name(f"{dataset}.base")
+    _download(f"{url}/{base['file']}", tmp_path, base["sha256"], base["bytes"], progress, "base")
+    _write_json(sidecar_path(db_path), {**manifest, "increments": []})
+    os.replace(tmp_path, db_path)
+    return _pull_increments(dataset, db_path, url, manifest, 0, progress)
+
+
+def _pull_increments(
+    dataset: str,
+    db_path: Path,
+    url: str,
+    manifest: dict,
+    start: int,
+    progress: Progress | None,
+) -> str:
+    missing = manifest["increments"][start:]
+    downloaded = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for increment in missing:
+            archive = Path(tmp) / increment["file"]
+            _download(
+                f"{url}/{increment['file']}",
+                archive,
+                increment["sha256"],
+                increment["bytes"],
+                progress,
+                f"increment {increment['seq']} of {len(manifest['increments'])}",
+            )
+            downloaded += increment["bytes"]
+            _apply(db_path, archive, increment)
+            applied = manifest["increments"][: increment["seq"]]
+            _write_json(sidecar_path(db_path), {**manifest, "increments": applied})
+    return (
+        f"{dataset}: base {manifest['base']['id']}, applied {len(missing)} increment(s), "
+        f"{downloaded / 1024:.0f} KiB"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    pull_cmd = commands.add_parser("pull", help="apply the published increments to a file")
+    pull_cmd.add_argument("dataset")
+    pull_cmd.add_argument("db", type=Path)
+    pull_cmd.add_argument("--url", required=True, help="base URL of the published files")
+    publish_cmd = commands.add_parser("publish", help="write the files to upload")
+    publish_cmd.add_argument("dataset")
+    publish_cmd.add_argument("db", type=Path)
+    publish_cmd.add_argument("--previous", type=Path, help="the last pulled file, with its sidecar")
+    publish_cmd.add_argument("--out", type=Path, required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "pull":
+        print(pull(args.dataset, args.db, args.url.rstrip("/")))
+        return 0
+    obsolete = publish(args.dataset, args.db, args.previous, args.out)
+    (args.out / f"{args.dataset}.obsolete").write_text("".join(f"{name}\n" for name in obsolete))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
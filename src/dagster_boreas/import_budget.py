@@ -0,0 +1,88 @@
+"""Benchmark how long loading the Dagster code location takes.
+
+Every webserver reload and every ``dg launch`` imports
+``src.dagster_boreas.definitions`` before a single asset runs, so heavy
+dependencies (dlt, pandas, pyarrow, matplotlib) must only be imported inside
+asset bodies. This script imports the definitions in fresh interpreters and
+fails when
+
+- the code location's own import time exceeds the budget, or
+- any of the heavy modules was imported.
+
+The own import time is the median time to import the definitions minus the
+median time to import the frameworks they cannot do without (dagster,
+dagster-dbt, dagster-duckdb), which keeps the budget meaningful on slow and
+fast machines alike. The first import is not timed: it may prepare the dbt
+manifest and writes bytecode caches.
+
+Run from the repository root::
+
+    uv run python -m src.dagster_boreas.import_budget --budget 1.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+DEFINITIONS_MODULE = "src.dagster_boreas.definitions"
+FRAMEWORK_MODULES = ("dagster", "dagster_dbt", "dagster_duckdb")
+DEFAULT_BUDGET_SECONDS = 1.5
+HEAVY_MODULES = ("dlt", "pandas", "pyarrow", "matplotlib", "streamlit")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def _probe(*modules: str) -> dict:
+    code = _PROBE.format(
+        imports="\n".join(f"import {m}" for m in modules), heavy=HEAVY_MODULES
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="maximum own import time in seconds")
+    parser.add_argument("--runs", type=int, default=3, help="timed imports")
+    args = parser.parse_args(argv)
+
+    _probe(DEFINITIONS_MODULE)  # warm-up
+    results = [_probe(DEFINITIONS_MODULE) for _ in range(args.runs)]
+    baseline = statistics.median(
+        _probe(*FRAMEWORK_MODULES)["seconds"] for _ in range(args.runs)
+    )
+    total = statistics.median(r["seconds"] for r in results)
+    own = total - baseline
+    heavy = sorted({m for r in results for m in r["heavy"]})
+
+    print(
+        f"{DEFINITIONS_MODULE}: {total:.2f}s median over {args.runs} runs, "
+        f"{baseline:.2f}s of it {', '.join(FRAMEWORK_MODULES)}; "
+        f"own {own:.2f}s, budget {args.budget:.2f}s"
+    )
+    failed = False
+    if heavy:
+        print(f"FAIL: imported at load time: {', '.join(heavy)}")
+        failed = True
+    if own > args.budget:
+        print("FAIL: import time over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Versioned DuckDB snapshots behind an atomically updated pointer.
+
+Writers never touch a file that readers have open. Every refresh writes a
+new snapshot under its ``partial_path`` (``<stem>.<version>.duckdb.tmp``),
+renames it to ``<stem>.<version>.duckdb`` once complete and then points
+``CURRENT`` at it with a single ``os.replace``. Readers resolve the pointer
+and open the snapshot it names: sessions that are still reading the previous
+snapshot keep their connection, and new ones pick up the new file without a
+restart. Old snapshots are removed once ``KEEP`` newer ones exist. Deleting a
+file a reader still has open is safe on POSIX file systems. Snapshots still
+being written are never collected, even when another process published a
+newer one in the meantime; only partial files abandoned for longer than
+``PARTIAL_MAX_AGE`` are.
+
+Used by the ``serving/boreas_serving`` asset (pipeline side) and by the
+Streamlit app (reader side, and for snapshots it downloads itself).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+POINTER = "CURRENT"
+# Snapshots kept besides the current one, for readers still on them.
+KEEP = 2
+PARTIAL_SUFFIX = ".tmp"
+# Partial snapshots older than this were left behind by a crashed writer.
+PARTIAL_MAX_AGE = 24 * 3600
+
+
+def current(directory: Path) -> Path | None:
+    """The snapshot ``CURRENT`` points at, or ``None`` before the first one."""
+    try:
+        name = (directory / POINTER).read_text().strip()
+    except FileNotFoundError:
+        return None
+    path = directory / name
+    return path if name and path.exists() else None
+
+
+def new_path(directory: Path, stem: str) -> Path:
+    """A fresh, never-used snapshot path. Versions sort by creation time."""
+    directory.mkdir(parents=True, exist_ok=True)
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    return directory / f"{stem}.{version}.duckdb"
+
+
+def partial_path(path: Path) -> Path:
+    """Where the snapshot ``path`` is written until it is complete."""
+    return path.with_name(path.name + PARTIAL_SUFFIX)
+
+
+def publish(path: Path) -> None:
+    """Point ``CURRENT`` in ``path``'s directory at ``path``."""
+    pointer = path.parent / POINTER
+    tmp = pointer.with_name(f"{POINTER}.{os.getpid()}.tmp")
+    tmp.write_text(path.name + "\n")
+    os.replace(tmp, pointer)
+
+
+def collect_garbage(directory: Path, stem: str, keep: int = KEEP) -> list[Path]:
+    """Delete all but the ``keep`` newest snapshots older than the current
+    one, together with their sidecar files, and abandoned partial snapshots.
+    Returns the deleted snapshots."""
+    cutoff = time.time() - PARTIAL_MAX_AGE
+    for partial in directory.glob(f"{stem}.*.duckdb{PARTIAL_SUFFIX}*"):
+        try:
+            if partial.stat().st_mtime < cutoff:
+                partial.unlink()
+        except FileNotFoundError:
+            pass
+    active = current(directory)
+    if active is None:
+        return []
+    older = sorted(
+        p for p in directory.glob(f"{stem}.*.duckdb") if p.name < active.name
+    )
+    removed = older[: max(len(older) - keep, 0)]
+    for path in removed:
+        for sibling in directory.glob(f"{path.name}*"):
+            sibling.unlink(missing_ok=True)
+    return removed
@@ -3,26 +3,68 @@
 from __future__ import annotations
 
 import datetime as dt
+import functools
+import hashlib
 import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
 import time
-import urllib.request
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
 
+import altair as alt
 import duckdb
 import pandas as pd
-import pydeck as pdk
+import pyarrow as pa
 import streamlit as st
 
-DB_PATH = Path(__file__).resolve().parent.parent / "boreas.duckdb"
-GEOJSON_PATH = Path(__file__).resolve().parent / "assets" / "varsom_regions.geojson"
-
-# On Streamlit Community Cloud the repo does not contain boreas.duckdb — it
-# lives on the `latest-data` GitHub release. Download it once per container.
-DB_RELEASE_URL = (
-    "https://github.com/VegSja/Boreas/releases/download/latest-data/boreas.duckdb"
+from animated_map import animated_map
+from region_geometry import load_regions
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# Both need the repo root on sys.path.
+from src.dagster_boreas import deltas, snapshots  # noqa: E402
+
+log = logging.getLogger(__name__)
+
+# The serving database holds only the gold tables and the search index the
+# dashboard reads (written by the `serving/boreas_serving` Dagster asset);
+# the full warehouse stays in boreas.duckdb. SERVING_DIR holds versioned
+# snapshots of it and a CURRENT pointer: a new snapshot never replaces a file
+# that is open, so the app picks up new data without a restart and without
+# seeing a half-written file (see snapshots.py).
+SERVING_DIR = ROOT / "serving"
+SERVING_STEM = "boreas_serving"
+
+# On Streamlit Community Cloud the repo does not contain the database — it
+# is published to the `latest-data` GitHub release as a base file plus daily
+# increments. A copy that came from there is brought up to date in the
+# background every REFRESH_SECONDS (see _DatabaseLoader); a locally built
+# snapshot is used as is.
+DATA_RELEASE_URL = "https://github.com/VegSja/Boreas/releases/download/latest-data"
+REFRESH_SECONDS = 15 * 60
+# Memory the in-process query-result cache may use, across all sessions.
+QUERY_CACHE_MB = 256
+# DuckDB settings for the dashboard's read-only connections (unset: DuckDB's
+# defaults, all cores and 80% of RAM). Both apply to a whole snapshot's
+# database instance, so they bound all concurrent queries together.
+DUCKDB_THREADS = int(os.environ.get("BOREAS_DUCKDB_THREADS", "0"))
+DUCKDB_MEMORY_LIMIT = os.environ.get("BOREAS_DUCKDB_MEMORY_LIMIT", "")
+# Query results shared by all app processes on this machine (or volume),
+# one subdirectory per data version (see _data_version).
+RESULT_DIR = Path(
+    os.environ.get("BOREAS_RESULT_DIR", Path(tempfile.gettempdir()) / "boreas-query-results")
 )
-if not DB_PATH.exists():
-    urllib.request.urlretrieve(DB_RELEASE_URL, DB_PATH)
+# Result directories nothing was written to for this long are removed. The
+# one in use keeps getting new results while sessions query it, and a
+# result removed anyway is recomputed on its next read.
+RESULT_MAX_AGE_SECONDS = 2 * 24 * 3600
 
 DANGER_COLORS: dict[int, list[int]] = {
     1: [26, 152, 80],
@@ -33,69 +75,366 @@ DANGER_COLORS: dict[int, list[int]] = {
 }
 
 
+class _DatabaseLoader:
+    """Keeps the serving snapshot up to date on a background thread, so pages
+    can show progress instead of blocking on the first download. Updates are
+    applied to a copy of the current snapshot, which is published once
+    complete; readers keep using the old one until then. Downloads resume
+    after interruptions and are checksummed before use (see ``deltas.pull``)."""
+
+    def __init__(self) -> None:
+        self.label = "Checking for new data"
+        self.done = 0
+        self.total = 0
+        self.error: Exception | None = None
+        self._first_attempt = threading.Event()
+        threading.Thread(target=self._run, name="boreas-db-loader", daemon=True).start()
+
+    def _progress(self, label: str, done: int, total: int) -> None:
+        self.label, self.done, self.total = f"Downloading {label}", done, total
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self._refresh()
+                self.error = None
+            except Exception as exc:  # noqa: BLE001 - a stale copy beats no dashboard
+                self.error = exc
+                log.warning("Could not update %s: %s", SERVING_STEM, exc)
+            finally:
+                self._first_attempt.set()
+            time.sleep(REFRESH_SECONDS)
+
+    def _refresh(self) -> None:
+        current = snapshots.current(SERVING_DIR)
+        if current is not None and deltas.up_to_date(SERVING_STEM, current, DATA_RELEASE_URL):
+            return
+        candidate = snapshots.new_path(SERVING_DIR, SERVING_STEM)
+        # Written under a partial name, which collect_garbage in another app
+        # process leaves alone, and renamed only once complete.
+        partial = snapshots.partial_path(candidate)
+        try:
+            if current is not None:
+                shutil.copyfile(current, partial)
+                shutil.copyfile(deltas.sidecar_path(current), deltas.sidecar_path(partial))
+            summary = deltas.pull(SERVING_STEM, partial, DATA_RELEASE_URL, self._progress)
+            log.info(summary)
+            if not partial.exists():
+                # Nothing is published yet, so there was nothing to pull.
+                self.label = summary
+                return
+            os.replace(deltas.sidecar_path(partial), deltas.sidecar_path(candidate))
+            os.replace(partial, candidate)
+        except BaseException:
+            for path in (partial, deltas.sidecar_path(partial)):
+                path.unlink(missing_ok=True)
+            raise
+        snapshots.publish(candidate)
+        snapshots.collect_garbage(SERVING_DIR, SERVING_STEM)
+
+    def wait(self, timeout: float) -> bool:
+        return self._first_attempt.wait(timeout)
+
+
 @st.cache_resource
+def _database_loader() -> _DatabaseLoader:
+    return _DatabaseLoader()
+
+
+# Start the download as soon as the app is imported, before the first page
+# has rendered anything.
+_database_loader()
+
+
+def wait_for_database() -> None:
+    """Show download progress until a snapshot is available, and pin the
+    snapshot this script run reads. Call after ``st.set_page_config`` and
+    before the first query."""
+    loader = _database_loader()
+    if snapshots.current(SERVING_DIR) is None and not loader.wait(0):
+        placeholder = st.empty()
+        while not loader.wait(0.25):
+            fraction = loader.done / loader.total if loader.total else 0.0
+            placeholder.progress(
+                min(fraction, 1.0),
+                text=f"{loader.label} … {loader.done / 1024**2:.1f} of "
+                f"{loader.total / 1024**2:.1f} MiB",
+            )
+        placeholder.empty()
+    current = snapshots.current(SERVING_DIR)
+    if current is None:
+        # Let the next page load try again.
+        _database_loader.clear()
+        if loader.error is not None:
+            st.error(f"Could not download the dashboard data: {loader.error}")
+        else:
+            st.warning("No dashboard data has been published yet. Try again later.")
+        st.stop()
+    st.session_state["db_version"] = current.name
+
+
+def database_version() -> str:
+    """The snapshot the current script run reads. Pinned per run, so all
+    queries of one page render see the same data even if a new snapshot is
+    published halfway through."""
+    if "db_version" not in st.session_state:
+        wait_for_database()
+    return st.session_state["db_version"]
+
+
+class _ReadPool:
+    """Read-only access to one snapshot for all session threads. A DuckDB
+    connection must not be used by several threads at once, so each thread
+    gets its own cursor of one parent connection. Cursors share the database
+    instance (buffer pool, catalog, loaded extensions) but run their queries
+    independently, so concurrent sessions do not wait for each other."""
+
+    def __init__(self, path: Path) -> None:
+        config = {
+            key: value
+            for key, value in (("threads", DUCKDB_THREADS), ("memory_limit", DUCKDB_MEMORY_LIMIT))
+            if value
+        }
+        self._parent = duckdb.connect(str(path), read_only=True, config=config)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.cursors = 0
+        self.queries = 0
+        self.active = 0
+        self.peak_active = 0
+        self.query_seconds = 0.0
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """This thread's cursor. Streamlit runs each script run on a fresh
+        thread; the cursor is closed when its thread ends."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self._parent.cursor()
+            with self._lock:
+                self.cursors += 1
+        return cursor
+
+    def fetch_arrow(self, sql: str, params) -> pa.Table:
+        with self._lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        started = time.perf_counter()
+        try:
+            return self.cursor().execute(sql, params or ()).fetch_arrow_table()
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.queries += 1
+                self.query_seconds += time.perf_counter() - started
+
+
+# Two entries: the current snapshot and the one sessions may still be
+# rendering from when a new one is published.
+@st.cache_resource(max_entries=2)
+def _read_pool(version: str) -> _ReadPool:
+    return _ReadPool(SERVING_DIR / version)
+
+
 def get_conn() -> duckdb.DuckDBPyConnection:
-    return duckdb.connect(str(DB_PATH), read_only=True)
+    """A read-only cursor on the pinned snapshot, for this thread only."""
+    return _read_pool(database_version()).cursor()
+
+
+class _QueryCache:
+    """Query results shared by all sessions, keyed on the snapshot they were
+    read from. A snapshot never changes, so entries never go stale and
+    there is no TTL: the cache only loses entries to stay within its memory
+    budget, least recently used first. Entries of a superseded snapshot are
+    no longer hit and age out the same way.
+
+    Results are kept as Arrow tables. Those read from the shared result
+    directory (see ``_load_result``) are memory-mapped, so their pages are
+    shared with every other process that maps the same file."""
+
+    def __init__(self, budget_bytes: int) -> None:
+        self.budget_bytes = budget_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[pa.Table, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str], load: Callable[[], pa.Table]) -> pa.Table:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        table = load()
+        size = table.nbytes
+        with self._lock:
+            if key not in self._entries and size <= self.budget_bytes:
+                self._entries[key] = (table, size)
+                self.bytes += size
+                while self.bytes > self.budget_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.bytes -= evicted
+        return table
+
+
+@st.cache_resource
+def _query_cache() -> _QueryCache:
+    return _QueryCache(QUERY_CACHE_MB * 1024**2)
+
+
+@functools.lru_cache(maxsize=8)
+def _data_version(version: str) -> str:
+    """What snapshot ``version`` holds, independent of its local file name:
+    the published base's checksum and the number of increments applied, from
+    its deltas sidecar. Replicas that pulled the same data share results. A
+    snapshot built locally has no sidecar and is its own data version."""
+    try:
+        applied = json.loads(deltas.sidecar_path(SERVING_DIR / version).read_text())
+    except FileNotFoundError:
+        return version
+    return f"{applied['base']['sha256'][:16]}.{len(applied['increments']):04d}"
+
+
+def _read_result(path: Path) -> pa.Table:
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def _load_result(version: str, digest: str, sql: str, params) -> pa.Table:
+    """The result of ``sql`` on snapshot ``version``, from the result
+    directory shared by all app processes if another process (or an earlier
+    run of this one) already computed it on the same data. Results are
+    written there as Arrow IPC files and read back memory-mapped, so replicas
+    share one copy in the page cache and run each query once per data
+    version. Without a writable directory results are only cached in
+    memory."""
+    directory = RESULT_DIR / _data_version(version)
+    path = directory / f"{digest}.arrow"
+    try:
+        return _read_result(path)
+    except FileNotFoundError:
+        pass
+    table = _read_pool(version).fetch_arrow(sql, params)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+        _prune_results(directory)
+        return _read_result(path)
+    except OSError as exc:
+        tmp.unlink(missing_ok=True)
+        log.warning("Could not write %s: %s", path, exc)
+        return table
+
+
+def _prune_results(keep: Path) -> None:
+    """Remove result directories, other than ``keep``, that nothing was
+    written to for ``RESULT_MAX_AGE_SECONDS``."""
+    cutoff = time.time() - RESULT_MAX_AGE_SECONDS
+    for directory in RESULT_DIR.iterdir():
+        try:
+            stale = directory != keep and directory.stat().st_mtime < cutoff
+        except FileNotFoundError:
+            continue  # removed by another process
+        if stale:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def query_arrow(sql: str, params: tuple | list | None = None) -> pa.Table:
+    """Run ``sql`` against the pinned snapshot, through the shared caches,
+    and return the cached Arrow table itself: no pandas conversion and no
+    copy (Arrow tables are immutable). Charts should take this, projected
+    to the columns they encode with ``.select()``; Streamlit sends Arrow
+    tables to the browser as they are."""
+    version = database_version()
+    # repr() makes list parameters (e.g. an IN list) part of the key.
+    digest = hashlib.sha256(f"{sql}\0{params!r}".encode()).hexdigest()[:32]
+    return _query_cache().get(
+        (version, digest), lambda: _load_result(version, digest, sql, params)
+    )
+
 
+def query(sql: str, params: tuple | list | None = None) -> pd.DataFrame:
+    """``query_arrow`` as a new DataFrame, which callers may modify."""
+    return query_arrow(sql, params).to_pandas()
 
-@st.cache_data(ttl=600)
-def query(sql: str, params: tuple | None = None) -> pd.DataFrame:
-    return get_conn().execute(sql, params or ()).df()
+
+def usage_stats() -> dict[str, str]:
+    """Counters of this app process's database pool and query cache, since
+    it started (pool counters: since the snapshot was published)."""
+    version = database_version()
+    pool, cache = _read_pool(version), _query_cache()
+    lookups = cache.hits + cache.misses
+    mean_ms = pool.query_seconds / pool.queries * 1000 if pool.queries else None
+    return {
+        "Snapshot": version,
+        "Queries run": f"{pool.queries}",
+        "Mean query time": f"{mean_ms:.0f} ms" if mean_ms is not None else "—",
+        "Concurrent queries (now / peak)": f"{pool.active} / {pool.peak_active}",
+        "Cursors opened": f"{pool.cursors}",
+        "Cache hit rate": f"{cache.hits / lookups:.0%} of {lookups}" if lookups else "—",
+        "Cache memory": f"{cache.bytes / 1024**2:.1f} of {cache.budget_bytes / 1024**2:.0f} MiB",
+    }
 
 
 AVA = '"3_gold"."avalanche_per_region"'
 WX = '"3_gold"."weather_per_region"'
-
-# Weather cells are on a finer grid than avalanche regions. Map each weather
-# cell to the avalanche region whose bbox contains its center, then average
-# per (region, date). Reused by the Region monitor page.
-REGION_WEATHER_CTE = f"""
-with _w as (
-  select date::date as date,
-    (east_south_lat + west_north_lat) / 2.0 as wlat,
-    (east_south_lon + west_north_lon) / 2.0 as wlon,
-    max_temp, average_temperature, min_temp,
-    max_snowfall, average_snowfall,
-    max_rain, average_rain,
-    max_snow_depth, average_snow_depth,
-    max_windspeed, average_windspeed,
-    average_relative_humidity
-  from {WX}
-),
-_r as (
-  select distinct region_id, region_name,
-    least(east_south_lat, west_north_lat) as lat_min,
-    greatest(east_south_lat, west_north_lat) as lat_max,
-    least(east_south_lon, west_north_lon) as lon_min,
-    greatest(east_south_lon, west_north_lon) as lon_max
-  from {AVA}
-),
-region_weather as (
-  select
-    _r.region_id, _r.region_name, _w.date,
-    avg(_w.max_temp)                  as max_temp,
-    avg(_w.average_temperature)       as avg_temp,
-    avg(_w.min_temp)                  as min_temp,
-    avg(_w.max_snowfall)              as max_snowfall,
-    avg(_w.average_snowfall)          as avg_snowfall,
-    avg(_w.max_rain)                  as max_rain,
-    avg(_w.average_rain)              as avg_rain,
-    avg(_w.max_snow_depth)            as max_snow_depth,
-    avg(_w.average_snow_depth)        as avg_snow_depth,
-    avg(_w.max_windspeed)             as max_windspeed,
-    avg(_w.average_windspeed)         as avg_windspeed,
-    avg(_w.average_relative_humidity) as avg_humidity
-  from _w join _r
-    on _w.wlat between _r.lat_min and _r.lat_max
-   and _w.wlon between _r.lon_min and _r.lon_max
-  group by 1, 2, 3
+REGION_FEATURES = '"3_gold"."weather_features_per_region"'
+DANGER_CORR = '"3_gold"."danger_weather_correlation"'
+DANGER_LEVEL_STATS = '"3_gold"."weather_by_danger_level"'
+DANGER_RUNS = '"3_gold"."danger_runs"'
+
+# Warning texts and their BM25 index (schema created by DuckDB's FTS
+# extension, named after the indexed table).
+WARNING_TEXTS = '"search"."warning_texts"'
+WARNING_FTS = "fts_search_warning_texts"
+
+# Region monitor series come from the gold rollup tiers, coarsest first:
+# (tier name, days per point, relation). All tiers share the region_daily
+# column names, with ``date`` holding the bucket start for week/month.
+REGION_DAILY = '"3_gold"."region_daily"'
+ROLLUP_TIERS: tuple[tuple[str, int, str], ...] = (
+    ("month", 30, '"3_gold"."region_monthly"'),
+    ("week", 7, '"3_gold"."region_weekly"'),
+    ("day", 1, REGION_DAILY),
 )
-"""
+
+# Full-width charts on a wide layout are roughly this many pixels across;
+# fewer than one point per PX_PER_POINT pixels starts to look blocky.
+CHART_WIDTH_PX = 900
+PX_PER_POINT = 24
+
+
+def pick_tier(
+    start: dt.date, end: dt.date, chart_width_px: int = CHART_WIDTH_PX
+) -> tuple[str, str]:
+    """Return ``(tier, relation)`` for the coarsest rollup that still gives
+    enough points to fill a chart ``chart_width_px`` wide over ``start..end``."""
+    span_days = (end - start).days + 1
+    min_points = max(chart_width_px // PX_PER_POINT, 1)
+    for tier, days_per_point, relation in ROLLUP_TIERS:
+        if span_days // days_per_point >= min_points:
+            return tier, relation
+    return "day", REGION_DAILY
+
+
+def bucket_days(start: dt.date, end: dt.date, chart_width_px: int = CHART_WIDTH_PX) -> int:
+    """Days per point so a series over ``start..end`` has at most one point
+    per pixel of a chart ``chart_width_px`` wide. For series without a
+    rollup tier; aggregate with ``time_bucket(to_days(n), date)``."""
+    span_days = (end - start).days + 1
+    return max(-(-span_days // chart_width_px), 1)
 
 
 @st.cache_resource
-def load_region_geojson() -> dict:
-    return json.loads(GEOJSON_PATH.read_text())
+def load_region_geojson(level: str = "detailed") -> dict:
+    """Region polygons simplified for ``level`` (see ``region_geometry.LEVELS``):
+    ``coarse`` for maps of all of Norway, ``detailed`` for a single region."""
+    return load_regions(level)
 
 
 def _bbox_polygon(row: pd.Series) -> list[list[float]]:
@@ -112,6 +451,7 @@ def _bbox_polygon(row: pd.Series) -> list[list[float]]:
 def main() -> None:
     st.set_page_config(page_title="Boreas — Avalanche & Weather", layout="wide")
     st.title("Boreas — Avalanche & Weather")
+    wait_for_database()
 
     with st.expander("About"):
         st.markdown(
@@ -151,117 +491,58 @@ def main() -> None:
         tuple(recent_dates),
     )
 
-    geo = load_region_geojson()
-    geo_by_id = {int(f["properties"]["omradeID"]): f for f in geo["features"]}
-
-    # Precompute one FeatureCollection per date so fragment ticks only pick from
-    # a dict — no per-frame geojson walk / feature construction.
-    features_by_date: dict[dt.date, dict] = {}
-    for day, sub in warnings.groupby("date"):
-        feats = []
-        for r in sub.itertuples():
-            base = geo_by_id.get(int(r.region_id))
-            if base is None:
-                continue
-            lvl = int(r.danger_level)
-            feats.append(
-                {
-                    "type": "Feature",
-                    "geometry": base["geometry"],
-                    "properties": {
-                        "region_name": base["properties"].get("omradeNavn"),
-                        "region_id": int(r.region_id),
-                        "danger_level": lvl,
-                        "main_text": r.main_text or "",
-                        "fill_color": [*DANGER_COLORS.get(lvl, [128, 128, 128]), 160],
-                    },
-                }
-            )
-        day_key = day.date() if hasattr(day, "date") else day
-        features_by_date[day_key] = {"type": "FeatureCollection", "features": feats}
-
-    anim_days = sorted(features_by_date)
+    anim_days = sorted(
+        {d.date() if hasattr(d, "date") else d for d in warnings["date"].tolist()}
+    )
     if not anim_days:
         st.info("No warnings in the recent window.")
         return
 
     st.subheader("31-day danger map — drag or play to animate")
 
-    @st.fragment
-    def _animated_danger_map() -> None:
-        anim_key = f"{anim_end}|{len(anim_days)}"
-        if st.session_state.get("_home_key") != anim_key:
-            st.session_state["_home_key"] = anim_key
-            st.session_state["_home_idx"] = len(anim_days) - 1
-            st.session_state["_home_play"] = False
-
-        playing = st.session_state["_home_play"]
-        c1, c2, c3 = st.columns([1, 1, 3])
-        if c1.button("⏸ Pause" if playing else "▶ Play", key="home_play_btn"):
-            st.session_state["_home_play"] = not playing
-            st.rerun(scope="fragment")
-        speed = c2.selectbox(
-            "Speed", ["0.3s", "0.6s", "1.0s"], index=1, label_visibility="collapsed", key="home_speed"
-        )
-        slider_val = c3.slider(
-            f"Day  ·  {anim_start} → {anim_end}",
-            min_value=0,
-            max_value=len(anim_days) - 1,
-            value=st.session_state["_home_idx"],
-            format="",
-            key="home_slider",
-        )
-        # Slider owns idx only when paused; loop owns it during playback.
-        if not playing:
-            st.session_state["_home_idx"] = slider_val
-
-        metric_slot = st.empty()
-        map_slot = st.empty()
-
-        def _render(idx: int) -> None:
-            day = anim_days[idx]
-            fc = features_by_date[day]
-            counts: dict[int, int] = {}
-            for f in fc["features"]:
-                lvl = f["properties"]["danger_level"]
-                counts[lvl] = counts.get(lvl, 0) + 1
-
-            with metric_slot.container():
-                mcols = st.columns(6)
-                mcols[0].metric("Date", day.strftime("%Y-%m-%d"))
-                for i, lvl in enumerate([1, 2, 3, 4, 5]):
-                    mcols[i + 1].metric(f"Level {lvl}", counts.get(lvl, 0))
-            map_slot.pydeck_chart(
-                pdk.Deck(
-                    map_style="light",
-                    initial_view_state=pdk.ViewState(latitude=65, longitude=15, zoom=3.5),
-                    layers=[
-                        pdk.Layer(
-                            "GeoJsonLayer",
-                            data=fc,
-                            get_fill_color="properties.fill_color",
-                            get_line_color=[40, 40, 40],
-                            line_width_min_pixels=1,
-                            pickable=True,
-                            stroked=True,
-                            filled=True,
-                        )
-                    ],
-                    tooltip={"text": "{region_name}\nDanger level: {danger_level}"},
-                )
-            )
-
-        if playing:
-            delay = {"0.3s": 0.3, "0.6s": 0.6, "1.0s": 1.0}[speed]
-            while st.session_state["_home_play"]:
-                idx = st.session_state["_home_idx"]
-                _render(idx)
-                time.sleep(delay)
-                st.session_state["_home_idx"] = (idx + 1) % len(anim_days)
-        else:
-            _render(st.session_state["_home_idx"])
-
-    _animated_danger_map()
+    # One feature per region with a warning in the window; each frame only
+    # carries the regions' danger levels and colours.
+    geo = load_region_geojson("coarse")
+    geo_by_id = {int(f["properties"]["omradeID"]): f for f in geo["features"]}
+    region_ids = sorted(
+        rid for rid in {int(r) for r in warnings["region_id"].tolist()} if rid in geo_by_id
+    )
+    column = {rid: i for i, rid in enumerate(region_ids)}
+    levels: list[list[int | None]] = [[None] * len(region_ids) for _ in anim_days]
+    row_of_day = {day: i for i, day in enumerate(anim_days)}
+    for r in warnings.itertuples():
+        rid = int(r.region_id)
+        if rid in column:
+            day = r.date.date() if hasattr(r.date, "date") else r.date
+            levels[row_of_day[day]][column[rid]] = int(r.danger_level)
+
+    animated_map(
+        features=[
+            {
+                "type": "Feature",
+                "geometry": geo_by_id[rid]["geometry"],
+                "properties": {"name": geo_by_id[rid]["properties"].get("omradeNavn")},
+            }
+            for rid in region_ids
+        ],
+        frames=[day.strftime("%Y-%m-%d") for day in anim_days],
+        colors=[
+            [
+                [*DANGER_COLORS.get(lvl, [128, 128, 128]), 160] if lvl is not None else None
+                for lvl in row
+            ]
+            for row in levels
+        ],
+        values=levels,
+        metrics=[
+            [("Date", day.strftime("%Y-%m-%d"))]
+            + [(f"Level {lvl}", str(row.count(lvl))) for lvl in [1, 2, 3, 4, 5]]
+            for day, row in zip(anim_days, levels)
+        ],
+        view={"latitude": 65, "longitude": 15, "zoom": 3.5},
+        tooltip="{name}\nDanger level: {value}",
+        decimals=0,
+    )
 
     latest_day = anim_days[-1]
     latest = warnings[warnings["date"].apply(lambda d: (d.date() if hasattr(d, "date") else d) == latest_day)]
@@ -289,6 +570,59 @@ def main() -> None:
             height=520,
         )
 
+    st.subheader(f"Escalations (60-day window ending {latest_day})")
+    # danger_runs stores one row per run of constant danger level, so days
+    # where regions stepped up are just the runs that start with change='up'.
+    escalations = query(
+        f"""
+        select run_start as date, region_name, previous_level, danger_level,
+               delta, duration_days, elevated_since, elevated_days, is_current
+        from {DANGER_RUNS}
+        where change = 'up'
+          and run_start between ? - interval 60 day and ?
+        order by run_start desc, delta desc, region_name
+        """,
+        (latest_day, latest_day),
+    )
+    if escalations.empty:
+        st.info("No escalations in the window.")
+    else:
+        st.altair_chart(
+            alt.Chart(escalations)
+            .mark_bar()
+            .encode(
+                x=alt.X("date:T", title=None),
+                y=alt.Y("count():Q", title="Regions escalating"),
+                color=alt.Color(
+                    "danger_level:O",
+                    scale=alt.Scale(
+                        domain=[1, 2, 3, 4, 5],
+                        range=["#1a9850", "#ffff33", "#fdae61", "#f46d43", "#7f0000"],
+                    ),
+                    legend=alt.Legend(title="New level"),
+                ),
+                tooltip=["date:T", "region_name:N", "previous_level:Q", "danger_level:Q"],
+            )
+            .properties(height=160),
+            use_container_width=True,
+        )
+        st.dataframe(
+            escalations,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "date": st.column_config.DateColumn("Date"),
+                "region_name": "Region",
+                "previous_level": st.column_config.NumberColumn("From", format="%d"),
+                "danger_level": st.column_config.NumberColumn("To", format="%d"),
+                "delta": st.column_config.NumberColumn("Δ", format="%+d"),
+                "duration_days": st.column_config.NumberColumn("Held (days)", format="%d"),
+                "elevated_since": st.column_config.DateColumn("Elevated since"),
+                "elevated_days": st.column_config.NumberColumn("Elevated (days)", format="%d"),
+                "is_current": st.column_config.CheckboxColumn("Ongoing"),
+            },
+        )
+
     st.subheader(f"Latest warnings — {latest_day}")
     if not latest.empty:
         st.dataframe(
@@ -297,7 +631,11 @@ def main() -> None:
             hide_index=True,
         )
 
-    st.caption("Explore: use the sidebar for Region monitor and Weather detail pages.")
+    st.caption(
+        "Explore: use the sidebar for Region monitor, Weather detail and Warning search pages."
+    )
+    with st.expander("Dashboard usage"):
+        st.table(pd.Series(usage_stats(), name="Value"))
 
 
 if __name__ == "__main__":
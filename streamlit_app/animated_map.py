@@ -0,0 +1,89 @@
+"""Client-side animated maps.
+
+The 31-day maps used to re-render a whole ``pdk.Deck`` from a server-side
+loop on every tick, re-sending the geometry with every frame. Here the
+geometry goes to the browser once, together with every frame's colours,
+values and metrics, and a small deck.gl page (``assets/animated_map.html``)
+steps through the frames itself: play, pause, speed and the slider cost no
+server round trips.
+"""
+
+from __future__ import annotations
+
+import html
+import json
+from collections.abc import Sequence
+from pathlib import Path
+
+import streamlit.components.v1 as components
+
+TEMPLATE_PATH = Path(__file__).resolve().parent / "assets" / "animated_map.html"
+# Height of the play/speed/slider row and of the metric row above the map.
+CONTROLS_PX = 40
+METRICS_PX = 72
+
+Color = Sequence[int]
+
+
+def _template() -> str:
+    return TEMPLATE_PATH.read_text()
+
+
+def _number(value) -> float | None:
+    """JSON-safe value: NaN and missing become ``None``, numpy scalars floats."""
+    if value is None or value != value:
+        return None
+    return float(value)
+
+
+def animated_map(
+    *,
+    features: list[dict],
+    frames: Sequence[str],
+    colors: Sequence[Sequence[Color | None]],
+    values: Sequence[Sequence[float | None]],
+    metrics: Sequence[Sequence[tuple[str, str]]],
+    view: dict,
+    tooltip: str,
+    outline: dict | None = None,
+    opacity: float = 1.0,
+    line_color: Color = (40, 40, 40),
+    line_width: float = 1.0,
+    decimals: int = 1,
+    height: int = 500,
+) -> None:
+    """Render a map that animates over ``frames`` in the browser.
+
+    ``features`` are GeoJSON features drawn in every frame; their geometry is
+    sent once. ``colors[f][i]`` and ``values[f][i]`` are feature ``i``'s fill
+    and tooltip value in frame ``f``; a ``None`` colour hides the feature in
+    that frame. ``metrics[f]`` are ``(label, value)`` pairs shown above the
+    map. ``tooltip`` may use ``{name}`` (the feature's ``name`` property) and
+    ``{value}``. ``outline`` is an optional static GeoJSON drawn on top.
+    """
+    payload = {
+        "features": [
+            {**feature, "properties": {"i": i, "name": feature.get("properties", {}).get("name")}}
+            for i, feature in enumerate(features)
+        ],
+        "frames": list(frames),
+        "colors": [[[int(x) for x in c] if c is not None else None for c in row] for row in colors],
+        "values": [[_number(v) for v in row] for row in values],
+        "metrics": [
+            [(html.escape(label), html.escape(value)) for label, value in row] for row in metrics
+        ],
+        "view": view,
+        "tooltip": tooltip,
+        "outline": outline,
+        "opacity": opacity,
+        "line_color": list(line_color),
+        "line_width": line_width,
+        "decimals": decimals,
+        "height": height,
+    }
+    # "</" would end the inline <script> early.
+    data = json.dumps(payload, separators=(",", ":"), allow_nan=False).replace("</", "<\\/")
+    components.html(
+        _template().replace("/*DATA*/", data),
+        height=CONTROLS_PX + METRICS_PX + height + 8,
+    )
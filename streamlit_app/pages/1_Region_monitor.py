@@ -3,16 +3,32 @@
 from __future__ import annotations
 
 import datetime as dt
-import time
 
 import altair as alt
 import pandas as pd
-import pydeck as pdk
+import pyarrow as pa
+import pyarrow.compute as pc
 import streamlit as st
 
-from Home import AVA, REGION_WEATHER_CTE, WX, _bbox_polygon, load_region_geojson, query
+from animated_map import animated_map
+from Home import (
+    AVA,
+    DANGER_CORR,
+    DANGER_LEVEL_STATS,
+    DANGER_RUNS,
+    REGION_DAILY,
+    REGION_FEATURES,
+    WX,
+    _bbox_polygon,
+    load_region_geojson,
+    pick_tier,
+    query,
+    query_arrow,
+    wait_for_database,
+)
 
 st.set_page_config(page_title="Region monitor", layout="wide")
+wait_for_database()
 
 
 regions = query(f"select distinct region_name from {AVA} order by 1")["region_name"].tolist()
@@ -33,7 +49,10 @@ with st.sidebar:
     lo = lo.date() if hasattr(lo, "date") else lo
     hi = hi.date() if hasattr(hi, "date") else hi
 
-    window = st.slider("Days of history", 30, 365, 180, step=30)
+    # Up to the region's whole history: windows past ~260 days chart weekly
+    # rollups and past ~3 years monthly ones (see pick_tier).
+    max_window = max(365, -(-(hi - lo).days // 30) * 30)
+    window = st.slider("Days of history", 30, max_window, 180, step=30)
     end_date: dt.date = st.date_input("End date", value=hi, min_value=lo, max_value=hi)
     start_date = max(lo, end_date - dt.timedelta(days=window))
 
@@ -41,41 +60,76 @@ st.title(f"{region}")
 st.caption(f"{start_date} → {end_date}  ·  {(end_date - start_date).days} days")
 
 
-joined = query(
-    REGION_WEATHER_CTE
-    + f"""
-    select
-        a.date::date as date,
-        try_cast(a.danger_level as integer) as danger_level,
-        a.main_text,
-        rw.max_temp, rw.avg_temp, rw.min_temp,
-        rw.max_snowfall, rw.avg_snowfall,
-        rw.max_rain, rw.avg_rain,
-        rw.max_snow_depth, rw.avg_snow_depth,
-        rw.max_windspeed, rw.avg_windspeed,
-        rw.avg_humidity
-    from {AVA} a
-    left join region_weather rw
-      on rw.region_name = a.region_name and rw.date = a.date::date
-    where a.region_name = ?
-      and a.date::date between ? and ?
-    order by a.date
+WEATHER_COLS = """
+    max_temp, avg_temp, min_temp,
+    max_snowfall, avg_snowfall,
+    max_rain, avg_rain,
+    max_snow_depth, avg_snow_depth,
+    max_windspeed, avg_windspeed,
+    avg_humidity
+"""
+
+# Long windows read a weekly/monthly rollup instead of every daily row, for
+# the metrics as well as the charts. Charts take the Arrow table straight
+# from the query cache, each projected to the columns it encodes, so no
+# unused weather columns are sent to the browser.
+tier, tier_relation = pick_tier(start_date, end_date)
+# The day tier reads region_daily itself, so its rows also carry the warning
+# texts the table below needs.
+day_columns = (
+    "1 as n_days, (danger_level >= 3)::integer as days_at_3plus, main_text"
+    if tier == "day"
+    else "n_days, days_at_3plus"
+)
+series = query_arrow(
+    f"""
+    select date, danger_level, {day_columns}, {WEATHER_COLS}
+    from {tier_relation}
+    where region_name = ?
+      and date between date_trunc('{tier}', ?::date) and ?
+    order by date
     """,
     (region, start_date, end_date),
 )
 
-if joined.empty:
+if series.num_rows == 0:
     st.info("No overlapping data in this window.")
     st.stop()
 
+# Daily rows, warning texts included, only for the end of the window: the
+# warnings table and the 31-day map. The day tier already has them.
+TABLE_DAYS = 90
+recent_start = max(start_date, end_date - dt.timedelta(days=TABLE_DAYS))
+if tier == "day":
+    recent = (
+        series.filter(pc.greater_equal(series["date"], pa.scalar(recent_start, pa.date32())))
+        .drop_columns(["n_days", "days_at_3plus"])
+        .to_pandas()
+    )
+else:
+    recent = query(
+        f"""
+        select date, danger_level, main_text, {WEATHER_COLS}
+        from {REGION_DAILY}
+        where region_name = ?
+          and date between ? and ?
+        order by date
+        """,
+        (region, recent_start, end_date),
+    )
 
-recent_lvl = joined.dropna(subset=["danger_level"]).tail(1)
+totals = series.select(
+    ["danger_level", "n_days", "days_at_3plus", "avg_snowfall", "max_windspeed"]
+).to_pandas()
+recent_lvl = recent.dropna(subset=["danger_level"]).tail(1)
+snow = totals.dropna(subset=["avg_snowfall"])
 c1, c2, c3, c4, c5 = st.columns(5)
 c1.metric("Latest danger", int(recent_lvl["danger_level"].iloc[0]) if not recent_lvl.empty else "—")
-c2.metric("Peak danger (window)", int(joined["danger_level"].max()) if joined["danger_level"].notna().any() else "—")
-c3.metric("Days at ≥3", int((joined["danger_level"] >= 3).sum()))
-c4.metric("Total snowfall (avg mm/day)", f"{joined['avg_snowfall'].mean():.1f}" if joined['avg_snowfall'].notna().any() else "—")
-c5.metric("Max wind (m/s)", f"{joined['max_windspeed'].max():.1f}" if joined['max_windspeed'].notna().any() else "—")
+c2.metric("Peak danger (window)", int(totals["danger_level"].max()) if totals["danger_level"].notna().any() else "—")
+c3.metric("Days at ≥3", int(totals["days_at_3plus"].sum()))
+# Rollup rows hold per-bucket means; weight them by the days they cover.
+c4.metric("Total snowfall (avg mm/day)", f"{(snow['avg_snowfall'] * snow['n_days']).sum() / snow['n_days'].sum():.1f}" if not snow.empty else "—")
+c5.metric("Max wind (m/s)", f"{totals['max_windspeed'].max():.1f}" if totals['max_windspeed'].notna().any() else "—")
 
 
 st.subheader("Danger level with weather overlay")
@@ -96,9 +150,13 @@ selected_vars = st.multiselect(
     format_func=lambda k: WEATHER_VARS[k][0],
 )
 
-def _danger_chart(df: pd.DataFrame) -> alt.Chart:
+if tier != "day":
+    st.caption(f"Charts show {tier}ly rollups ({series.num_rows} points); peak danger per {tier}.")
+
+
+def _danger_chart(table: pa.Table) -> alt.Chart:
     return (
-        alt.Chart(df)
+        alt.Chart(table)
         .mark_bar(size=6)
         .encode(
             x=alt.X("date:T", title=None),
@@ -117,12 +175,15 @@ def _danger_chart(df: pd.DataFrame) -> alt.Chart:
     )
 
 
-st.altair_chart(_danger_chart(joined), use_container_width=True)
+st.altair_chart(_danger_chart(series.select(["date", "danger_level"])), use_container_width=True)
+
+# Elevated-danger dates, filtered here rather than in the browser.
+elevated_dates = series.filter(pc.greater_equal(series["danger_level"], 3)).select(["date"])
 
 for var in selected_vars:
     label, _ = WEATHER_VARS[var]
-    sub = joined[["date", var, "danger_level"]].dropna(subset=[var])
-    if sub.empty:
+    sub = series.select(["date", var, "danger_level"]).filter(pc.is_valid(series[var]))
+    if sub.num_rows == 0:
         continue
     line = (
         alt.Chart(sub)
@@ -135,82 +196,303 @@ for var in selected_vars:
     )
     # Shade elevated-danger days so the eye anchors on high-risk periods.
     danger_bg = (
-        alt.Chart(sub.dropna(subset=["danger_level"]))
-        .transform_filter("datum.danger_level >= 3")
+        alt.Chart(elevated_dates)
         .mark_rule(strokeWidth=8, opacity=0.15, color="#7f0000")
         .encode(x="date:T")
     )
     st.altair_chart((danger_bg + line).properties(height=180), use_container_width=True)
 
 
-st.subheader("How each weather variable tracks danger")
+st.subheader("Danger periods")
 
-corr_df = joined.dropna(subset=["danger_level"]).copy()
-if len(corr_df) < 5:
-    st.info("Need at least 5 days with a danger level to plot correlations.")
-    st.stop()
+runs = query(
+    f"""
+    select run_start, run_end, duration_days, danger_level, delta,
+           elevated_since, elevated_days, is_current
+    from {DANGER_RUNS}
+    where region_name = ?
+      and run_end >= ? and run_start <= ?
+    order by run_start desc
+    """,
+    (region, start_date, end_date),
+)
+if runs.empty:
+    st.info("No danger runs in the window.")
+else:
+    elevated = runs.dropna(subset=["elevated_since"]).drop_duplicates("elevated_since")
+    p1, p2, p3 = st.columns(3)
+    p1.metric("Level changes", int(runs["delta"].notna().sum()))
+    p2.metric("Elevated periods (≥3)", len(elevated))
+    p3.metric(
+        "Longest elevated period (days)",
+        int(elevated["elevated_days"].max()) if not elevated.empty else "—",
+    )
+    st.dataframe(
+        runs,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "run_start": st.column_config.DateColumn("From"),
+            "run_end": st.column_config.DateColumn("To"),
+            "duration_days": st.column_config.NumberColumn("Days", format="%d"),
+            "danger_level": st.column_config.NumberColumn("Danger", format="%d"),
+            "delta": st.column_config.NumberColumn("Δ", format="%+d"),
+            "elevated_since": st.column_config.DateColumn("Elevated since"),
+            "elevated_days": st.column_config.NumberColumn("Elevated (days)", format="%d"),
+            "is_current": st.column_config.CheckboxColumn("Ongoing"),
+        },
+        height=240,
+    )
 
-metric_cols = list(WEATHER_VARS.keys())
-labels_map = {c: WEATHER_VARS[c][0] for c in metric_cols}
 
-spearman = (
-    corr_df[["danger_level", *metric_cols]]
-    .corr(method="spearman")["danger_level"]
-    .drop("danger_level")
+st.subheader("Snowpack & wind loading")
+
+features_table = query_arrow(
+    f"""
+    select date,
+           snowfall_24h, snowfall_72h, snowfall_7d,
+           rain_72h, rain_on_snow_72h_share,
+           temp_swing_24h, temp_swing_72h,
+           wind_loading_hours_72h, wind_loaded_snowfall_72h
+    from {REGION_FEATURES}
+    where region_name = ?
+      and date between ? and ?
+    order by date
+    """,
+    (region, start_date, end_date),
 )
-coef_df = pd.DataFrame(
-    {"variable": [labels_map[c] for c in metric_cols], "spearman": spearman.values}
-).sort_values("spearman", key=lambda s: s.abs(), ascending=False)
-
-bar = (
-    alt.Chart(coef_df)
-    .mark_bar()
-    .encode(
-        x=alt.X("spearman:Q", title="Spearman ρ (monotonic association with danger)",
-                scale=alt.Scale(domain=[-1, 1])),
-        y=alt.Y("variable:N", sort="-x", title=None),
-        color=alt.Color(
-            "spearman:Q",
-            scale=alt.Scale(scheme="redblue", domain=[-1, 1], reverse=True),
-            legend=None,
-        ),
-        tooltip=[alt.Tooltip("variable:N"), alt.Tooltip("spearman:Q", format="+.2f")],
+features = features_table.to_pandas()
+
+if features.empty:
+    st.info("No feature rows for this region in the window.")
+else:
+    latest_f = features.iloc[-1]
+    f1, f2, f3, f4, f5 = st.columns(5)
+    f1.metric("Snowfall 24h", f"{latest_f['snowfall_24h']:.1f}")
+    f2.metric("Snowfall 72h", f"{latest_f['snowfall_72h']:.1f}")
+    f3.metric("Snowfall 7d", f"{latest_f['snowfall_7d']:.1f}")
+    f4.metric("Rain on snow (72h, share of cells)", f"{latest_f['rain_on_snow_72h_share']:.0%}")
+    f5.metric("Wind-loading hours (72h, worst cell)", int(latest_f["wind_loading_hours_72h"]))
+
+    snow_long = query_arrow(
+        f"""
+        select date, "window", snowfall
+        from (
+            select date, snowfall_24h, snowfall_72h, snowfall_7d
+            from {REGION_FEATURES}
+            where region_name = ?
+              and date between ? and ?
+        )
+        unpivot include nulls (snowfall for "window" in (snowfall_24h, snowfall_72h, snowfall_7d))
+        order by date
+        """,
+        (region, start_date, end_date),
+    )
+    st.altair_chart(
+        alt.Chart(snow_long)
+        .mark_line()
+        .encode(
+            x=alt.X("date:T", title=None),
+            y=alt.Y("snowfall:Q", title="Snowfall (sum)"),
+            color=alt.Color("window:N", title=None),
+            tooltip=["date:T", "window:N", alt.Tooltip("snowfall:Q", format=".1f")],
+        )
+        .properties(height=180),
+        use_container_width=True,
     )
-    .properties(height=32 * len(coef_df))
+    w1, w2 = st.columns(2)
+    w1.altair_chart(
+        alt.Chart(
+            features_table.select(["date", "wind_loading_hours_72h", "wind_loaded_snowfall_72h"])
+        )
+        .mark_bar()
+        .encode(
+            x=alt.X("date:T", title=None),
+            y=alt.Y("wind_loading_hours_72h:Q", title="Wind-loading hours (72h)"),
+            tooltip=["date:T", "wind_loading_hours_72h:Q",
+                     alt.Tooltip("wind_loaded_snowfall_72h:Q", format=".1f")],
+        )
+        .properties(height=160),
+        use_container_width=True,
+    )
+    w2.altair_chart(
+        alt.Chart(features_table.select(["date", "temp_swing_72h", "rain_on_snow_72h_share"]))
+        .mark_line()
+        .encode(
+            x=alt.X("date:T", title=None),
+            y=alt.Y("temp_swing_72h:Q", title="Temperature swing 72h (°C)"),
+            tooltip=["date:T", alt.Tooltip("temp_swing_72h:Q", format=".1f"),
+                     alt.Tooltip("rain_on_snow_72h_share:Q", format=".0%")],
+        )
+        .properties(height=160),
+        use_container_width=True,
+    )
+
+
+st.subheader("How each weather variable tracks danger")
+
+metric_cols = list(WEATHER_VARS.keys())
+labels_map = {c: WEATHER_VARS[c][0] for c in metric_cols}
+
+
+def _season_label(d: dt.date) -> str:
+    """Avalanche season label (``2025/26``), matching the dbt macro."""
+    start_year = d.year if d.month >= 9 else d.year - 1
+    return f"{start_year}/{str(start_year + 1)[-2:]}"
+
+
+def _trailing_days(scope: str) -> int:
+    return int(scope.removeprefix("last_").removesuffix("d"))
+
+
+# Correlations and quantiles are precomputed per region for each season and
+# a fixed set of trailing windows (3_gold.danger_weather_correlation /
+# weather_by_danger_level); pick the scope closest to the sidebar window.
+scopes = query(
+    f"""
+    select distinct scope_type, scope, window_start, window_end
+    from {DANGER_CORR}
+    where region_name = ?
+    """,
+    (region,),
 )
-zero = alt.Chart(pd.DataFrame({"x": [0]})).mark_rule(color="#333").encode(x="x:Q")
-st.altair_chart(bar + zero, use_container_width=True)
-st.caption(
-    "Positive bars → variable rises with danger. Negative → falls. "
-    "Longer bar = stronger monotonic association."
+trailing_scopes = sorted(
+    scopes.loc[scopes["scope_type"] == "trailing", "scope"], key=_trailing_days
 )
+season_scopes = sorted(scopes.loc[scopes["scope_type"] == "season", "scope"], reverse=True)
+scope_options = [*trailing_scopes, *season_scopes]
 
-st.subheader("Distribution by danger level")
+if not scope_options:
+    st.info("No precomputed danger/weather statistics for this region yet.")
+else:
+    if end_date >= hi and trailing_scopes:
+        default_scope = min(trailing_scopes, key=lambda s: abs(_trailing_days(s) - window))
+    elif _season_label(end_date) in season_scopes:
+        default_scope = _season_label(end_date)
+    else:
+        default_scope = scope_options[0]
+
+    scope_bounds = scopes.set_index("scope")[["window_start", "window_end"]]
+
+    def _scope_label(scope: str) -> str:
+        lo_s, hi_s = scope_bounds.loc[scope]
+        lo_s = lo_s.date() if hasattr(lo_s, "date") else lo_s
+        hi_s = hi_s.date() if hasattr(hi_s, "date") else hi_s
+        name = f"Last {_trailing_days(scope)} days" if scope.startswith("last_") else f"Season {scope}"
+        return f"{name}  ·  {lo_s} → {hi_s}"
+
+    scope = st.selectbox(
+        "Statistics over",
+        options=scope_options,
+        index=scope_options.index(default_scope),
+        format_func=_scope_label,
+    )
 
-long = corr_df[["danger_level", *metric_cols]].melt(
-    id_vars="danger_level", var_name="var_key", value_name="value"
-).dropna(subset=["value"])
-long["variable"] = long["var_key"].map(labels_map)
-long["danger_str"] = long["danger_level"].astype(int).astype(str)
+    coef_df = query(
+        f"""
+        select variable as var_key, spearman, n_days
+        from {DANGER_CORR}
+        where region_name = ? and scope = ?
+          and n_days >= 5 and spearman is not null and not isnan(spearman)
+        """,
+        (region, scope),
+    )
+    if coef_df.empty:
+        st.info("Need at least 5 days with a danger level to plot correlations.")
+    else:
+        coef_df["variable"] = coef_df["var_key"].map(labels_map)
+        coef_df = coef_df.sort_values("spearman", key=lambda s: s.abs(), ascending=False)
+
+        bar = (
+            alt.Chart(coef_df)
+            .mark_bar()
+            .encode(
+                x=alt.X("spearman:Q", title="Spearman ρ (monotonic association with danger)",
+                        scale=alt.Scale(domain=[-1, 1])),
+                y=alt.Y("variable:N", sort="-x", title=None),
+                color=alt.Color(
+                    "spearman:Q",
+                    scale=alt.Scale(scheme="redblue", domain=[-1, 1], reverse=True),
+                    legend=None,
+                ),
+                tooltip=[alt.Tooltip("variable:N"), alt.Tooltip("spearman:Q", format="+.2f"),
+                         alt.Tooltip("n_days:Q", title="days")],
+            )
+            .properties(height=32 * len(coef_df))
+        )
+        zero = alt.Chart(pd.DataFrame({"x": [0]})).mark_rule(color="#333").encode(x="x:Q")
+        st.altair_chart(bar + zero, use_container_width=True)
+        st.caption(
+            "Positive bars → variable rises with danger. Negative → falls. "
+            "Longer bar = stronger monotonic association."
+        )
 
-danger_scale = alt.Scale(
-    domain=["1", "2", "3", "4", "5"],
-    range=["#1a9850", "#ffff33", "#fdae61", "#f46d43", "#7f0000"],
-)
+    with st.expander("Compare regions"):
+        cross = query(
+            f"""
+            select region_name, variable as var_key, spearman
+            from {DANGER_CORR}
+            where scope = ? and n_days >= 5
+            """,
+            (scope,),
+        )
+        if not cross.empty:
+            cross["variable"] = cross["var_key"].map(labels_map)
+            st.altair_chart(
+                alt.Chart(cross)
+                .mark_rect()
+                .encode(
+                    x=alt.X("variable:N", title=None),
+                    y=alt.Y("region_name:N", title=None),
+                    color=alt.Color(
+                        "spearman:Q",
+                        scale=alt.Scale(scheme="redblue", domain=[-1, 1], reverse=True),
+                        title="ρ",
+                    ),
+                    tooltip=["region_name:N", "variable:N", alt.Tooltip("spearman:Q", format="+.2f")],
+                )
+                .properties(height=22 * cross["region_name"].nunique()),
+                use_container_width=True,
+            )
+
+    st.subheader("Distribution by danger level")
 
-box = (
-    alt.Chart(long)
-    .mark_boxplot(extent="min-max")
-    .encode(
-        x=alt.X("danger_str:N", title="Danger", sort=["1", "2", "3", "4", "5"]),
-        y=alt.Y("value:Q", title=None, scale=alt.Scale(zero=False)),
-        color=alt.Color("danger_str:N", scale=danger_scale, legend=None),
+    quantiles = query(
+        f"""
+        select variable as var_key, danger_level,
+               min_value, p25, median, p75, max_value
+        from {DANGER_LEVEL_STATS}
+        where region_name = ? and scope = ?
+        """,
+        (region, scope),
     )
-    .properties(width=220, height=200)
-    .facet(facet=alt.Facet("variable:N", title=None), columns=3)
-    .resolve_scale(y="independent")
-)
-st.altair_chart(box, use_container_width=True)
+    if not quantiles.empty:
+        quantiles["variable"] = quantiles["var_key"].map(labels_map)
+        quantiles["danger_str"] = quantiles["danger_level"].astype(int).astype(str)
+
+        danger_scale = alt.Scale(
+            domain=["1", "2", "3", "4", "5"],
+            range=["#1a9850", "#ffff33", "#fdae61", "#f46d43", "#7f0000"],
+        )
+        # Box plots drawn from the precomputed five-number summaries:
+        # whisker = min..max, box = p25..p75, tick = median.
+        base = alt.Chart().encode(
+            x=alt.X("danger_str:N", title="Danger", sort=["1", "2", "3", "4", "5"]),
+            color=alt.Color("danger_str:N", scale=danger_scale, legend=None),
+        )
+        whisker = base.mark_rule().encode(
+            y=alt.Y("min_value:Q", title=None, scale=alt.Scale(zero=False)),
+            y2="max_value:Q",
+        )
+        box_body = base.mark_bar(size=18).encode(y="p25:Q", y2="p75:Q")
+        median_tick = base.mark_tick(color="black", size=18).encode(y="median:Q")
+        box = (
+            alt.layer(whisker, box_body, median_tick, data=quantiles)
+            .properties(width=220, height=200)
+            .facet(facet=alt.Facet("variable:N", title=None), columns=3)
+            .resolve_scale(y="independent")
+        )
+        st.altair_chart(box, use_container_width=True)
 
 st.subheader("31-day weather map — drag to animate")
 
@@ -311,7 +593,7 @@ else:
 
         outline = None
         try:
-            geo = load_region_geojson()
+            geo = load_region_geojson("detailed")
             rid = int(rb["region_id"])
             outline = next(
                 (f for f in geo["features"] if int(f["properties"]["omradeID"]) == rid),
@@ -327,125 +609,79 @@ else:
         span = max(vmax - vmin, 1e-6)
         var_label = WEATHER_VARS[anim_var][0]
 
-        # Precompute polygons + colours once for the whole window so fragment ticks
-        # only mask by date instead of running .apply per row per frame.
-        in_region = in_region.dropna(subset=["value"]).copy()
-        in_region["polygon"] = in_region.apply(_bbox_polygon, axis=1)
-        _f = ((in_region["value"] - vmin) / span).clip(0, 1)
-        in_region["color"] = [
-            [int(255 * f), 64, int(255 * (1 - f)), 200 if inside else 70]
-            for f, inside in zip(_f.tolist(), in_region["in_region"].tolist())
-        ]
-
-        @st.fragment
-        def _animated_region_map() -> None:
-            # Reset frame when window/region/variable changes to avoid stale indices.
-            anim_key = f"{region}|{anim_end}|{anim_var}|{len(available_days)}"
-            if st.session_state.get("_anim_key") != anim_key:
-                st.session_state["_anim_key"] = anim_key
-                st.session_state["_anim_idx"] = len(available_days) - 1
-                st.session_state["_anim_play"] = False
-
-            playing = st.session_state["_anim_play"]
-            ctrl1, ctrl2, ctrl3 = st.columns([1, 1, 3])
-            if ctrl1.button("⏸ Pause" if playing else "▶ Play"):
-                st.session_state["_anim_play"] = not playing
-                st.rerun(scope="fragment")
-            speed = ctrl2.selectbox("Speed", ["0.3s", "0.6s", "1.0s"], index=1, label_visibility="collapsed")
-            slider_val = ctrl3.slider(
-                f"Day  ·  {anim_start} → {anim_end}",
-                min_value=0,
-                max_value=len(available_days) - 1,
-                value=st.session_state["_anim_idx"],
-                format="",
-            )
-            # Slider drives idx only when paused; during playback the loop owns it.
-            if not playing:
-                st.session_state["_anim_idx"] = slider_val
-
-            metric_slot = st.empty()
-            map_slot = st.empty()
-            st.caption(
-                f"Colour scale is fixed across the full 31-day window "
-                f"({vmin:.1f} → {vmax:.1f}), so cells stay comparable as you drag. "
-                "Black outline = varsom region boundary."
-            )
-
-            def _render(idx: int) -> None:
-                selected_day = available_days[idx]
-                day_cells = in_region[in_region["date"] == selected_day]
-
-                layers = [
-                    pdk.Layer(
-                        "PolygonLayer",
-                        data=day_cells,
-                        get_polygon="polygon",
-                        get_fill_color="color",
-                        get_line_color=[80, 80, 80],
-                        line_width_min_pixels=0.5,
-                        pickable=True,
-                        stroked=True,
-                        filled=True,
-                        opacity=0.75,
-                    )
-                ]
-                if outline is not None:
-                    layers.append(
-                        pdk.Layer(
-                            "GeoJsonLayer",
-                            data={"type": "FeatureCollection", "features": [outline]},
-                            get_fill_color=[0, 0, 0, 0],
-                            get_line_color=[0, 0, 0],
-                            line_width_min_pixels=3,
-                            stroked=True,
-                            filled=False,
-                        )
-                    )
-
-                danger_today = joined.loc[
-                    pd.to_datetime(joined["date"]).dt.date == selected_day, "danger_level"
-                ]
-                danger_val = int(danger_today.iloc[0]) if not danger_today.empty and pd.notna(danger_today.iloc[0]) else None
-
-                with metric_slot.container():
-                    m1, m2, m3 = st.columns(3)
-                    m1.metric("Date", selected_day.strftime("%Y-%m-%d"))
-                    m2.metric("Danger level", danger_val if danger_val is not None else "—")
-                    m3.metric(
+        # One feature per grid cell, drawn in every frame; frames only carry
+        # the cells' values and colours.
+        in_region = in_region.dropna(subset=["value"])
+        bbox_cols = ["east_south_lat", "east_south_lon", "west_north_lat", "west_north_lon"]
+        grid = (
+            in_region.groupby(bbox_cols, as_index=False)["in_region"].any().reset_index(drop=True)
+        )
+        column = {tuple(row): i for i, row in enumerate(grid[bbox_cols].itertuples(index=False))}
+        row_of_day = {day: i for i, day in enumerate(available_days)}
+        values: list[list[float | None]] = [[None] * len(grid) for _ in available_days]
+        for day, *bbox, value in in_region[["date", *bbox_cols, "value"]].itertuples(index=False):
+            values[row_of_day[day]][column[tuple(bbox)]] = value
+
+        def _color(value: float | None, inside: bool) -> list[int] | None:
+            if value is None:
+                return None
+            f = min(max((value - vmin) / span, 0.0), 1.0)
+            return [int(255 * f), 64, int(255 * (1 - f)), 200 if inside else 70]
+
+        danger_by_day = {
+            day: level
+            for day, level in zip(pd.to_datetime(recent["date"]).dt.date, recent["danger_level"])
+            if pd.notna(level)
+        }
+        region_means = in_region[in_region["in_region"]].groupby("date")["value"].mean()
+        inside_flags = grid["in_region"].tolist()
+        animated_map(
+            features=[
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Polygon", "coordinates": [_bbox_polygon(row)]},
+                }
+                for _, row in grid.iterrows()
+            ],
+            frames=[day.strftime("%Y-%m-%d") for day in available_days],
+            colors=[[_color(v, inside) for v, inside in zip(row, inside_flags)] for row in values],
+            values=values,
+            metrics=[
+                [
+                    ("Date", day.strftime("%Y-%m-%d")),
+                    ("Danger level", str(int(danger_by_day[day])) if day in danger_by_day else "—"),
+                    (
                         f"{var_label} (region avg)",
-                        f"{day_cells.loc[day_cells['in_region'], 'value'].mean():.1f}" if day_cells["in_region"].any() else "—",
-                    )
-                map_slot.pydeck_chart(
-                    pdk.Deck(
-                        map_style="light",
-                        initial_view_state=pdk.ViewState(
-                            latitude=center_lat, longitude=center_lon, zoom=6.2
-                        ),
-                        layers=layers,
-                        tooltip={"text": f"{var_label}: {{value}}"},
-                    )
-                )
-
-            if playing:
-                delay = {"0.3s": 0.3, "0.6s": 0.6, "1.0s": 1.0}[speed]
-                while st.session_state["_anim_play"]:
-                    idx = st.session_state["_anim_idx"]
-                    _render(idx)
-                    time.sleep(delay)
-                    st.session_state["_anim_idx"] = (idx + 1) % len(available_days)
-            else:
-                _render(st.session_state["_anim_idx"])
-
-        _animated_region_map()
+                        f"{region_means[day]:.1f}" if day in region_means else "—",
+                    ),
+                ]
+                for day in available_days
+            ],
+            view={"latitude": center_lat, "longitude": center_lon, "zoom": 6.2},
+            tooltip=f"{var_label}: {{value}}",
+            outline=(
+                {"type": "FeatureCollection", "features": [outline]} if outline is not None else None
+            ),
+            opacity=0.75,
+            line_color=(80, 80, 80),
+            line_width=0.5,
+        )
+        st.caption(
+            f"Colour scale is fixed across the full 31-day window "
+            f"({vmin:.1f} → {vmax:.1f}), so cells stay comparable as you drag. "
+            "Black outline = varsom region boundary."
+        )
 
 
 st.subheader("Warnings with weather context")
+if (end_date - start_date).days > TABLE_DAYS:
+    st.caption(f"The most recent {TABLE_DAYS} days of the window.")
 show_cols = [
     "date", "danger_level",
     "avg_temp", "max_snowfall", "max_rain", "avg_snow_depth", "max_windspeed",
     "main_text",
 ]
-tbl = joined[show_cols].sort_values("date", ascending=False)
+tbl = recent[show_cols].sort_values("date", ascending=False)
 st.dataframe(
     tbl,
     use_container_width=True,
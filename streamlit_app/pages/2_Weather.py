@@ -2,16 +2,15 @@
 
 from __future__ import annotations
 
-import time
-
 import altair as alt
 import pandas as pd
-import pydeck as pdk
 import streamlit as st
 
-from Home import WX, _bbox_polygon, query
+from animated_map import animated_map
+from Home import WX, _bbox_polygon, bucket_days, query, query_arrow, wait_for_database
 
 st.set_page_config(page_title="Weather detail", layout="wide")
+wait_for_database()
 st.title("Weather detail")
 
 _raw_dates = query(f"select distinct date::date as d from {WX} order by d desc")["d"].tolist()
@@ -37,6 +36,18 @@ nat_var = st.selectbox(
     key="nat_anim_var",
 )
 
+# Variables with a climatology baseline: weather_per_region carries
+# ``<var>_anomaly`` = value minus the grid's normal for that day of year.
+ANOMALY_VARS = {"average_temperature", "max_snowfall", "max_windspeed"}
+
+show_anomaly = st.toggle(
+    "Show anomaly vs. normal for the day of year",
+    value=False,
+    disabled=nat_var not in ANOMALY_VARS,
+    key="nat_anomaly",
+) and nat_var in ANOMALY_VARS
+value_col = f"{nat_var}_anomaly" if show_anomaly else nat_var
+
 nat_end = st.selectbox("End date", options=sorted(dates, reverse=True), index=0)
 # Last 31 *available* dates up to end_date — WX ingestion has gaps and a plain
 # calendar window would collapse to a handful of days.
@@ -48,7 +59,7 @@ nat_cells = query(
     select
         date::date as date,
         east_south_lat, east_south_lon, west_north_lat, west_north_lon,
-        {nat_var} as value
+        {value_col} as value
     from {WX}
     where date::date in ({",".join(["?"] * len(recent_dates))})
     """,
@@ -62,100 +73,70 @@ else:
     nat_days = sorted(nat_cells["date"].unique())
     nvmin = float(nat_cells["value"].min())
     nvmax = float(nat_cells["value"].max())
+    if show_anomaly:
+        # Centre the colour scale on "normal" so blue/red read as below/above.
+        nvmax = max(abs(nvmin), abs(nvmax))
+        nvmin = -nvmax
     nspan = max(nvmax - nvmin, 1e-6)
-    nat_label = NAT_VARS[nat_var][0]
-
-    # Precompute polygons + colours once for the whole window so fragment ticks
-    # only mask by date instead of running .apply per row per frame.
-    nat_cells = nat_cells.dropna(subset=["value"]).copy()
-    nat_cells["polygon"] = nat_cells.apply(_bbox_polygon, axis=1)
-    _f = ((nat_cells["value"] - nvmin) / nspan).clip(0, 1)
-    nat_cells["color"] = [
-        [int(255 * f), 64, int(255 * (1 - f)), 180] for f in _f.tolist()
-    ]
-
-    @st.fragment
-    def _animated_national_map() -> None:
-        # Reset frame when window/variable changes to avoid stale index into a shorter list.
-        nat_key = f"{nat_end}|{nat_var}|{len(nat_days)}"
-        if st.session_state.get("_nat_key") != nat_key:
-            st.session_state["_nat_key"] = nat_key
-            st.session_state["_nat_idx"] = len(nat_days) - 1
-            st.session_state["_nat_play"] = False
-
-        playing = st.session_state["_nat_play"]
-        nc1, nc2, nc3 = st.columns([1, 1, 3])
-        if nc1.button("⏸ Pause" if playing else "▶ Play", key="nat_play_btn"):
-            st.session_state["_nat_play"] = not playing
-            st.rerun(scope="fragment")
-        nat_speed = nc2.selectbox("Speed", ["0.3s", "0.6s", "1.0s"], index=1, label_visibility="collapsed", key="nat_speed")
-        slider_val = nc3.slider(
-            f"Day  ·  {nat_start} → {nat_end}",
-            min_value=0,
-            max_value=len(nat_days) - 1,
-            value=st.session_state["_nat_idx"],
-            format="",
-            key="nat_slider",
-        )
-        # Slider drives idx only when paused; during playback the loop owns it.
-        if not playing:
-            st.session_state["_nat_idx"] = slider_val
-
-        metric_slot = st.empty()
-        map_slot = st.empty()
-        st.caption(
-            f"Colour scale is fixed across the full 31-day window "
-            f"({nvmin:.1f} → {nvmax:.1f}), so cells stay comparable as you scrub."
-        )
-
-        def _render(idx: int) -> None:
-            day = nat_days[idx]
-            slice_ = nat_cells[nat_cells["date"] == day]
-            with metric_slot.container():
-                m1, m2 = st.columns(2)
-                m1.metric("Date", day.strftime("%Y-%m-%d"))
-                m2.metric(
+    nat_label = NAT_VARS[nat_var][0] + (" — anomaly vs. normal" if show_anomaly else "")
+
+    # One feature per grid cell, drawn in every frame; frames only carry the
+    # cells' values and colours.
+    nat_cells = nat_cells.dropna(subset=["value"])
+    bbox_cols = ["east_south_lat", "east_south_lon", "west_north_lat", "west_north_lon"]
+    grid = nat_cells[bbox_cols].drop_duplicates().reset_index(drop=True)
+    column = {tuple(row): i for i, row in enumerate(grid.itertuples(index=False))}
+    row_of_day = {day: i for i, day in enumerate(nat_days)}
+    values: list[list[float | None]] = [[None] * len(grid) for _ in nat_days]
+    for day, *bbox, value in nat_cells[["date", *bbox_cols, "value"]].itertuples(index=False):
+        values[row_of_day[day]][column[tuple(bbox)]] = value
+
+    def _color(value: float | None) -> list[int] | None:
+        if value is None:
+            return None
+        f = min(max((value - nvmin) / nspan, 0.0), 1.0)
+        return [int(255 * f), 64, int(255 * (1 - f)), 180]
+
+    day_means = nat_cells.groupby("date")["value"].mean()
+    animated_map(
+        features=[
+            {
+                "type": "Feature",
+                "geometry": {"type": "Polygon", "coordinates": [_bbox_polygon(row)]},
+            }
+            for _, row in grid.iterrows()
+        ],
+        frames=[day.strftime("%Y-%m-%d") for day in nat_days],
+        colors=[[_color(v) for v in row] for row in values],
+        values=values,
+        metrics=[
+            [
+                ("Date", day.strftime("%Y-%m-%d")),
+                (
                     f"{nat_label} (national avg)",
-                    f"{slice_['value'].mean():.1f}" if not slice_.empty else "—",
-                )
-            map_slot.pydeck_chart(
-                pdk.Deck(
-                    map_style="light",
-                    initial_view_state=pdk.ViewState(latitude=65, longitude=15, zoom=3.5),
-                    layers=[
-                        pdk.Layer(
-                            "PolygonLayer",
-                            data=slice_,
-                            get_polygon="polygon",
-                            get_fill_color="color",
-                            get_line_color=[80, 80, 80],
-                            line_width_min_pixels=0.3,
-                            pickable=True,
-                            stroked=True,
-                            filled=True,
-                            opacity=0.7,
-                        )
-                    ],
-                    tooltip={"text": f"{nat_label}: {{value}}"},
-                )
-            )
-
-        if playing:
-            delay = {"0.3s": 0.3, "0.6s": 0.6, "1.0s": 1.0}[nat_speed]
-            while st.session_state["_nat_play"]:
-                idx = st.session_state["_nat_idx"]
-                _render(idx)
-                time.sleep(delay)
-                st.session_state["_nat_idx"] = (idx + 1) % len(nat_days)
-        else:
-            _render(st.session_state["_nat_idx"])
-
-    _animated_national_map()
+                    f"{day_means[day]:.1f}" if day in day_means else "—",
+                ),
+            ]
+            for day in nat_days
+        ],
+        view={"latitude": 65, "longitude": 15, "zoom": 3.5},
+        tooltip=f"{nat_label}: {{value}}",
+        opacity=0.7,
+        line_color=(80, 80, 80),
+        line_width=0.3,
+    )
+    st.caption(
+        f"Colour scale is fixed across the full 31-day window "
+        f"({nvmin:.1f} → {nvmax:.1f}), so cells stay comparable as you scrub."
+    )
 
 st.subheader("Trends (all regions, daily aggregate)")
-trend = query(
+# Aggregated here to at most one point per pixel of chart width; each chart
+# gets only its own column of the cached Arrow table.
+trend_days = bucket_days(min(dates), max(dates))
+trend = query_arrow(
     f"""
-    select date::date as date,
+    select time_bucket(to_days(?), date::date) as date,
            avg(average_temperature) as avg_temp,
            avg(max_snowfall)        as avg_max_snowfall,
            avg(max_rain)            as avg_max_rain,
@@ -164,11 +145,16 @@ trend = query(
     from {WX}
     group by 1
     order by 1
-    """
+    """,
+    (trend_days,),
 )
-if not trend.empty:
+if trend.num_rows:
+    if trend_days > 1:
+        st.caption(f"Averaged over {trend_days}-day buckets ({trend.num_rows} points).")
     st.altair_chart(
-        alt.Chart(trend).mark_line().encode(x="date:T", y=alt.Y("avg_temp:Q", title="°C"))
+        alt.Chart(trend.select(["date", "avg_temp"]))
+        .mark_line()
+        .encode(x="date:T", y=alt.Y("avg_temp:Q", title="°C"))
         .properties(title="Average temperature", height=280),
         use_container_width=True,
     )
@@ -181,7 +167,9 @@ if not trend.empty:
     row1, row2 = st.columns(2), st.columns(2)
     for (field, title), slot in zip(grid, [*row1, *row2]):
         slot.altair_chart(
-            alt.Chart(trend).mark_line().encode(x="date:T", y=alt.Y(f"{field}:Q", title=title))
+            alt.Chart(trend.select(["date", field]))
+            .mark_line()
+            .encode(x="date:T", y=alt.Y(f"{field}:Q", title=title))
             .properties(title=title, height=220),
             use_container_width=True,
         )
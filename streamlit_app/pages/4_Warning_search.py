@@ -0,0 +1,138 @@
+"""Warning search — full-text search over NVE avalanche warning texts."""
+
+from __future__ import annotations
+
+import altair as alt
+import duckdb
+import streamlit as st
+
+from Home import (
+    WARNING_FTS,
+    WARNING_TEXTS,
+    database_version,
+    get_conn,
+    query,
+    wait_for_database,
+)
+
+st.set_page_config(page_title="Warning search", layout="wide")
+wait_for_database()
+
+
+@st.cache_resource(max_entries=2)
+def fts_ready(version: str) -> bool:
+    """Load DuckDB's FTS extension on the shared connection to snapshot
+    ``version`` and check that the index built by dbt is present."""
+    conn = get_conn()
+    try:
+        conn.execute("LOAD fts")
+    except duckdb.Error:
+        try:
+            conn.execute("INSTALL fts")
+            conn.execute("LOAD fts")
+        except duckdb.Error:
+            return False
+    n = conn.execute(
+        "select count(*) from duckdb_schemas() where schema_name = ?", (WARNING_FTS,)
+    ).fetchone()[0]
+    return n > 0
+
+
+seasons = query(f"select distinct season from {WARNING_TEXTS} order by 1 desc")["season"].tolist()
+if not seasons:
+    st.warning("No warning texts available.")
+    st.stop()
+regions = query(f"select distinct region_name from {WARNING_TEXTS} order by 1")["region_name"].tolist()
+
+with st.sidebar:
+    season = st.selectbox("Season", ["All seasons", *seasons], index=1)
+    selected_regions = st.multiselect("Regions", regions, placeholder="All regions")
+    min_level = st.slider("Minimum danger level", 1, 5, 1)
+    match_all = st.toggle("Match all words", value=True)
+    limit = st.select_slider("Max results", [50, 100, 250, 500, 1000], value=250)
+
+st.title("Warning search")
+text = st.text_input(
+    "Search warning texts",
+    placeholder="e.g. vindflak, svakt lag, nysnø",
+    help="Words are stemmed with the Norwegian stemmer, so 'vindflakene' also "
+    "finds 'vindflak'. Results are ranked by BM25.",
+).strip()
+if not text:
+    st.info("Enter one or more words to search the main text of every warning.")
+    st.stop()
+
+filters = ["danger_level >= ?"]
+params: list = [min_level]
+if season != "All seasons":
+    filters.append("season = ?")
+    params.append(season)
+if selected_regions:
+    filters.append("list_contains(?, region_name)")
+    params.append(selected_regions)
+where = " and ".join(filters)
+
+if fts_ready(database_version()):
+    hits = query(
+        f"""
+        select *
+        from (
+            select
+                "date", region_name, danger_level, main_text,
+                {WARNING_FTS}.match_bm25(document_id, ?, conjunctive := ?) as score
+            from {WARNING_TEXTS}
+            where {where}
+        )
+        where score is not null
+        order by score desc, "date" desc
+        limit ?
+        """,
+        (text, int(match_all), *params, limit),
+    )
+else:
+    # Without the extension (or before the first dbt build created the
+    # index) fall back to unranked substring matching.
+    st.caption("Full-text index unavailable — falling back to substring matching.")
+    words = text.split()
+    joiner = " and " if match_all else " or "
+    word_filter = joiner.join(["main_text ilike ?"] * len(words))
+    hits = query(
+        f"""
+        select "date", region_name, danger_level, main_text, null::double as score
+        from {WARNING_TEXTS}
+        where {where} and ({word_filter})
+        order by "date" desc
+        limit ?
+        """,
+        (*params, *[f"%{w}%" for w in words], limit),
+    )
+
+st.caption(f"{len(hits)} matching warnings" + (" (limit reached)" if len(hits) == limit else ""))
+if hits.empty:
+    st.stop()
+
+per_region = hits.groupby("region_name").size().rename("warnings").reset_index()
+st.altair_chart(
+    alt.Chart(per_region)
+    .mark_bar()
+    .encode(
+        x=alt.X("warnings:Q", title="Matching warnings"),
+        y=alt.Y("region_name:N", sort="-x", title=None),
+        tooltip=["region_name", "warnings"],
+    )
+    .properties(height=max(120, 18 * len(per_region))),
+    use_container_width=True,
+)
+
+st.dataframe(
+    hits,
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "date": st.column_config.DateColumn("Date"),
+        "region_name": "Region",
+        "danger_level": st.column_config.NumberColumn("Level", format="%d"),
+        "main_text": st.column_config.TextColumn("Main text", width="large"),
+        "score": st.column_config.NumberColumn("BM25", format="%.2f"),
+    },
+)
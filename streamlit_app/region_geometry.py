@@ -0,0 +1,299 @@
+"""Simplified, quantized region geometry for the maps.
+
+``assets/varsom_regions.geojson`` carries every region at full detail, which
+is far more than a map of all of Norway can draw and makes each map payload
+several hundred KB. Running this module as a script turns it into
+``assets/varsom_regions.topo.json``: a TopoJSON topology in which each border
+between two regions is stored once as an arc, quantized to an integer grid
+and delta-encoded, and simplified separately for every level in ``LEVELS``.
+Both neighbours reference the same simplified arc, so simplification never
+opens gaps or overlaps between regions.
+
+The app decodes one level back to GeoJSON with ``load_regions``: national
+maps use ``coarse``, close-ups of a single region use ``detailed``.
+
+    python streamlit_app/region_geometry.py
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+SOURCE_PATH = ASSETS_DIR / "varsom_regions.geojson"
+TOPOLOGY_PATH = ASSETS_DIR / "varsom_regions.topo.json"
+# Grid cells per axis; over Norway's extent one cell is roughly 10-25 m.
+QUANTIZATION = 100_000
+# Properties the app uses; the export metadata in the source is dropped.
+PROPERTIES = ("omradeID", "omradeNavn", "regionType")
+
+Point = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class Level:
+    """Douglas-Peucker tolerance in degrees of latitude and the decimals
+    kept when decoding, both sized to well under a pixel at the zoom the
+    level is drawn at."""
+
+    tolerance: float
+    decimals: int
+
+
+LEVELS = {
+    # All of Norway, zoom ~3.5: a pixel is about 5 km.
+    "coarse": Level(tolerance=0.03, decimals=2),
+    # A single region, zoom ~6: a pixel is about 1 km.
+    "detailed": Level(tolerance=0.003, decimals=3),
+}
+
+
+def _rings(geometry: dict) -> list[list[list[list[float]]]]:
+    """Polygons as lists of rings, for Polygon and MultiPolygon alike."""
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    return geometry["coordinates"]
+
+
+def _open_ring(coords: list[list[float]], quantize) -> list[Point]:
+    """Quantized ring without the closing point or repeated points."""
+    ring: list[Point] = []
+    for x, y in coords:
+        point = quantize(x, y)
+        if not ring or ring[-1] != point:
+            ring.append(point)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    return ring
+
+
+def _junctions(rings: list[list[Point]]) -> set[Point]:
+    """Points where a border stops being shared by the same regions: a point
+    seen with two different pairs of neighbours starts or ends an arc."""
+    neighbours: dict[Point, tuple[Point, Point]] = {}
+    junctions: set[Point] = set()
+    for ring in rings:
+        n = len(ring)
+        for i, point in enumerate(ring):
+            pair = tuple(sorted((ring[i - 1], ring[(i + 1) % n])))
+            seen = neighbours.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+
+def _cut(ring: list[Point], junctions: set[Point]) -> list[list[Point]]:
+    """Split a ring into arcs at its junctions. A ring without junctions is
+    one closed arc, rotated to a canonical start so that equal rings match."""
+    cuts = [i for i, point in enumerate(ring) if point in junctions]
+    if not cuts:
+        start = ring.index(min(ring))
+        ring = ring[start:] + ring[:start]
+        return [ring + [ring[0]]]
+    ring = ring[cuts[0]:] + ring[: cuts[0]]
+    ring.append(ring[0])
+    cuts = [i - cuts[0] for i in cuts] + [len(ring) - 1]
+    return [ring[a : b + 1] for a, b in zip(cuts, cuts[1:])]
+
+
+def _simplify(arc: list[Point], tolerance: float, x_scale: float) -> list[Point]:
+    """Douglas-Peucker with fixed endpoints. Distances are in grid units with
+    ``x`` scaled so that both axes have the same length on the ground."""
+    if len(arc) <= 2:
+        return arc
+    if arc[0] == arc[-1]:
+        # A closed arc has no baseline; split it at its farthest point.
+        far = max(range(len(arc)), key=lambda i: _dist2(arc[i], arc[0], x_scale))
+        head = _simplify(arc[: far + 1], tolerance, x_scale)
+        return head + _simplify(arc[far:], tolerance, x_scale)[1:]
+    keep = [False] * len(arc)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(arc) - 1)]
+    while stack:
+        a, b = stack.pop()
+        best, far = 0.0, None
+        for i in range(a + 1, b):
+            d = _segment_distance(arc[i], arc[a], arc[b], x_scale)
+            if d > best:
+                best, far = d, i
+        if far is not None and best > tolerance:
+            keep[far] = True
+            stack += [(a, far), (far, b)]
+    return [point for point, kept in zip(arc, keep) if kept]
+
+
+def _dist2(p: Point, q: Point, x_scale: float) -> float:
+    return ((p[0] - q[0]) * x_scale) ** 2 + (p[1] - q[1]) ** 2
+
+
+def _segment_distance(p: Point, a: Point, b: Point, x_scale: float) -> float:
+    px, py = p[0] * x_scale, p[1]
+    ax, ay = a[0] * x_scale, a[1]
+    bx, by = b[0] * x_scale, b[1]
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length2))
+    return math.hypot(px - ax - t * dx, py - ay - t * dy)
+
+
+def _delta(arc: list[Point]) -> list[list[int]]:
+    out = [list(arc[0])]
+    out += [[x - px, y - py] for (px, py), (x, y) in zip(arc, arc[1:])]
+    return out
+
+
+def build(source: dict) -> dict:
+    """TopoJSON topology with one ``GeometryCollection`` per level."""
+    polygons = [(feature, _rings(feature["geometry"])) for feature in source["features"]]
+    xs = [x for _, polys in polygons for poly in polys for ring in poly for x, _ in ring]
+    ys = [y for _, polys in polygons for poly in polys for ring in poly for _, y in ring]
+    x0, y0 = min(xs), min(ys)
+    sx = (max(xs) - x0) / (QUANTIZATION - 1)
+    sy = (max(ys) - y0) / (QUANTIZATION - 1)
+
+    def quantize(x: float, y: float) -> Point:
+        return round((x - x0) / sx), round((y - y0) / sy)
+
+    shapes = [
+        (feature, [[_open_ring(ring, quantize) for ring in poly] for poly in polys])
+        for feature, polys in polygons
+    ]
+    junctions = _junctions([ring for _, polys in shapes for poly in polys for ring in poly])
+
+    # Cut every ring into arcs, storing each shared border once.
+    arcs: list[list[Point]] = []
+    index: dict[tuple[Point, ...], int] = {}
+
+    def reference(arc: list[Point], table: dict, store: list) -> int:
+        key = tuple(arc)
+        if key in table:
+            return table[key]
+        if key[::-1] in table:
+            return ~table[key[::-1]]
+        table[key] = len(store)
+        store.append(arc)
+        return table[key]
+
+    topology_shapes = [
+        (
+            feature,
+            [
+                [[reference(arc, index, arcs) for arc in _cut(ring, junctions)] for ring in poly]
+                for poly in polys
+            ],
+        )
+        for feature, polys in shapes
+    ]
+
+    mid_lat = math.radians((max(ys) + min(ys)) / 2)
+    x_scale = sx * math.cos(mid_lat) / sy
+    out_arcs: list[list[Point]] = []
+    out_index: dict[tuple[Point, ...], int] = {}
+    objects = {}
+    for name, level in LEVELS.items():
+        simplified = [_simplify(arc, level.tolerance / sy, x_scale) for arc in arcs]
+        # A ring simplified below a triangle keeps its arcs at full detail.
+        for _, polys in topology_shapes:
+            for poly in polys:
+                for ring in poly:
+                    arcs_of = [simplified[~i if i < 0 else i] for i in ring]
+                    if sum(len(a) - 1 for a in arcs_of) < 3:
+                        for i in ring:
+                            simplified[~i if i < 0 else i] = arcs[~i if i < 0 else i]
+
+        def remap(i: int) -> int:
+            j = reference(simplified[~i if i < 0 else i], out_index, out_arcs)
+            return ~j if i < 0 else j
+
+        objects[name] = {
+            "type": "GeometryCollection",
+            "geometries": [
+                {
+                    "type": "MultiPolygon" if len(polys) > 1 else "Polygon",
+                    "arcs": (
+                        [[[remap(i) for i in ring] for ring in poly] for poly in polys]
+                        if len(polys) > 1
+                        else [[remap(i) for i in ring] for ring in polys[0]]
+                    ),
+                    "properties": {
+                        k: feature["properties"][k]
+                        for k in PROPERTIES
+                        if k in feature["properties"]
+                    },
+                }
+                for feature, polys in topology_shapes
+            ],
+        }
+
+    return {
+        "type": "Topology",
+        "transform": {"scale": [sx, sy], "translate": [x0, y0]},
+        "objects": objects,
+        "arcs": [_delta(arc) for arc in out_arcs],
+    }
+
+
+def _decode_arcs(topology: dict, decimals: int) -> list[list[list[float]]]:
+    (sx, sy), (tx, ty) = topology["transform"]["scale"], topology["transform"]["translate"]
+    decoded = []
+    for arc in topology["arcs"]:
+        x = y = 0
+        points = []
+        for dx, dy in arc:
+            x += dx
+            y += dy
+            points.append([round(x * sx + tx, decimals), round(y * sy + ty, decimals)])
+        decoded.append(points)
+    return decoded
+
+
+@lru_cache(maxsize=None)
+def _topology() -> dict:
+    return json.loads(TOPOLOGY_PATH.read_text())
+
+
+@lru_cache(maxsize=None)
+def load_regions(level: str) -> dict:
+    """The regions at ``level`` (a key of ``LEVELS``) as a GeoJSON
+    FeatureCollection. Cached; callers must not modify it."""
+    topology = _topology()
+    arcs = _decode_arcs(topology, LEVELS[level].decimals)
+
+    def ring(indices: list[int]) -> list[list[float]]:
+        points: list[list[float]] = []
+        for i in indices:
+            arc = arcs[~i][::-1] if i < 0 else arcs[i]
+            points.extend(arc[1:] if points else arc)
+        return points
+
+    features = []
+    for geometry in topology["objects"][level]["geometries"]:
+        if geometry["type"] == "Polygon":
+            coordinates = [ring(r) for r in geometry["arcs"]]
+        else:
+            coordinates = [[ring(r) for r in poly] for poly in geometry["arcs"]]
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": {"type": geometry["type"], "coordinates": coordinates},
+                "properties": geometry["properties"],
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def main() -> None:
+    topology = build(json.loads(SOURCE_PATH.read_text()))
+    TOPOLOGY_PATH.write_text(json.dumps(topology, separators=(",", ":"), ensure_ascii=False))
+    print(f"Wrote {TOPOLOGY_PATH} ({TOPOLOGY_PATH.stat().st_size / 1024:.0f} KB)")
+    for name in LEVELS:
+        size = len(json.dumps(load_regions(name), separators=(",", ":")))
+        print(f"  {name}: {size / 1024:.0f} KB as GeoJSON")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Round trip of ``deltas.py``: publish a base, pull it, change the source,
+publish an increment and pull again. The published files are served over
+HTTP from the publish directory, as the release serves them."""
+
+from __future__ import annotations
+
+import functools
+import http.server
+import shutil
+import threading
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from src.dagster_boreas import deltas
+
+DATASET = "boreas_serving"
+
+
+@pytest.fixture
+def release(tmp_path: Path):
+    """``(directory, url)`` of a local HTTP server standing in for the release."""
+    out = tmp_path / "release"
+    out.mkdir()
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(out))
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield out, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    thread.join()
+
+
+def _rows(path: Path, table: str, order: str = "ALL") -> list[tuple]:
+    con = duckdb.connect(str(path), read_only=True)
+    try:
+        return con.execute(f"SELECT * FROM {table} ORDER BY {order}").fetchall()
+    finally:
+        con.close()
+
+
+def _physical_rows(path: Path, table: str) -> list[tuple]:
+    con = duckdb.connect(str(path), read_only=True)
+    try:
+        return con.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall()
+    finally:
+        con.close()
+
+
+def test_publish_pull_round_trip(tmp_path: Path, release) -> None:
+    out, url = release
+    source = tmp_path / "source.duckdb"
+    con = duckdb.connect(str(source))
+    con.execute('CREATE SCHEMA "3_gold"')
+    # Duplicates and NULLs exercise the multiset delete.
+    con.execute('CREATE TABLE "3_gold".events (region VARCHAR, n INTEGER, tags VARCHAR[])')
+    con.execute(
+        """INSERT INTO "3_gold".events VALUES
+        ('a', 1, ['x']), ('a', 1, ['x']), ('a', 1, ['x']),
+        ('b', NULL, NULL), ('b', NULL, NULL), ('c', 3, [])"""
+    )
+    con.execute('CREATE TABLE "3_gold".daily (region VARCHAR, date DATE)')
+    con.execute(
+        """INSERT INTO "3_gold".daily
+        SELECT region, DATE '2026-01-01' + d::INTEGER
+        FROM (VALUES ('a'), ('b')) r(region), range(3) t(d)
+        ORDER BY region, 2"""
+    )
+    con.execute(f"""COMMENT ON TABLE "3_gold".daily IS '{deltas.ORDER_PREFIX}region, date'""")
+    con.close()
+
+    assert deltas.publish(DATASET, source, None, out) == []
+    client = tmp_path / "client.duckdb"
+    deltas.pull(DATASET, client, url)
+    assert _rows(client, '"3_gold".events') == _rows(source, '"3_gold".events')
+
+    # CI keeps the pulled file as the baseline the next increment is diffed
+    # against.
+    previous = tmp_path / "previous.duckdb"
+    shutil.copy(client, previous)
+    shutil.copy(deltas.sidecar_path(client), deltas.sidecar_path(previous))
+
+    con = duckdb.connect(str(source))
+    con.execute(
+        """DELETE FROM "3_gold".events WHERE rowid IN (
+            SELECT MIN(rowid) FROM "3_gold".events WHERE region = 'a'
+            UNION ALL SELECT MIN(rowid) FROM "3_gold".events WHERE region = 'b')"""
+    )
+    con.execute("""UPDATE "3_gold".events SET n = 4 WHERE region = 'c'""")
+    con.execute("""INSERT INTO "3_gold".events VALUES ('d', 5, ['y', NULL])""")
+    con.execute(
+        """INSERT INTO "3_gold".daily VALUES ('a', DATE '2026-01-04'), ('b', DATE '2026-01-04')"""
+    )
+    con.close()
+
+    obsolete = deltas.publish(DATASET, source, previous, out)
+    assert obsolete == []
+    manifest = deltas._read_json(out / deltas.manifest_name(DATASET))
+    assert len(manifest["increments"]) == 1
+    assert manifest["increments"][0]["tables"]['3_gold.daily']["order"] == "region, date"
+
+    deltas.pull(DATASET, client, url)
+    assert _rows(client, '"3_gold".events') == _rows(source, '"3_gold".events')
+    assert _rows(client, '"3_gold".events') == [
+        ("a", 1, ["x"]),
+        ("a", 1, ["x"]),
+        ("b", None, None),
+        ("c", 4, []),
+        ("d", 5, ["y", None]),
+    ]
+    # The sorted table is stored in its order again, not with the new rows
+    # appended at the end.
+    assert _physical_rows(client, '"3_gold".daily') == _rows(
+        source, '"3_gold".daily', "region, date"
+    )
+    assert deltas.up_to_date(DATASET, client, url)